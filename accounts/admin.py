@@ -1,3 +1,27 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-# Register your models here.
\ No newline at end of file
+from common.admin import LargeTableAdmin
+
+from .forms import UserCreationForm
+from .models import User
+
+
+@admin.register(User)
+class UserAdmin(LargeTableAdmin, BaseUserAdmin):
+    list_display = ("email", "is_active", "is_staff", "created_at", "last_login")
+    list_filter = ("is_staff", "is_active")
+    search_fields = ("^email",)
+    ordering = ("-created_at",)
+    fieldsets = (
+        (None, {"fields": ("email", "password")}),
+        ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
+        ("Dates", {"fields": ("last_login", "created_at")}),
+    )
+    # The add form sets the password through password1/password2, hashed like any other
+    add_form = UserCreationForm
+    add_fieldsets = (
+        (None, {"classes": ("wide",), "fields": ("email", "usable_password", "password1", "password2")}),
+    )
+    readonly_fields = ("last_login", "created_at")
+    filter_horizontal = ("groups", "user_permissions")
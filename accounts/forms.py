@@ -0,0 +1,44 @@
+from django import forms
+from django.contrib.auth.forms import AdminUserCreationForm
+
+from .models import StudentProfile, User
+
+
+class StudentProfileForm(forms.ModelForm):
+    class Meta:
+        model = StudentProfile
+        fields = [
+            "full_name",
+            "student_id",
+            "phone",
+            "bio",
+            "skills",
+            "education",
+            "experience",
+            "github_url",
+            "linkedin_url",
+            "portfolio_url",
+            "resume",
+        ]
+
+        widgets = {
+            "full_name": forms.TextInput(attrs={"placeholder": "Your name", "class": "form-control"}),
+            "student_id": forms.TextInput(attrs={"placeholder": "Optional", "class": "form-control"}),
+            "phone": forms.TextInput(attrs={"placeholder": "Optional", "class": "form-control"}),
+            "bio": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
+            "skills": forms.TextInput(attrs={"placeholder": "Comma separated skills", "class": "form-control"}),
+            "education": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
+            "experience": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
+            "github_url": forms.URLInput(attrs={"placeholder": "https://github.com/...", "class": "form-control"}),
+            "linkedin_url": forms.URLInput(attrs={"placeholder": "https://linkedin.com/in/...", "class": "form-control"}),
+            "portfolio_url": forms.URLInput(attrs={"placeholder": "Portfolio link", "class": "form-control"}),
+            "resume": forms.FileInput(attrs={"class": "form-control", "accept": ".pdf, .docx, .doc"}),
+        }
+
+
+class UserCreationForm(AdminUserCreationForm):
+    """The admin's add-user form, keyed by email instead of username"""
+
+    class Meta(AdminUserCreationForm.Meta):
+        model = User
+        fields = ("email",)
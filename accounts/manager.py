@@ -1,6 +1,25 @@
 from django.contrib.auth.models import BaseUserManager
+from django.core.cache import cache
+from django.db import models
+
+
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        """Bulk updates send no post_save, so drop the cached users here (see CachedModelBackend)"""
+        # Imported late: the auth backends module needs the user model loaded
+        from .backends import user_cache_key
+
+        pks = list(self.values_list("pk", flat=True))
+        rows = super().update(**kwargs)
+        cache.delete_many([user_cache_key(pk) for pk in pks])
+        return rows
+
 
 class CustomUserManager(BaseUserManager):
+    def get_queryset(self):
+        return UserQuerySet(self.model, using=self._db)
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError("Users must have an email address")
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:23
+
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+# How long PendingUser codes and Token links were valid (their is_valid())
+OLD_TOKEN_LIFETIME = timedelta(minutes=20)
+
+
+def reissue_live_tokens(apps, schema_editor):
+    """
+    Carry unexpired sign-up codes and reset links into the configured token
+    store, keeping their remaining lifetime, so emails already sent still work.
+    """
+    from accounts.models import TokenType
+    from accounts.tokens import hash_token, normalize_subject
+
+    PendingUser = apps.get_model("accounts", "PendingUser")
+    Token = apps.get_model("accounts", "Token")
+    now = timezone.now()
+    since = now - OLD_TOKEN_LIFETIME
+    store_class = import_string(settings.AUTH_TOKEN_STORE)
+
+    def reissue(token_type, subject, token, payload, created_at):
+        subject = normalize_subject(subject)
+        ttl = int((created_at + OLD_TOKEN_LIFETIME - now).total_seconds())
+        if ttl > 0:
+            store_class(ttl=ttl)._store(token_type, subject, hash_token(token_type, subject, token), payload)
+
+    # Oldest first, so a later row for the same subject replaces an earlier one
+    for pending in PendingUser.objects.filter(created_at__gt=since).order_by("created_at"):
+        reissue(TokenType.VERIFY_ACCOUNT, pending.email, pending.verification_code,
+                {"password": pending.password}, pending.created_at)
+    for token in Token.objects.filter(created_at__gt=since).select_related("user").order_by("created_at"):
+        reissue(TokenType.PASSWORD_RESET, token.user.email, token.token, {}, token.created_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_studentprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthToken',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('token_type', models.CharField(choices=[('VERIFY_ACCOUNT', 'VERIFY_ACCOUNT'), ('PASSWORD_RESET', 'PASSWORD_RESET')], max_length=100)),
+                ('subject', models.CharField(max_length=255)),
+                ('token_hash', models.CharField(max_length=64, unique=True)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='authtoken',
+            constraint=models.UniqueConstraint(fields=('token_type', 'subject'), name='one_auth_token_per_subject'),
+        ),
+        migrations.RunPython(reissue_live_tokens, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='PendingUser',
+        ),
+        migrations.RemoveField(
+            model_name='token',
+            name='user',
+        ),
+        migrations.DeleteModel(
+            name='Token',
+        ),
+    ]
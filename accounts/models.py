@@ -1,6 +1,3 @@
-import uuid
-from datetime import datetime, timezone
-
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.db import models
 
@@ -10,6 +7,7 @@ from .manager import CustomUserManager
 
 
 class TokenType(models.TextChoices):
+    VERIFY_ACCOUNT = ("VERIFY_ACCOUNT", "VERIFY_ACCOUNT")
     PASSWORD_RESET = ("PASSWORD_RESET", "PASSWORD_RESET")
 
 
@@ -24,42 +22,52 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
     objects = CustomUserManager()
 
 
-class PendingUser(BaseModel):
-    email = models.EmailField()
-    password = models.CharField(max_length=255)
-    verification_code = models.CharField(max_length=255)
-    created_at = models.DateTimeField(auto_now_add=True)
+class AuthToken(BaseModel):
+    """
+    Database fallback for accounts.tokens.DatabaseTokenStore. Only a keyed hash
+    of the token is kept; one live token per (token_type, subject).
+    """
 
-    def is_valid(self) -> bool:
-        lifespan_in_seconds = 20 * 60
-        now = datetime.now(timezone.utc)
-        timediff = now - self.created_at
-        timediff = timediff.total_seconds()
-        if timediff > lifespan_in_seconds:
-            return False
-        return True
+    token_type = models.CharField(max_length=100, choices=TokenType.choices)
+    subject = models.CharField(max_length=255)
+    token_hash = models.CharField(max_length=64, unique=True)
+    payload = models.JSONField(default=dict, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["token_type", "subject"], name="one_auth_token_per_subject"),
+        ]
 
-class Token(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    token = models.CharField(max_length=255)
-    token_type = models.CharField(max_length=100, choices=TokenType.choices)
-    created_at = models.DateTimeField(auto_now_add=True)
+    def __str__(self):
+        return f"{self.token_type} {self.subject}"
+
+
+class StudentProfile(BaseModel):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
+    full_name = models.CharField(max_length=100)
+    student_id = models.CharField(max_length=20, null=True, blank=True)
+    phone = models.CharField(max_length=20, null=True, blank=True)
+    bio = models.TextField(null=True, blank=True)
+    skills = models.TextField(help_text="Comma-separated skills (e.g., Python, Django, React)")
+    education = models.TextField(null=True, blank=True, help_text="Education details")
+    experience = models.TextField(null=True, blank=True, help_text="Work experience")
+    github_url = models.URLField(null=True, blank=True)
+    linkedin_url = models.URLField(null=True, blank=True)
+    portfolio_url = models.URLField(null=True, blank=True)
+    # Applications made with one-click apply point at this same file, so replacing
+    # the resume must never delete the old one
+    resume = models.FileField(upload_to="resumes/", null=True, blank=True)
+    profile_picture = models.ImageField(upload_to="profile_pics/", null=True, blank=True)
 
     def __str__(self):
-        return f"{self.user}  {self.token}"
-
-    def is_valid(self) -> bool:
-        lifespan_in_seconds = 20 * 60  # 20 mins
-        now = datetime.now(timezone.utc)
-        timediff = now - self.created_at
-        timediff = timediff.total_seconds()
-        if timediff > lifespan_in_seconds:
-            return False
-        return True
-
-    def reset_user_password(self, raw_password: str):
-        self.user: User
-        self.user.set_password(raw_password)
-        self.user.save()
+        return self.full_name
+
+    @property
+    def application_portfolio_url(self) -> str:
+        """Best link to show recruiters in place of a typed portfolio URL"""
+        return self.portfolio_url or self.github_url or self.linkedin_url or ""
+
+    @property
+    def can_quick_apply(self) -> bool:
+        return bool(self.resume and self.full_name and self.application_portfolio_url)
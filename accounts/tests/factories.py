@@ -1,11 +1,80 @@
+from datetime import timedelta
+
 import factory
 from accounts.models import User
+from application_tracking.models import Company, JobAdvert, JobApplication
 from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+
+class BulkFactory(factory.django.DjangoModelFactory):
+    """
+    bulk_batch(size, **kwargs) saves size instances with one bulk_create.
+    Related objects not passed in are created once and shared by the batch.
+    save() and signals don't run for the batch, so nothing is indexed or
+    rolled up; use create_batch when a test depends on those.
+    """
 
-class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def prepare(cls, instance):
+        """Whatever the model's save() would have filled in"""
+
+    @classmethod
+    def bulk_batch(cls, size, **kwargs) -> list:
+        for name, declaration in cls._meta.declarations.items():
+            if isinstance(declaration, factory.SubFactory) and name not in kwargs:
+                kwargs[name] = declaration.get_factory().create()
+        instances = cls.build_batch(size, **kwargs)
+        for instance in instances:
+            cls.prepare(instance)
+        return cls._meta.model.objects.bulk_create(instances, batch_size=500)
+
+
+class UserFactory(BulkFactory):
     class Meta:
         model = User
 
-    
+
     email = factory.Sequence(lambda n: "person{}@example.com".format(n))
-    password = make_password("TestPass")
\ No newline at end of file
+    password = make_password("TestPass")
+
+
+class CompanyFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Company
+        django_get_or_create = ("name",)
+
+    name = factory.Sequence(lambda n: "Company {}".format(n))
+
+
+class JobAdvertFactory(BulkFactory):
+    class Meta:
+        model = JobAdvert
+
+    title = factory.Sequence(lambda n: "Backend Developer {}".format(n))
+    company = factory.SubFactory(CompanyFactory)
+    employment_type = "Full Time"
+    experience_level = "Entry Level"
+    description = "Build and run our Django services"
+    job_type = "Remote"
+    skills = "Python Django"
+    deadline = factory.LazyFunction(lambda: timezone.localdate() + timedelta(days=30))
+    created_by = factory.SubFactory(UserFactory)
+
+    @classmethod
+    def prepare(cls, instance):
+        instance.apply_schedule()
+
+
+class JobApplicationFactory(BulkFactory):
+    class Meta:
+        model = JobApplication
+
+    name = factory.Sequence(lambda n: "Applicant {}".format(n))
+    email = factory.Sequence(lambda n: "applicant{}@example.com".format(n))
+    portfolio_url = "https://example.com"
+    cv = "cv.pdf"
+    job_advert = factory.SubFactory(JobAdvertFactory)
@@ -0,0 +1,53 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.backends import user_cache_key
+
+pytestmark = pytest.mark.django_db
+
+
+def auth_queries(client: Client, url: str) -> list[str]:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query["sql"] for query in context.captured_queries
+        if "django_session" in query["sql"] or 'FROM "accounts_user"' in query["sql"]
+    ]
+
+
+@pytest.mark.parametrize("url_name", ["my_jobs", "my_applications"])
+def test_warm_requests_skip_session_and_user_queries(authenticate_user_client, url_name):
+    client, _ = authenticate_user_client
+    url = reverse(url_name)
+    client.get(url)
+
+    assert auth_queries(client, url) == []
+
+
+def test_user_cache_invalidated_on_save(authenticate_user_client):
+    client, user = authenticate_user_client
+    client.get(reverse("my_jobs"))
+    assert cache.get(user_cache_key(user.pk)) is not None
+
+    user.set_password("new-password")
+    user.save()
+
+    assert cache.get(user_cache_key(user.pk)) is None
+    # The stale session no longer matches the password hash
+    response = client.get(reverse("my_jobs"))
+    assert response.status_code == 302
+
+
+def test_user_cache_invalidated_on_bulk_update(authenticate_user_client, django_user_model):
+    client, user = authenticate_user_client
+    client.get(reverse("my_jobs"))
+
+    django_user_model.objects.filter(pk=user.pk).update(is_active=False)
+
+    assert cache.get(user_cache_key(user.pk)) is None
+    assert client.get(reverse("my_jobs")).status_code == 302
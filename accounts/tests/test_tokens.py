@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from accounts.models import AuthToken, TokenType
+from accounts.tokens import CacheTokenStore, DatabaseTokenStore, TokenStore
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(params=[CacheTokenStore, DatabaseTokenStore])
+def store(request):
+    cache.clear()
+    return request.param()
+
+
+def test_tokens_are_single_use_and_bound_to_subject(store):
+    token = store.issue(TokenType.PASSWORD_RESET, "Jane@Example.com", {"step": 1})
+
+    assert store.peek(TokenType.PASSWORD_RESET, "other@example.com", token) is None
+    assert store.peek(TokenType.VERIFY_ACCOUNT, "jane@example.com", token) is None
+    assert store.peek(TokenType.PASSWORD_RESET, "jane@example.com", token) == {"step": 1}
+    assert store.consume(TokenType.PASSWORD_RESET, "jane@example.com", token) == {"step": 1}
+    assert store.consume(TokenType.PASSWORD_RESET, "jane@example.com", token) is None
+
+
+def test_reissuing_replaces_the_previous_token(store):
+    first = store.issue(TokenType.PASSWORD_RESET, "jane@example.com")
+    second = store.issue(TokenType.PASSWORD_RESET, "jane@example.com")
+
+    assert store.peek(TokenType.PASSWORD_RESET, "jane@example.com", first) is None
+    assert store.peek(TokenType.PASSWORD_RESET, "jane@example.com", second) == {}
+
+
+def test_database_store_keeps_hashes_and_sweeps_expired_rows():
+    store = DatabaseTokenStore()
+    token = store.issue(TokenType.PASSWORD_RESET, "jane@example.com")
+    row = AuthToken.objects.get()
+    assert token not in row.token_hash
+
+    AuthToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+    assert store.peek(TokenType.PASSWORD_RESET, "jane@example.com", token) is None
+
+    store.issue(TokenType.VERIFY_ACCOUNT, "john@example.com")
+    assert list(AuthToken.objects.values_list("subject", flat=True)) == ["john@example.com"]
+
+
+def test_store_missing_a_hook_fails_when_created():
+    class PartialStore(TokenStore):
+        def _store(self, token_type, subject, token_hash, payload):
+            pass
+
+    with pytest.raises(TypeError, match="_get"):
+        PartialStore()
@@ -1,11 +1,11 @@
-from datetime import datetime, timezone
 import pytest
 from django.contrib.auth.hashers import check_password
 from django.contrib.messages import get_messages
 from django.test.client import Client
 from django.urls import reverse
 from django.contrib.auth import get_user
-from accounts.models import PendingUser, Token, User, TokenType
+from accounts.models import AuthToken, User, TokenType
+from accounts.tokens import token_store
 
 pytestmark = pytest.mark.django_db
 
@@ -15,9 +15,8 @@ def test_register_user(client: Client):
     request_data = {"email": "abc@gmail.com", "password": "12345678"}
     response = client.post(url, request_data)
     assert response.status_code == 200
-    pending_user = PendingUser.objects.filter(email=request_data["email"]).first()
-    assert pending_user
-    assert check_password(request_data["password"], pending_user.password)
+    pending_user = AuthToken.objects.get(token_type=TokenType.VERIFY_ACCOUNT, subject=request_data["email"])
+    assert check_password(request_data["password"], pending_user.payload["password"])
 
     messages = list(get_messages(response.wsgi_request))
     assert len(messages) == 1
@@ -39,11 +38,9 @@ def test_register_user_duplicate_email(client: Client, user_instance):
 
 
 def test_verify_account_valid_code(client: Client):
-    pending_user = PendingUser.objects.create(
-        email="abc@gmail.com", verification_code="5555", password="randompass"
-    )
+    code = token_store().issue(TokenType.VERIFY_ACCOUNT, "abc@gmail.com", {"password": "randompass"})
     url = reverse("verify_account")
-    request_data = {"email": pending_user.email, "code": pending_user.verification_code}
+    request_data = {"email": "abc@gmail.com", "code": code}
     response = client.post(url, request_data)
     assert response.status_code == 302
     assert response.url == reverse("home")
@@ -52,11 +49,9 @@ def test_verify_account_valid_code(client: Client):
 
 
 def test_verify_account_invalid_code(client: Client):
-    pending_user = PendingUser.objects.create(
-        email="abc@gmail.com", verification_code="5555", password="randompass"
-    )
+    token_store().issue(TokenType.VERIFY_ACCOUNT, "abc@gmail.com", {"password": "randompass"})
     url = reverse("verify_account")
-    request_data = {"email": pending_user.email, "code": "invalidcode"}
+    request_data = {"email": "abc@gmail.com", "code": "invalidcode"}
     response = client.post(url, request_data)
     assert response.status_code == 400
     assert User.objects.count() == 0
@@ -96,9 +91,7 @@ def test_initiate_password_reset_using_registered_email(client: Client, user_ins
     request_data = {"email": user_instance.email}
     response = client.post(url, request_data)
     assert response.status_code == 302
-    assert Token.objects.get(
-        user__email=request_data["email"], token_type=TokenType.PASSWORD_RESET
-    )
+    assert AuthToken.objects.get(subject=request_data["email"], token_type=TokenType.PASSWORD_RESET)
 
     messages = list(get_messages(response.wsgi_request))
     assert len(messages) == 1
@@ -111,9 +104,7 @@ def test_initiate_password_reset_using_unregistered_email(client: Client):
     request_data = {"email": "notregistered@gmail.com"}
     response = client.post(url, request_data)
     assert response.status_code == 302
-    assert not Token.objects.filter(
-        user__email=request_data["email"], token_type=TokenType.PASSWORD_RESET
-    ).first()
+    assert not AuthToken.objects.filter(subject=request_data["email"]).exists()
 
     messages = list(get_messages(response.wsgi_request))
     assert len(messages) == 1
@@ -123,24 +114,19 @@ def test_initiate_password_reset_using_unregistered_email(client: Client):
 
 def test_set_new_password_using_valid_reset_token(client: Client, user_instance):
     url = reverse("set_new_password")
-    reset_token = Token.objects.create(
-        user=user_instance,
-        token_type=TokenType.PASSWORD_RESET,
-        token="abcd",
-        created_at=datetime.now(timezone.utc),
-    )
+    reset_token = token_store().issue(TokenType.PASSWORD_RESET, user_instance.email)
 
     request_data = {
         "password1": "12345",
         "password2": "12345",
         "email": user_instance.email,
-        "token": reset_token.token,
+        "token": reset_token,
     }
 
     response = client.post(url, request_data)
     assert response.status_code == 302
     assert response.url == reverse("login")
-    assert Token.objects.count() == 0
+    assert AuthToken.objects.count() == 0
 
     user_instance.refresh_from_db()
     assert user_instance.check_password(request_data["password1"])
@@ -153,12 +139,7 @@ def test_set_new_password_using_valid_reset_token(client: Client, user_instance)
 
 def test_set_new_password_using_invalid_reset_token(client: Client, user_instance):
     url = reverse("set_new_password")
-    Token.objects.create(
-        user=user_instance,
-        token_type=TokenType.PASSWORD_RESET,
-        token="abcd",
-        created_at=datetime.now(timezone.utc),
-    )
+    token_store().issue(TokenType.PASSWORD_RESET, user_instance.email)
 
     request_data = {
         "password1": "12345",
@@ -170,9 +151,19 @@ def test_set_new_password_using_invalid_reset_token(client: Client, user_instanc
     response = client.post(url, request_data)
     assert response.status_code == 302
     assert response.url == reverse("reset_password_via_email")
-    assert Token.objects.count() == 1
+    assert AuthToken.objects.count() == 1
 
     messages = list(get_messages(response.wsgi_request))
     assert len(messages) == 1
     assert messages[0].level_tag == "error"
     assert str(messages[0]) == "Expired or Invalid reset link"
+
+
+def test_profile_is_created_on_first_save(authenticate_user_client):
+    client, user = authenticate_user_client
+    url = reverse("profile")
+
+    response = client.post(url, {"full_name": "Jane Doe", "skills": "Python, Django"})
+
+    assert response.status_code == 302
+    assert user.profile.full_name == "Jane Doe"
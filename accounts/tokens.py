@@ -0,0 +1,125 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, get_random_string, salted_hmac
+from django.utils.module_loading import import_string
+
+from .models import AuthToken
+
+
+def hash_token(token_type: str, subject: str, token: str) -> str:
+    """Keyed with SECRET_KEY, so a leaked store can't be replayed or brute-forced offline"""
+    return salted_hmac("accounts.tokens", f"{token_type}:{subject}:{token}", algorithm="sha256").hexdigest()
+
+
+def normalize_subject(subject: str) -> str:
+    return (subject or "").strip().lower()
+
+
+class TokenStore(ABC):
+    """
+    Short-lived single-purpose tokens (verification codes, reset links) bound
+    to a subject such as an email address. Issuing a token replaces the
+    subject's previous one of the same type, and only hashes are stored.
+    """
+
+    def __init__(self, ttl: int | None = None):
+        self.ttl = settings.AUTH_TOKEN_TTL if ttl is None else ttl
+
+    def issue(self, token_type: str, subject: str, payload: dict | None = None, length: int = 20) -> str:
+        """Store a new token and return it in plaintext; it is never readable again"""
+        token = get_random_string(length)
+        subject = normalize_subject(subject)
+        self._store(token_type, subject, hash_token(token_type, subject, token), payload or {})
+        return token
+
+    def peek(self, token_type: str, subject: str, token: str) -> dict | None:
+        """Payload of a live token, or None if it is unknown or expired"""
+        if not token:
+            return None
+        subject = normalize_subject(subject)
+        return self._get(token_type, subject, hash_token(token_type, subject, token))
+
+    def consume(self, token_type: str, subject: str, token: str) -> dict | None:
+        """Like peek, but the token can only be consumed once"""
+        if not token:
+            return None
+        subject = normalize_subject(subject)
+        return self._pop(token_type, subject, hash_token(token_type, subject, token))
+
+    @abstractmethod
+    def _store(self, token_type, subject, token_hash, payload):
+        ...
+
+    @abstractmethod
+    def _get(self, token_type, subject, token_hash):
+        ...
+
+    @abstractmethod
+    def _pop(self, token_type, subject, token_hash):
+        ...
+
+
+class CacheTokenStore(TokenStore):
+    """
+    One cache entry per (token_type, subject) holding the token hash and
+    payload; the backend's TTL expires it. Needs a cache shared by every
+    worker, e.g. Redis or Memcached rather than LocMemCache.
+    """
+
+    def key(self, token_type, subject) -> str:
+        return f"accounts:token:{token_type}:{salted_hmac('accounts.tokens.subject', subject).hexdigest()}"
+
+    def _store(self, token_type, subject, token_hash, payload):
+        cache.set(self.key(token_type, subject), {"hash": token_hash, "payload": payload}, self.ttl)
+
+    def _get(self, token_type, subject, token_hash):
+        entry = cache.get(self.key(token_type, subject))
+        if entry and constant_time_compare(entry["hash"], token_hash):
+            return entry["payload"]
+        return None
+
+    def _pop(self, token_type, subject, token_hash):
+        payload = self._get(token_type, subject, token_hash)
+        if payload is not None and not cache.delete(self.key(token_type, subject)):
+            # Another request consumed it between the read and the delete
+            return None
+        return payload
+
+
+class DatabaseTokenStore(TokenStore):
+    """
+    AuthToken rows looked up through the unique token_hash index and filtered
+    on expires_at. Expired rows are swept whenever a token is issued.
+    """
+
+    def _store(self, token_type, subject, token_hash, payload):
+        now = timezone.now()
+        AuthToken.objects.filter(expires_at__lte=now).delete()
+        defaults = {"token_hash": token_hash, "payload": payload, "expires_at": now + timedelta(seconds=self.ttl)}
+        try:
+            with transaction.atomic():
+                AuthToken.objects.update_or_create(token_type=token_type, subject=subject, defaults=defaults)
+        except IntegrityError:
+            # A concurrent issue for the same subject created the row first
+            AuthToken.objects.filter(token_type=token_type, subject=subject).update(**defaults)
+
+    def _live(self, token_hash):
+        return AuthToken.objects.filter(token_hash=token_hash, expires_at__gt=timezone.now())
+
+    def _get(self, token_type, subject, token_hash):
+        return self._live(token_hash).values_list("payload", flat=True).first()
+
+    def _pop(self, token_type, subject, token_hash):
+        payload = self._get(token_type, subject, token_hash)
+        if payload is not None and not AuthToken.objects.filter(token_hash=token_hash).delete()[0]:
+            return None
+        return payload
+
+
+def token_store() -> TokenStore:
+    return import_string(settings.AUTH_TOKEN_STORE)()
@@ -1,6 +1,9 @@
 # accounts/urls.py
 from django.urls import path
-from . import views
+
+from common.lazy_views import LazyViews
+
+views = LazyViews("accounts.views")
 
 urlpatterns = [
     path("home/",views.home, name= "accounts_home"),
@@ -19,4 +22,6 @@ urlpatterns = [
 
     # account verification
     path("verify-account/", views.verify_account, name="verify_account"),
+
+    path("profile/", views.profile, name="profile"),
 ]
@@ -1,24 +1,32 @@
-from datetime import datetime, timezone
+from urllib.parse import urlencode
+
 from django.contrib import auth, messages
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 from django.http import HttpRequest
 from django.shortcuts import redirect, render
-from django.utils.crypto import get_random_string
 from django.core.mail import send_mail
 
+from application_tracking.models import JobApplication
+from common.query_budget import query_budget
+
 from .decorators import redirect_autheticated_user
-from .models import PendingUser, Token, TokenType, User
+from .forms import StudentProfileForm
+from .models import StudentProfile, TokenType, User
+from .tokens import token_store
 
 
 
 # accounts/views.py
+@query_budget(6)
 def home(request):
     return render(request, "home.html")
 
 
 
 # -------------------- Login -------------------- #
+@query_budget(8)
 @redirect_autheticated_user
 def login(request: HttpRequest):
     if request.method == "POST":
@@ -39,6 +47,7 @@ def login(request: HttpRequest):
 
 
 # -------------------- Logout -------------------- #
+@query_budget(5)
 def logout(request: HttpRequest):
     auth.logout(request)
     messages.success(request, "You are now logged out.")
@@ -46,6 +55,7 @@ def logout(request: HttpRequest):
 
 
 # -------------------- Register -------------------- #
+@query_budget(12)
 @redirect_autheticated_user
 def register(request: HttpRequest):
     if request.method == "POST":
@@ -56,16 +66,9 @@ def register(request: HttpRequest):
             messages.error(request, "Email already exists.")
             return redirect("register")
 
-        verification_code = get_random_string(10)
-
-        # Save pending user with hashed password
-        PendingUser.objects.update_or_create(
-            email=email,
-            defaults={
-                "password": make_password(password),
-                "verification_code": verification_code,
-                "created_at": datetime.now(timezone.utc),
-            },
+        # The hashed password waits with the code until the account is verified
+        verification_code = token_store().issue(
+            TokenType.VERIFY_ACCOUNT, email, {"password": make_password(password)}, length=10
         )
 
         # Send verification email (to console backend)
@@ -83,22 +86,23 @@ def register(request: HttpRequest):
 
 
 # -------------------- Verify Account -------------------- #
+@query_budget(12)
 def verify_account(request: HttpRequest):
     if request.method == "POST":
         code = request.POST["code"]
-        email = request.POST["email"]
+        email = request.POST["email"].lower()
 
-        pending_user = PendingUser.objects.filter(
-            verification_code=code, email=email
-        ).first()
+        pending_user = token_store().consume(TokenType.VERIFY_ACCOUNT, email, code)
 
-        if pending_user and pending_user.is_valid():
+        if pending_user and not User.objects.filter(email=email).exists():
             # ✅ Create actual user with existing hashed password
-            user = User.objects.create(email=pending_user.email)
-            user.password = pending_user.password  # keep hashed password
-            user.save()
+            user = User.objects.create(email=email, password=pending_user["password"])
+
+            # Applications sent before the account existed now belong to it
+            JobApplication.objects.filter(
+                applicant__isnull=True, email__iexact=user.email
+            ).update(applicant=user)
 
-            pending_user.delete()
             auth.login(request, user)
             messages.success(request, "Account verified. You are now logged in.")
             return redirect("home")
@@ -111,6 +115,7 @@ def verify_account(request: HttpRequest):
 
 
 # -------------------- Forgot Password -------------------- #
+@query_budget(12)
 def send_password_reset_link(request: HttpRequest):
     if request.method == "POST":
         email = request.POST.get("email", "").lower()
@@ -120,17 +125,10 @@ def send_password_reset_link(request: HttpRequest):
             messages.error(request, "Email not found.")
             return redirect("reset_password_via_email")
 
-        # Create or update token
-        token, _ = Token.objects.update_or_create(
-            user=user,
-            token_type=TokenType.PASSWORD_RESET,
-            defaults={
-                "token": get_random_string(20),
-                "created_at": datetime.now(timezone.utc),
-            },
-        )
+        # Replaces any earlier link for this user
+        token = token_store().issue(TokenType.PASSWORD_RESET, email)
 
-        reset_link = f"http://127.0.0.1:8000/auth/reset-password-confirm/?email={email}&token={token.token}"
+        reset_link = f"http://127.0.0.1:8000/auth/reset-password-confirm/?{urlencode({'email': email, 'token': token})}"
 
         send_mail(
             subject="Your Password Reset Link",
@@ -146,17 +144,12 @@ def send_password_reset_link(request: HttpRequest):
 
 
 # -------------------- Verify Password Reset Link -------------------- #
+@query_budget(4)
 def verify_password_reset_link(request: HttpRequest):
     email = request.GET.get("email")
     reset_token = request.GET.get("token")
 
-    token = Token.objects.filter(
-        user__email=email,
-        token=reset_token,
-        token_type=TokenType.PASSWORD_RESET,
-    ).first()
-
-    if not token or not token.is_valid():
+    if token_store().peek(TokenType.PASSWORD_RESET, email, reset_token) is None:
         messages.error(request, "Invalid or expired reset link.")
         return redirect("reset_password_via_email")
 
@@ -167,10 +160,11 @@ def verify_password_reset_link(request: HttpRequest):
     )
 
 
+@query_budget(8)
 def set_new_password(request: HttpRequest):
     """
     Accepts POST from the reset form (password1, password2, email, token).
-    Verifies token, compares passwords, sets hashed password and deletes token.
+    Verifies token, compares passwords, sets hashed password and consumes the token.
     """
 
     if request.method == "POST":
@@ -202,29 +196,16 @@ def set_new_password(request: HttpRequest):
                 status=400,
             )
 
-        # Find token and user
-        try:
-            t = Token.objects.get(
-                token=token_value,
-                user__email=email,
-                token_type=TokenType.PASSWORD_RESET,
-            )
-        except Token.DoesNotExist:
+        # Consuming the token prevents re-use
+        user = User.objects.filter(email=email.lower()).first()
+        if not user or token_store().consume(TokenType.PASSWORD_RESET, email, token_value) is None:
             messages.error(request, "Invalid or expired link.")
             return redirect("reset_password_via_email")
 
-        if not t.is_valid():
-            messages.error(request, "Link expired.")
-            return redirect("reset_password_via_email")
-
         # Set the hashed password correctly
-        user = t.user
         user.set_password(password1)
         user.save()
 
-        # Delete token to prevent re-use
-        t.delete()
-
         messages.success(request, "Password reset successfully. Please log in.")
         return redirect("login")
 
@@ -232,6 +213,22 @@ def set_new_password(request: HttpRequest):
     return redirect("reset_password_via_email")
 
 
+# -------------------- Student Profile -------------------- #
+@query_budget(6)
+@login_required
+def profile(request: HttpRequest):
+    instance = StudentProfile.objects.filter(user=request.user).first()
+    form = StudentProfileForm(request.POST or None, request.FILES or None, instance=instance)
+    if form.is_valid():
+        student_profile: StudentProfile = form.save(commit=False)
+        student_profile.user = request.user
+        student_profile.save()
+        messages.success(request, "Profile saved.")
+        return redirect("profile")
+
+    return render(request, "profile.html", {"form": form, "profile": instance})
+
+
 # -------------------- Helper Function -------------------- #
 def send_verification_email(email, code):
     subject = "Your Verification Code"
@@ -1,3 +1,92 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
 
-# Register your models here.
\ No newline at end of file
+from common.admin import LargeTableAdmin
+from common.utils import chunked_pks
+
+from .enums import ApplicationStatus
+from .listings import invalidate_listings
+from .models import Company, JobAdvert, JobApplication
+from .notifications import notify_decisions
+from .retention import delete_adverts, delete_applications
+
+
+# -------------------- Actions -------------------- #
+def status_action(status):
+    def change_status(modeladmin, request, queryset):
+        changed = 0
+        for pks in chunked_pks(queryset, settings.ADMIN_ACTION_CHUNK_SIZE):
+            changed_pks = JobApplication.objects.filter(pk__in=pks).change_status(status, changed_by=request.user)
+            # The same emails and badge updates as deciding from the site
+            notify_decisions(
+                JobApplication.objects.filter(pk__in=changed_pks).select_related(
+                    "job_advert__company", "job_advert__created_by", "applicant"
+                ),
+                status,
+            )
+            changed += len(changed_pks)
+        modeladmin.message_user(request, f"{changed} application(s) moved to {status.label}.", messages.SUCCESS)
+
+    change_status.__name__ = f"mark_{status.value.lower()}"
+    return admin.action(description=f"Move selected applications to {status.label}")(change_status)
+
+
+@admin.action(description="Unpublish selected adverts")
+def unpublish_adverts(modeladmin, request, queryset):
+    unpublished = 0
+    for pks in chunked_pks(queryset.filter(is_published=True), settings.ADMIN_ACTION_CHUNK_SIZE):
+        unpublished += JobAdvert.objects.filter(pk__in=pks).update(
+            is_published=False, publish_at=None, similarity_stale=True
+        )
+    # Queryset updates skip save(), which queues the "Similar jobs" refresh, and the
+    # post_save signal that normally does this
+    invalidate_listings()
+    modeladmin.message_user(request, f"{unpublished} advert(s) unpublished.", messages.SUCCESS)
+
+
+# -------------------- Admins -------------------- #
+@admin.register(Company)
+class CompanyAdmin(LargeTableAdmin):
+    list_display = ("name", "created_at")
+    search_fields = ("^name",)
+    readonly_fields = ("normalized_name",)
+
+
+@admin.register(JobAdvert)
+class JobAdvertAdmin(LargeTableAdmin):
+    list_display = ("title", "company", "is_published", "deadline", "created_by", "created_at")
+    list_select_related = ("company", "created_by")
+    # Served by advert_listing_idx (is_published, -created_at)
+    list_filter = ("is_published",)
+    search_fields = ("^title", "^company__name")
+    autocomplete_fields = ("company", "created_by")
+    readonly_fields = ("published_at",)
+    actions = (unpublish_adverts,)
+
+    def delete_model(self, request, obj):
+        delete_adverts(JobAdvert.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        delete_adverts(queryset, settings.ADMIN_ACTION_CHUNK_SIZE)
+
+
+@admin.register(JobApplication)
+class JobApplicationAdmin(LargeTableAdmin):
+    list_display = ("name", "email", "status", "job_advert", "company", "created_at")
+    list_select_related = ("job_advert", "job_advert__company")
+    # Served by application_status_idx (status, -created_at)
+    list_filter = ("status",)
+    search_fields = ("=email", "^name")
+    autocomplete_fields = ("job_advert", "applicant")
+    readonly_fields = ("idempotency_key", "decision_seen")
+    actions = [status_action(status) for status in ApplicationStatus]
+
+    @admin.display(ordering="job_advert__company__name")
+    def company(self, obj):
+        return obj.job_advert.company
+
+    def delete_model(self, request, obj):
+        delete_applications(JobApplication.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        delete_applications(queryset, settings.ADMIN_ACTION_CHUNK_SIZE)
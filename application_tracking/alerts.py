@@ -0,0 +1,95 @@
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+
+TERM = re.compile(r"\w+")
+
+
+def terms(text) -> set:
+    return set(TERM.findall((text or "").lower()))
+
+
+def advert_terms(advert) -> set:
+    # The same fields JobAdvertQuerySet.search matches keywords against
+    return terms(" ".join((advert.title, advert.company.name, advert.description, advert.skills)))
+
+
+class SavedSearchIndex:
+    """
+    Inverted index from keyword terms to the saved searches containing them.
+    An advert is matched by looking up its own words, so the cost grows with
+    the advert's length rather than with the number of saved searches.
+
+    A saved search matches when the advert contains every keyword term as a
+    whole word and its location contains the saved location.
+    """
+
+    def __init__(self, searches):
+        self._searches = {}
+        self._required_terms = {}
+        self._by_term = defaultdict(list)
+        # Location-only searches have no terms to index
+        self._unkeyed = []
+        for search in searches:
+            self._searches[search.pk] = search
+            search_terms = terms(search.keyword)
+            if not search_terms:
+                self._unkeyed.append(search)
+                continue
+            self._required_terms[search.pk] = len(search_terms)
+            for term in search_terms:
+                self._by_term[term].append(search.pk)
+
+    def __len__(self):
+        return len(self._searches)
+
+    def match(self, advert) -> list:
+        hits = Counter()
+        for term in advert_terms(advert):
+            hits.update(self._by_term.get(term, ()))
+        candidates = [
+            self._searches[pk] for pk, count in hits.items() if count == self._required_terms[pk]
+        ] + self._unkeyed
+        location = (advert.location or "").lower()
+        return [search for search in candidates if search.location.lower() in location]
+
+
+def group_matches(adverts, index: SavedSearchIndex) -> dict:
+    """user -> {advert: [matching saved searches]}, each advert listed once per user"""
+    digests = defaultdict(lambda: defaultdict(list))
+    for advert in adverts:
+        for search in index.match(advert):
+            digests[search.user][advert].append(search)
+    return digests
+
+
+def digest_message(user, matches) -> EmailMessage:
+    context = {
+        "site_url": settings.SITE_URL,
+        "matches": [(advert, searches) for advert, searches in matches.items()],
+    }
+    count = len(matches)
+    return EmailMessage(
+        subject=f"{count} new job{'s' if count != 1 else ''} matching your saved searches",
+        body=render_to_string("emails/search_digest.txt", context),
+        from_email="noreply@example.com",
+        to=[user.email],
+    )
+
+
+def send_batched(messages, batch_size=100, before_batch=None) -> int:
+    """
+    Send over one mail connection, handing the backend batch_size messages at
+    a time. before_batch(batch) runs before each batch is sent.
+    """
+    sent = 0
+    with get_connection() as connection:
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
+            if before_batch:
+                before_batch(batch)
+            sent += connection.send_messages(batch) or 0
+    return sent
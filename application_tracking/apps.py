@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ApplicationTrackingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'application_tracking'
+
+    def ready(self):
+        from . import signals
+        # Not a model table, so it is created after every migrate (including test databases)
+        post_migrate.connect(signals.create_search_index, sender=self)
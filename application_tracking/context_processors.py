@@ -1,7 +1,35 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+
 from .models import JobApplication, JobAdvert
 from .enums import ApplicationStatus
 
 
+def unseen_decisions(user):
+    """Applications by this user with a decision they haven't looked at yet"""
+    return JobApplication.objects.filter(
+        applicant=user,
+        decision_seen=False
+    ).exclude(
+        status=ApplicationStatus.APPLIED
+    )
+
+
+def get_notification_counts(user) -> dict:
+    """
+    Counts shown as badges in the navigation, also pushed to live notification streams
+    """
+    return {
+        # For applicants
+        'new_decisions_count': unseen_decisions(user).count(),
+        # For employers
+        'pending_decisions_count': JobApplication.objects.filter(
+            job_advert__created_by=user,
+            status=ApplicationStatus.APPLIED
+        ).count(),
+    }
+
+
 def application_notifications(request):
     """
     Context processor to add application notification counts to all templates
@@ -10,28 +38,16 @@ def application_notifications(request):
         'new_decisions_count': 0,
         'unseen_applications': [],
         'pending_decisions_count': 0,
+        # Live streams need an ASGI server; under WSGI the badges are polled instead
+        'notifications_streaming': isinstance(request, ASGIRequest),
+        'notifications_poll_seconds': settings.NOTIFICATIONS_POLL_SECONDS,
     }
     
     if request.user.is_authenticated:
         # Get applications with unseen decisions (not APPLIED status and not seen)
-        # For applicants
-        unseen_applications = JobApplication.objects.filter(
-            email=request.user.email,
-            decision_seen=False
-        ).exclude(
-            status=ApplicationStatus.APPLIED
+        notifications.update(get_notification_counts(request.user))
+        notifications['unseen_applications'] = unseen_decisions(
+            request.user
         ).select_related('job_advert')
-        
-        notifications['new_decisions_count'] = unseen_applications.count()
-        notifications['unseen_applications'] = unseen_applications
-        
-        # Get pending applications count for employer's jobs
-        # For employers
-        pending_applications = JobApplication.objects.filter(
-            job_advert__created_by=request.user,
-            status=ApplicationStatus.APPLIED
-        ).count()
-        
-        notifications['pending_decisions_count'] = pending_applications
     
     return notifications
@@ -0,0 +1,51 @@
+import os
+import zipfile
+from xml.etree import ElementTree
+
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+# Enough for any real CV; keeps a pathological upload from bloating the index
+MAX_TEXT_LENGTH = 100_000
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class CVTextError(Exception):
+    pass
+
+
+def extract_pdf_text(file) -> str:
+    try:
+        reader = PdfReader(file)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except PdfReadError as exc:
+        raise CVTextError(f"Unreadable PDF: {exc}") from exc
+
+
+def extract_docx_text(file) -> str:
+    try:
+        with zipfile.ZipFile(file) as archive:
+            document = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise CVTextError(f"Unreadable DOCX: {exc}") from exc
+    paragraphs = (
+        "".join(node.text or "" for node in paragraph.iter(f"{WORD_NAMESPACE}t"))
+        for paragraph in document.iter(f"{WORD_NAMESPACE}p")
+    )
+    return "\n".join(paragraph for paragraph in paragraphs if paragraph)
+
+
+EXTRACTORS = {
+    ".pdf": extract_pdf_text,
+    ".docx": extract_docx_text,
+}
+
+
+def extract_text(file, name: str) -> str:
+    """Plain text of a CV file object, chosen by the file's extension"""
+    extension = os.path.splitext(name)[1].lower()
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise CVTextError(f"Unsupported CV format: {extension or 'no extension'}")
+    return " ".join(extractor(file).split())[:MAX_TEXT_LENGTH]
@@ -24,4 +24,8 @@ LocationTypeChoice = [
 class ApplicationStatus(models.TextChoices):
     APPLIED = ("APPLIED", "APPLIED")
     REJECTED = ("REJECTED", "REJECTED")
-    INTERVIEW = ("INTERVIEW", "INTERVIEW")
\ No newline at end of file
+    INTERVIEW = ("INTERVIEW", "INTERVIEW")
+
+class WebhookEvent(models.TextChoices):
+    APPLICATION_CREATED = ("application.created", "Application received")
+    APPLICATION_STATUS_CHANGED = ("application.status_changed", "Application status changed")
@@ -1,15 +1,32 @@
+import uuid
+
 from django.forms import ModelForm
-from .models import JobAdvert, JobApplication
+from .models import Company, JobAdvert, JobApplication, WebhookSubscription
+from .webhooks import validate_webhook_url
 from django import forms
 
 
 
 class JobAdvertForm(ModelForm):
+    # Typed freely; spelling variants resolve to the same Company on save
+    company_name = forms.CharField(
+        max_length=150,
+        widget=forms.TextInput(attrs={"placeholder":"Company name", "class":"form-control"}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.company_id:
+            self.initial.setdefault("company_name", self.instance.company.name)
+
+    def save(self, commit=True):
+        self.instance.company = Company.objects.for_name(self.cleaned_data["company_name"])
+        return super().save(commit)
+
     class Meta:
         model = JobAdvert
         fields = [
             "title",
-            "company_name",
             "employment_type",
             "experience_level",
             "job_type",
@@ -17,24 +34,35 @@ class JobAdvertForm(ModelForm):
             "description",
             "skills",
             "is_published",
+            "publish_at",
+            "unpublish_at",
             "deadline"
         ]
 
         widgets = {
             "title": forms.TextInput(attrs={"placeholder":"Job title", "class":"form-control"}),
             "description": forms.Textarea(attrs={"placeholder":"Description", "class":"form-control"}),
-            "company_name": forms.TextInput(attrs={"placeholder":"Company name", "class":"form-control"}),
             "employment_type": forms.Select(attrs={"class":"form-control"}),
             "experience_level": forms.Select(attrs={"class":"form-control"}),
             "job_type": forms.Select(attrs={"class":"form-control"}),
             "location": forms.TextInput(attrs={"placeholder":"Optional", "class":"form-control"}),
             "deadline": forms.DateInput(attrs={"placeholder":"Date", "class":"form-control", "type":"date"}),
+            "publish_at": forms.DateTimeInput(attrs={"class":"form-control", "type":"datetime-local"}, format="%Y-%m-%dT%H:%M"),
+            "unpublish_at": forms.DateTimeInput(attrs={"class":"form-control", "type":"datetime-local"}, format="%Y-%m-%dT%H:%M"),
             "skills": forms.TextInput(attrs={"placeholder":"Comma separated skills", "class":"form-control"}),
 
         }
 
 
 class JobApplicationForm(ModelForm):
+    # Generated once per rendered form so a resubmitted POST can be recognised
+    idempotency_key = forms.CharField(widget=forms.HiddenInput, required=False, max_length=64)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.is_bound:
+            self.initial.setdefault("idempotency_key", uuid.uuid4().hex)
+
     class Meta:
         model = JobApplication
         fields = [
@@ -50,3 +78,33 @@ class JobApplicationForm(ModelForm):
             "portfolio_url": forms.URLInput(attrs={"placeholder": "Portfolio link", "class":"form-control"}),
             "cv": forms.FileInput(attrs={"placeholder": "Select your cv", "class":"form-control", "accept":".pdf, .docx, .doc"}),
         }
+
+
+class InterviewDayForm(forms.Form):
+    day = forms.DateField(widget=forms.DateInput(attrs={"type": "date"}))
+    start_time = forms.TimeField(widget=forms.TimeInput(attrs={"type": "time"}))
+    end_time = forms.TimeField(widget=forms.TimeInput(attrs={"type": "time"}))
+    slot_minutes = forms.IntegerField(min_value=5, max_value=480, initial=30)
+    gap_minutes = forms.IntegerField(min_value=0, max_value=240, initial=0, required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_time, end_time = cleaned_data.get("start_time"), cleaned_data.get("end_time")
+        if start_time and end_time and end_time <= start_time:
+            raise forms.ValidationError("The interview day must end after it starts.")
+        return cleaned_data
+
+
+class WebhookSubscriptionForm(ModelForm):
+    class Meta:
+        model = WebhookSubscription
+        fields = ["url"]
+
+        widgets = {
+            "url": forms.URLInput(attrs={"placeholder": "https://your-ats.example.com/webhooks", "class": "form-control"}),
+        }
+
+    def clean_url(self):
+        url = self.cleaned_data["url"]
+        validate_webhook_url(url)
+        return url
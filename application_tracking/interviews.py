@@ -0,0 +1,73 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import InterviewSlot
+
+
+class SlotIndex:
+    """
+    A recruiter's slots as start and end lists sorted by start time. Slots
+    never overlap, so the ends are sorted as well and a new interval can only
+    collide with the slot just before it: checks and inserts are one bisect.
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for starts_at, ends_at in sorted(intervals):
+            self.starts.append(starts_at)
+            self.ends.append(ends_at)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def conflicts(self, starts_at, ends_at) -> bool:
+        # Slots starting before ends_at are starts[:position]; only the last can still be running
+        position = bisect_left(self.starts, ends_at)
+        return position > 0 and self.ends[position - 1] > starts_at
+
+    def add(self, starts_at, ends_at) -> bool:
+        """Insert the interval unless it overlaps; returns whether it was added"""
+        if self.conflicts(starts_at, ends_at):
+            return False
+        position = bisect_left(self.starts, starts_at)
+        self.starts.insert(position, starts_at)
+        self.ends.insert(position, ends_at)
+        return True
+
+
+def generate_day_slots(recruiter, advert, day, start_time, end_time, slot_minutes, gap_minutes=0):
+    """
+    Create back-to-back slots of slot_minutes between start_time and end_time
+    on day, skipping any that clash with the recruiter's calendar. One query
+    reads the day's existing slots and one bulk insert writes the new ones,
+    with the recruiter's calendar locked in between.
+    Returns (created slots, number skipped).
+    """
+    window_start = timezone.make_aware(datetime.combine(day, start_time))
+    window_end = timezone.make_aware(datetime.combine(day, end_time))
+    length = timedelta(minutes=slot_minutes)
+    step = length + timedelta(minutes=gap_minutes)
+
+    with transaction.atomic():
+        # A concurrent generation for the same recruiter waits here, then sees these slots
+        InterviewSlot.objects.lock_calendar(recruiter)
+        index = SlotIndex(
+            InterviewSlot.objects.filter(
+                recruiter=recruiter, starts_at__lt=window_end, ends_at__gt=window_start
+            ).values_list("starts_at", "ends_at")
+        )
+
+        slots, skipped = [], 0
+        starts_at = window_start
+        while starts_at + length <= window_end:
+            if index.add(starts_at, starts_at + length):
+                slots.append(InterviewSlot(recruiter=recruiter, job_advert=advert,
+                                           starts_at=starts_at, ends_at=starts_at + length))
+            else:
+                skipped += 1
+            starts_at += step
+        return InterviewSlot.objects.bulk_create(slots), skipped
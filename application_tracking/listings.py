@@ -0,0 +1,60 @@
+"""
+Cached pieces of the public advert listings. Every key embeds a version
+number that is bumped whenever an advert is published, unpublished, edited
+or deleted, so stale entries are simply never read again.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+VERSION_KEY = "adverts:listing-version"
+LISTING_CACHE_TIMEOUT = 300
+
+
+def listing_version() -> int:
+    # Seeded from the clock so a version lost to eviction never repeats an old one
+    return cache.get_or_set(VERSION_KEY, time.time_ns, timeout=None)
+
+
+def invalidate_listings() -> None:
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def listing_key(name, *parts) -> str:
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"adverts:listing:{listing_version()}:{name}:{digest}"
+
+
+class ListingPaginator(Paginator):
+    """Paginator whose total count is cached until the listings change"""
+
+    def __init__(self, object_list, per_page, cache_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        return cache.get_or_set(self.cache_key, lambda: Paginator.count.func(self), LISTING_CACHE_TIMEOUT)
+
+
+def company_stats(company) -> dict:
+    """
+    Open roles and total applicants for a company page. Cached under the
+    listing version, so it refreshes when adverts change; applicant totals
+    may lag new applications by up to LISTING_CACHE_TIMEOUT.
+    """
+    from .models import JobApplication
+
+    def compute():
+        return {
+            "open_roles": company.adverts.active().count(),
+            "applicants": JobApplication.objects.filter(job_advert__company=company).count(),
+        }
+
+    return cache.get_or_set(listing_key("company-stats", company.pk), compute, LISTING_CACHE_TIMEOUT)
@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Collect static files (hashed and pre-compressed) and report asset sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-collect', action='store_true',
+            help='Only report sizes of the files already in STATIC_ROOT',
+        )
+
+    def handle(self, *args, **options):
+        if not options['no_collect']:
+            call_command('collectstatic', interactive=False, verbosity=0)
+
+        root = Path(settings.STATIC_ROOT)
+        hashed_names = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        rows = []
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = Path(directory, filename)
+                name = path.relative_to(root).as_posix()
+                if filename.endswith(('.gz', '.br')):
+                    continue
+                # With manifest storage only the hashed copies are referenced by pages
+                if hashed_names and name not in hashed_names and name != 'staticfiles.json':
+                    continue
+                rows.append((
+                    name,
+                    path.stat().st_size,
+                    self.variant_size(path, '.gz'),
+                    self.variant_size(path, '.br'),
+                ))
+
+        if not rows:
+            self.stdout.write(self.style.WARNING(f'No static files found in {root}'))
+            return
+
+        rows.sort(key=lambda row: row[1], reverse=True)
+        width = max(len(row[0]) for row in rows)
+        self.stdout.write(f'{"File":<{width}}  {"Size":>10}  {"Gzip":>10}  {"Brotli":>10}')
+        for name, size, gzip_size, brotli_size in rows:
+            self.stdout.write(
+                f'{name:<{width}}  {self.format_size(size):>10}  '
+                f'{self.format_size(gzip_size):>10}  {self.format_size(brotli_size):>10}'
+            )
+
+        total = sum(row[1] for row in rows)
+        # What a client downloads when it takes the smallest variant of every file
+        transferred = sum(min(size for size in row[1:] if size is not None) for row in rows)
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{len(rows)} file(s): {self.format_size(total)} on disk, '
+            f'{self.format_size(transferred)} transferred with compression'
+        ))
+
+    @staticmethod
+    def variant_size(path: Path, suffix: str):
+        variant = Path(f'{path}{suffix}')
+        return variant.stat().st_size if variant.is_file() else None
+
+    @staticmethod
+    def format_size(size):
+        if size is None:
+            return '-'
+        if size < 1024:
+            return f'{size} B'
+        return f'{size / 1024:.1f} KiB'
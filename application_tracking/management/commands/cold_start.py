@@ -0,0 +1,86 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# "import time: <self us> | <cumulative us> | <indent><module>" lines written by -X importtime
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def parse_importtime(output: str) -> list:
+    """[(module, self seconds, cumulative seconds)] in import order"""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            imports.append((match[4], int(match[1]) / 1e6, int(match[2]) / 1e6))
+    return imports
+
+
+class Command(BaseCommand):
+    help = 'Start fresh interpreters the way a new worker starts and report where the time goes before its first response'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/', help='Path of the first request')
+        parser.add_argument('--runs', type=int, default=3, help='Cold starts to time; the median is reported')
+        parser.add_argument('--top', type=int, default=15, help='Packages and modules listed in the import breakdown')
+        parser.add_argument('--warmup', action='store_true',
+                            help='Start with WORKER_WARMUP on, as a worker that primes itself before taking traffic')
+        parser.add_argument('--budget', type=float,
+                            help='Fail when the median time from launch to first response exceeds this many ms')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+        runs = [self.cold_start(options['path'], options['warmup']) for _ in range(options['runs'])]
+        timings, imports = [timing for timing, _ in runs], runs[-1][1]
+
+        def median(key):
+            return statistics.median(timing[key] for timing in timings) * 1000
+
+        interpreter, ready, responded = median('interpreter'), median('ready'), median('responded')
+        self.stdout.write(f"Cold start of {options['path']} (median of {len(runs)}, status {timings[-1]['status']}):")
+        self.stdout.write(f'  Interpreter start      {interpreter:8.1f}ms')
+        self.stdout.write(f'  Settings, apps, WSGI   {ready - interpreter:8.1f}ms')
+        self.stdout.write(f'  First response         {responded - ready:8.1f}ms')
+        self.stdout.write(f'  Launch to response     {responded:8.1f}ms')
+        self.write_imports(imports, options['top'])
+
+        if options['budget'] is not None and responded > options['budget']:
+            raise CommandError(f"Cold start took {responded:.1f}ms, over the {options['budget']:.0f}ms budget")
+
+    def cold_start(self, path, warmup):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'talent_base.settings'),
+            'COLD_START_LAUNCHED': repr(time.time()),
+        }
+        if warmup:
+            env['WORKER_WARMUP'] = 'True'
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'talent_base.coldstart', path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Cold start failed:\n{result.stderr[-2000:]}')
+        return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+    def write_imports(self, imports, top):
+        packages = Counter()
+        for module, self_seconds, _ in imports:
+            packages[module.split('.')[0]] += self_seconds
+        total = sum(packages.values()) * 1000
+        self.stdout.write(f'\nImports: {len(imports)} modules, {total:.1f}ms (last run, slowed by -X importtime)')
+        self.stdout.write('  By package:')
+        for package, seconds in packages.most_common(top):
+            self.stdout.write(f'    {seconds * 1000:8.1f}ms  {package}')
+        self.stdout.write('  Slowest modules (self time):')
+        for module, self_seconds, cumulative in sorted(imports, key=lambda item: item[1], reverse=True)[:top]:
+            self.stdout.write(f'    {self_seconds * 1000:8.1f}ms  {module} ({cumulative * 1000:.1f}ms with its imports)')
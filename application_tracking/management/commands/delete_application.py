@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from application_tracking.models import JobApplication
+from application_tracking.retention import delete_applications
 
 
 class Command(BaseCommand):
@@ -11,12 +12,11 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         email = options['email']
         
-        # Find and delete applications with the given email
+        # Find and delete applications with the given email, in batches and with their CV files
         applications = JobApplication.objects.filter(email__iexact=email)
-        count = applications.count()
+        count = delete_applications(applications)['applications']
         
         if count > 0:
-            applications.delete()
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully deleted {count} application(s) for email: {email}')
             )
@@ -1,17 +1,17 @@
 from django.core.management.base import BaseCommand
 from application_tracking.models import JobAdvert
+from application_tracking.retention import delete_adverts
 
 
 class Command(BaseCommand):
     help = 'Delete test job advert with title "a"'
 
     def handle(self, *args, **options):
-        # Find and delete job adverts with title "a"
+        # Find and delete job adverts with title "a", with their applications and CV files
         test_jobs = JobAdvert.objects.filter(title__iexact='a')
-        count = test_jobs.count()
+        count = delete_adverts(test_jobs)['adverts']
         
         if count > 0:
-            test_jobs.delete()
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully deleted {count} test job(s) with title "a"')
             )
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from application_tracking.cv_text import CVTextError, extract_text
+from application_tracking.models import ApplicationCVText
+from application_tracking.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Extract text from uploaded CVs into the applicant search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='CVs processed per batch')
+        parser.add_argument('--watch', action='store_true',
+                            help='Keep running, polling for new CVs')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to sleep between polls with --watch')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Queue CVs whose extraction failed before')
+        parser.add_argument('--reindex', action='store_true',
+                            help='Rebuild the search index from the database first')
+
+    def handle(self, *args, **options):
+        if options['reindex']:
+            rebuild_search_index()
+            self.stdout.write('Rebuilt the applicant search index')
+        if options['retry_failed']:
+            ApplicationCVText.objects.exclude(error='').update(extracted_at=None, error='')
+
+        while True:
+            processed = self.process_batch(options['batch_size'])
+            if processed:
+                continue
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
+
+    def process_batch(self, batch_size) -> int:
+        # The CV is attached after the application commits, so skip rows still waiting for it
+        pending = ApplicationCVText.objects.filter(
+            extracted_at__isnull=True
+        ).exclude(application__cv='').select_related('application').order_by('id')[:batch_size]
+
+        processed = 0
+        for document in pending:
+            cv = document.application.cv
+            try:
+                with cv.open('rb') as file:
+                    document.text = extract_text(file, cv.name)
+                document.error = ''
+            except (CVTextError, OSError) as exc:
+                document.text = ''
+                document.error = str(exc)[:255]
+                self.stderr.write(f'{cv.name}: {document.error}')
+            document.extracted_at = timezone.now()
+            document.save(update_fields=['text', 'error', 'extracted_at'])
+            processed += 1
+
+        if processed:
+            self.stdout.write(self.style.SUCCESS(f'Extracted {processed} CV(s)'))
+        return processed
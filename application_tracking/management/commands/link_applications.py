@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Lower
+
+from accounts.models import User
+from application_tracking.models import JobApplication
+
+
+class Command(BaseCommand):
+    help = 'Link applications without an applicant to the user registered with the same email'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Applications examined per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        linked = examined = 0
+        last_pk = None
+
+        while True:
+            # Keyset pagination keeps every batch an indexed range scan
+            unlinked = JobApplication.objects.filter(applicant__isnull=True).order_by('pk')
+            if last_pk is not None:
+                unlinked = unlinked.filter(pk__gt=last_pk)
+            batch = list(unlinked.values_list('pk', 'email')[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            examined += len(batch)
+
+            emails = {email.lower() for _, email in batch}
+            users = dict(
+                User.objects.annotate(normalized_email=Lower('email'))
+                .filter(normalized_email__in=emails)
+                .values_list('normalized_email', 'pk')
+            )
+            updates = [
+                JobApplication(pk=pk, applicant_id=users[email.lower()])
+                for pk, email in batch
+                if email.lower() in users
+            ]
+            JobApplication.objects.bulk_update(updates, ['applicant'])
+            linked += len(updates)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Linked {linked} of {examined} unlinked application(s)')
+        )
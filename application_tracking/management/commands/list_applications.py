@@ -1,19 +1,93 @@
+import csv
+import json
+import uuid
+from datetime import date
+
 from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from application_tracking.enums import ApplicationStatus
 from application_tracking.models import JobApplication
 
+FIELDS = ['id', 'name', 'email', 'job', 'company', 'status', 'applied_at']
+
 
 class Command(BaseCommand):
-    help = 'List all job applications'
+    help = 'List job applications, optionally filtered, as a table, CSV or JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--advert', type=uuid.UUID, help='Only applications to this advert id')
+        parser.add_argument('--status', choices=ApplicationStatus.values, help='Only applications in this status')
+        parser.add_argument('--email', help='Only applications from this email (case-insensitive)')
+        parser.add_argument('--since', type=date.fromisoformat, help='Applied on or after this day (YYYY-MM-DD)')
+        parser.add_argument('--until', type=date.fromisoformat, help='Applied on or before this day (YYYY-MM-DD)')
+        parser.add_argument('--format', choices=['table', 'csv', 'json'], default='table')
+        parser.add_argument('--limit', type=int, help='Print at most this many applications')
 
     def handle(self, *args, **options):
-        applications = JobApplication.objects.all()
-        
-        if applications.exists():
-            self.stdout.write(self.style.SUCCESS(f'Found {applications.count()} application(s):\n'))
-            for app in applications:
-                self.stdout.write(
-                    f'ID: {app.id} | Name: {app.name} | Email: {app.email} | '
-                    f'Job: {app.job_advert.title} | Status: {app.status}'
-                )
-        else:
-            self.stdout.write(self.style.WARNING('No applications found'))
+        applications = self.filter(JobApplication.objects.all(), options)
+
+        # One grouped query instead of exists() + count(); CSV and JSON keep stdout machine-readable
+        summary = dict(applications.order_by().values_list('status').annotate(total=Count('id')))
+        total = sum(summary.values())
+        report = self.stdout if options['format'] == 'table' else self.stderr
+        if not total:
+            report.write(self.style.WARNING('No applications found'))
+            return
+
+        rows = applications.select_related('job_advert__company').only(
+            'name', 'email', 'status', 'created_at', 'job_advert__title', 'job_advert__company__name',
+        ).order_by('-created_at')
+        if options['limit'] is not None:
+            rows = rows[:options['limit']]
+        write = getattr(self, f"write_{options['format']}")
+        write(self.row(application) for application in rows.iterator(chunk_size=2000))
+
+        report.write(self.style.SUCCESS(
+            f'Found {total} application(s): ' + ', '.join(f'{summary[status]} {status}' for status in sorted(summary))
+        ))
+
+    def filter(self, applications, options):
+        if options['advert']:
+            applications = applications.filter(job_advert_id=options['advert'])
+        if options['status']:
+            applications = applications.filter(status=options['status'])
+        if options['email']:
+            applications = applications.filter(email__iexact=options['email'])
+        if options['since']:
+            applications = applications.filter(created_at__date__gte=options['since'])
+        if options['until']:
+            applications = applications.filter(created_at__date__lte=options['until'])
+        return applications
+
+    def row(self, application) -> dict:
+        return {
+            'id': str(application.id),
+            'name': application.name,
+            'email': application.email,
+            'job': application.job_advert.title,
+            'company': application.job_advert.company.name,
+            'status': application.status,
+            'applied_at': application.created_at.isoformat(),
+        }
+
+    def write_table(self, rows):
+        for row in rows:
+            self.stdout.write(
+                f"ID: {row['id']} | Name: {row['name']} | Email: {row['email']} | "
+                f"Job: {row['job']} | Status: {row['status']}"
+            )
+
+    def write_csv(self, rows):
+        writer = csv.DictWriter(self.stdout, fieldnames=FIELDS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+    def write_json(self, rows):
+        # One JSON array, written row by row instead of being built in memory
+        separator = ''
+        self.stdout.write('[', ending='')
+        for row in rows:
+            self.stdout.write(f'{separator}\n{json.dumps(row)}', ending='')
+            separator = ','
+        self.stdout.write('\n]')
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from application_tracking import retention
+
+
+class Command(BaseCommand):
+    help = 'Apply data-retention policies in small batches, removing CV files once rows are gone'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--closed-adverts-months', type=int,
+                            help='Delete applications to adverts closed more than this many months ago')
+        parser.add_argument('--webhook-days', type=int,
+                            help='Delete webhook events delivered or given up on more than this many days ago')
+        parser.add_argument('--email', action='append', default=[],
+                            help='Erase everything stored for this email address (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=retention.DEFAULT_BATCH_SIZE,
+                            help='Rows deleted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+
+    def handle(self, *args, **options):
+        months, webhook_days = options['closed_adverts_months'], options['webhook_days']
+        if months is None and webhook_days is None and not options['email']:
+            raise CommandError('Choose a policy: --closed-adverts-months, --webhook-days and/or --email')
+        if months is not None and months < 0:
+            raise CommandError('--closed-adverts-months must not be negative')
+        if webhook_days is not None and webhook_days < 0:
+            raise CommandError('--webhook-days must not be negative')
+
+        batch_size, dry_run = options['batch_size'], options['dry_run']
+        if months is not None:
+            self.report(
+                f'Applications to adverts closed over {months} month(s) ago',
+                retention.delete_applications(retention.closed_advert_applications(months), batch_size, dry_run),
+                dry_run,
+            )
+        if webhook_days is not None:
+            self.report(
+                f'Webhook events finished over {webhook_days} day(s) ago',
+                {'webhook events': retention.delete_in_batches(
+                    retention.finished_webhook_deliveries(webhook_days), batch_size, dry_run
+                )},
+                dry_run,
+            )
+        for email in options['email']:
+            self.report(email, retention.purge_email(email, batch_size, dry_run), dry_run)
+
+    def report(self, policy, counts, dry_run):
+        summary = ', '.join(f'{count} {label}' for label, count in counts.items() if count) or 'nothing'
+        verb = 'Would delete' if dry_run else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{policy}: {verb} {summary}'))
@@ -0,0 +1,27 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from application_tracking.models import DailyApplicationRollup
+
+
+class Command(BaseCommand):
+    help = 'Recompute daily application rollups from applications and status history (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2,
+                            help='Rebuild this many days ending today (default: yesterday and today)')
+        parser.add_argument('--start', type=date.fromisoformat, help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        end = options['end'] or timezone.localdate()
+        start = options['start'] or end - timedelta(days=options['days'] - 1)
+        if start > end:
+            raise CommandError('--start must not be after --end')
+
+        written = DailyApplicationRollup.objects.rebuild(start, end)
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {written} rollup row(s) for {start} to {end}')
+        )
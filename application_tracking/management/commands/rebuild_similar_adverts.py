@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from application_tracking.similarity import rebuild_similar_adverts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the "Similar jobs" neighbours of every published advert (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, help='Neighbours per advert (default: SIMILAR_ADVERTS_COUNT)')
+
+    def handle(self, *args, **options):
+        written = rebuild_similar_adverts(options['count'])
+        self.stdout.write(self.style.SUCCESS(f'Stored {written} similar-advert link(s)'))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from application_tracking.scheduler import AdvertScheduler
+
+
+class Command(BaseCommand):
+    help = 'Publish and unpublish adverts at their scheduled times and deadlines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Apply everything due now and exit (for cron)')
+        parser.add_argument('--refresh', type=int, default=60,
+                            help='Seconds between reloads of upcoming events')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Adverts changed per UPDATE')
+
+    def handle(self, *args, **options):
+        scheduler = AdvertScheduler(
+            refresh=timedelta(seconds=options['refresh']), batch_size=options['batch_size']
+        )
+        if options['once']:
+            changed = scheduler.run_once()
+            self.stdout.write(self.style.SUCCESS(f'Updated {changed} advert(s)'))
+            return
+        scheduler.run_forever(
+            on_change=lambda changed: self.stdout.write(f'Updated {changed} advert(s)')
+        )
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from application_tracking.alerts import SavedSearchIndex, digest_message, group_matches, send_batched
+from application_tracking.models import JobAdvert, SavedSearch, SearchDigestDelivery, SearchDigestRun
+
+
+class Command(BaseCommand):
+    help = 'Email each user one digest of new adverts matching their saved searches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Emails handed to the mail backend at a time')
+        parser.add_argument('--first-run-days', type=int, default=1,
+                            help='How far back to look when no digest has been sent yet')
+
+    def handle(self, *args, **options):
+        run = SearchDigestRun.objects.filter(completed_at__isnull=True).order_by('until').first()
+        if run is None:
+            run = SearchDigestRun.objects.create(until=timezone.now())
+        else:
+            self.stdout.write(f'Resuming the interrupted run up to {run.until:%Y-%m-%d %H:%M}')
+        previous = SearchDigestRun.objects.filter(until__lt=run.until).order_by('-until').first()
+        since = previous.until if previous else run.until - timedelta(days=options['first_run_days'])
+
+        adverts = list(
+            JobAdvert.objects.active()
+            .filter(published_at__gt=since, published_at__lte=run.until)
+            .select_related('company')
+            .only('title', 'company__name', 'description', 'skills', 'location', 'deadline')
+        )
+        sent = 0
+        if adverts:
+            index = SavedSearch.objects.filter(user__is_active=True).exclude(
+                user__in=run.deliveries.values('user')
+            ).select_related('user')
+            digests = group_matches(adverts, SavedSearchIndex(index))
+            messages = []
+            for user, matches in digests.items():
+                message = digest_message(user, matches)
+                message.user = user
+                messages.append(message)
+
+            def record(batch):
+                # Before sending, so a crash mid-run can't resend these on resume
+                SearchDigestDelivery.objects.bulk_create(
+                    [SearchDigestDelivery(run=run, user=message.user) for message in batch]
+                )
+
+            sent = send_batched(messages, options['batch_size'], before_batch=record)
+
+        run.adverts = len(adverts)
+        run.emails_sent = run.deliveries.count()
+        run.completed_at = timezone.now()
+        run.save(update_fields=['adverts', 'emails_sent', 'completed_at'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Sent {sent} digest(s) covering {len(adverts)} new advert(s)')
+        )
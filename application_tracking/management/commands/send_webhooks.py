@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from application_tracking.webhooks import WebhookDispatcher
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued application events to employer webhooks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Send everything due now and exit (for cron)')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait when the outbox is empty')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Events claimed per flush')
+        parser.add_argument('--max-events', type=int, default=100,
+                            help='Events per request to one endpoint')
+
+    def handle(self, *args, **options):
+        dispatcher = WebhookDispatcher(batch_size=options['batch_size'], max_events=options['max_events'])
+        if options['once']:
+            try:
+                self.report(dispatcher.drain())
+            finally:
+                dispatcher.pool.close()
+            return
+        dispatcher.run_forever(interval=options['interval'], on_flush=self.report)
+
+    def report(self, counts):
+        self.stdout.write(f"Delivered {counts['delivered']} event(s), {counts['failed']} failed")
@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from talent_base.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Compile every template, reporting failures and how long compilation takes'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        compiled = warm_templates()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(
+            self.style.SUCCESS(f'Compiled {compiled} template(s) in {elapsed:.1f}ms')
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-19 17:52
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """Keep the earliest application per (advert, email) so the unique constraint can be added."""
+    JobApplication = apps.get_model("application_tracking", "JobApplication")
+    seen = set()
+    duplicates = []
+    for pk, advert_id, email in JobApplication.objects.order_by("created_at").values_list(
+        "pk", "job_advert_id", "email"
+    ):
+        key = (advert_id, email.lower())
+        if key in seen:
+            duplicates.append(pk)
+        else:
+            seen.add(key)
+    JobApplication.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0003_jobapplication_decision_seen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(models.F('job_advert'), django.db.models.functions.text.Lower('email'), name='unique_application_per_advert_email'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(fields=('job_advert', 'idempotency_key'), name='unique_application_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:00
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0005_jobapplication_applicant'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusChange',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('from_status', models.CharField(choices=[('APPLIED', 'APPLIED'), ('REJECTED', 'REJECTED'), ('INTERVIEW', 'INTERVIEW')], max_length=20)),
+                ('to_status', models.CharField(choices=[('APPLIED', 'APPLIED'), ('REJECTED', 'REJECTED'), ('INTERVIEW', 'INTERVIEW')], max_length=20)),
+                ('time_in_stage', models.DurationField()),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='application_tracking.jobapplication')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('job_advert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='application_tracking.jobadvert')),
+            ],
+            options={
+                'ordering': ('created_at',),
+                'indexes': [models.Index(fields=['application', 'created_at'], name='application_applica_4a216b_idx'), models.Index(fields=['job_advert', 'created_at'], name='application_job_adv_f74d16_idx')],
+            },
+        ),
+    ]
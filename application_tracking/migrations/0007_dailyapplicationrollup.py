@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0006_applicationstatuschange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('APPLIED', 'APPLIED'), ('REJECTED', 'REJECTED'), ('INTERVIEW', 'INTERVIEW')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('job_advert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='application_tracking.jobadvert')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job_advert', 'date', 'status'), name='unique_daily_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_pending_cv_texts(apps, schema_editor):
+    """Queue every existing application for extraction; the search index is built after migrate."""
+    JobApplication = apps.get_model("application_tracking", "JobApplication")
+    ApplicationCVText = apps.get_model("application_tracking", "ApplicationCVText")
+    ApplicationCVText.objects.bulk_create(
+        (ApplicationCVText(application_id=pk) for pk in JobApplication.objects.values_list("pk", flat=True).iterator()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0007_dailyapplicationrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationCVText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(blank=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cv_text', to='application_tracking.jobapplication')),
+            ],
+        ),
+        migrations.RunPython(create_pending_cv_texts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def backfill_publication_state(apps, schema_editor):
+    """active() no longer checks the deadline, so take down adverts that have already expired."""
+    JobAdvert = apps.get_model("application_tracking", "JobAdvert")
+    JobAdvert.objects.filter(is_published=True).update(published_at=F("created_at"))
+    JobAdvert.objects.filter(is_published=True, deadline__lt=timezone.localdate()).update(is_published=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0009_savedsearch_searchdigestrun'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobadvert',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='published_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='unpublish_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(fields=['is_published', '-created_at'], name='advert_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_published', False)), fields=['publish_at'], name='advert_publish_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['unpublish_at'], name='advert_unpublish_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['deadline'], name='advert_deadline_due_idx'),
+        ),
+        migrations.RunPython(backfill_publication_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+import re
+import uuid
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+COMPANY_SUFFIXES = {"co", "company", "corp", "corporation", "inc", "incorporated", "limited", "llc", "ltd", "plc"}
+
+
+def normalize_company_name(name):
+    # Frozen copy of application_tracking.models.normalize_company_name
+    words = re.findall(r"\w+", (name or "").casefold())
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def create_companies(apps, schema_editor):
+    """One company per normalized name, named after its most used spelling."""
+    JobAdvert = apps.get_model("application_tracking", "JobAdvert")
+    Company = apps.get_model("application_tracking", "Company")
+
+    raw_names = defaultdict(list)
+    spellings = defaultdict(Counter)
+    for row in JobAdvert.objects.values("company_name").annotate(adverts=models.Count("id")):
+        name = " ".join(row["company_name"].split()) or "Unknown company"
+        normalized_name = normalize_company_name(name)
+        raw_names[normalized_name].append(row["company_name"])
+        spellings[normalized_name][name] += row["adverts"]
+
+    for normalized_name, names in spellings.items():
+        display_name = min(names, key=lambda name: (-names[name], name))
+        company = Company.objects.create(name=display_name, normalized_name=normalized_name)
+        JobAdvert.objects.filter(company_name__in=raw_names[normalized_name]).update(company=company)
+
+
+def restore_company_names(apps, schema_editor):
+    JobAdvert = apps.get_model("application_tracking", "JobAdvert")
+    for advert in JobAdvert.objects.select_related("company"):
+        JobAdvert.objects.filter(pk=advert.pk).update(company_name=advert.company.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0011_interviewslot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=150)),
+                ('normalized_name', models.CharField(editable=False, max_length=150, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'companies',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='company',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='adverts', to='application_tracking.company'),
+        ),
+        migrations.RunPython(create_companies, restore_company_names),
+        migrations.AlterField(
+            model_name='jobadvert',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='adverts', to='application_tracking.company'),
+        ),
+        # A default lets the column be re-added when migrating backwards
+        migrations.AlterField(
+            model_name='jobadvert',
+            name='company_name',
+            field=models.CharField(default='', max_length=150),
+        ),
+        migrations.RemoveField(
+            model_name='jobadvert',
+            name='company_name',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0014_webhooks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarAdvert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('advert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_links', to='application_tracking.jobadvert')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='application_tracking.jobadvert')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['advert', '-score'], name='similar_advert_idx')],
+                'constraints': [models.UniqueConstraint(fields=('advert', 'similar'), name='unique_similar_advert')],
+            },
+        ),
+    ]
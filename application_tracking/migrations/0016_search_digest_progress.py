@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-19 19:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def complete_existing_runs(apps, schema_editor):
+    """Runs recorded before this migration only existed once they had finished"""
+    SearchDigestRun = apps.get_model("application_tracking", "SearchDigestRun")
+    SearchDigestRun.objects.update(completed_at=F("until"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0015_similar_advert'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchdigestrun',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='SearchDigestDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='application_tracking.searchdigestrun')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('run', 'user'), name='unique_digest_per_run_user')],
+            },
+        ),
+        migrations.RunPython(complete_existing_runs, migrations.RunPython.noop),
+    ]
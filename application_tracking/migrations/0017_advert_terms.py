@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-19 19:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def queue_published_adverts(apps, schema_editor):
+    """Index the adverts published before AdvertTerm existed on the scheduler's next pass"""
+    JobAdvert = apps.get_model("application_tracking", "JobAdvert")
+    JobAdvert.objects.filter(is_published=True).update(similarity_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0016_search_digest_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdvertTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='similarity_stale',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('similarity_stale', True)), fields=['id'], name='advert_similarity_stale_idx'),
+        ),
+        migrations.AddField(
+            model_name='advertterm',
+            name='advert',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='application_tracking.jobadvert'),
+        ),
+        migrations.AddIndex(
+            model_name='advertterm',
+            index=models.Index(fields=['term'], name='advert_term_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='advertterm',
+            constraint=models.UniqueConstraint(fields=('advert', 'term'), name='unique_advert_term'),
+        ),
+        migrations.RunPython(queue_published_adverts, migrations.RunPython.noop),
+    ]
@@ -1,29 +1,105 @@
-from django.db import models
+import logging
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+from urllib.parse import urlencode
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
 from django.urls import reverse
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.crypto import get_random_string
+from django.db.models import Avg, Count, F, Max, Q
+from django.db.models.functions import Lower, TruncDate
 
 from accounts.models import User
 from common.models import BaseModel
 
+from . import search
 from .enums import (ApplicationStatus, EmploymentType, ExperienceLevel,
-                    LocationTypeChoice)
+                    LocationTypeChoice, WebhookEvent)
+
+logger = logging.getLogger(__name__)
+
+COMPANY_SUFFIXES = {"co", "company", "corp", "corporation", "inc", "incorporated", "limited", "llc", "ltd", "plc"}
+
+
+def normalize_company_name(name) -> str:
+    """Spelling-insensitive key: "ACME Ltd." and "Acme" both become "acme" """
+    words = re.findall(r"\w+", (name or "").casefold())
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+class CompanyQuerySet(models.QuerySet):
+
+    def for_name(self, name) -> "Company":
+        """The company with this name or a spelling variant of it, created if new"""
+        normalized_name = normalize_company_name(name)
+        company = self.filter(normalized_name=normalized_name).first()
+        if company:
+            return company
+        try:
+            with transaction.atomic():
+                return self.create(name=" ".join(name.split()))
+        except IntegrityError:
+            # A concurrent request created the company first
+            return self.get(normalized_name=normalized_name)
+
+
+class Company(BaseModel):
+    name = models.CharField(max_length=150)
+    normalized_name = models.CharField(max_length=150, unique=True, editable=False)
+
+    objects = CompanyQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("name",)
+        verbose_name_plural = "companies"
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_company_name(self.name)
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse("company", kwargs={"company_id": self.id})
 
 
 class JobAdvertQuerySet(models.QuerySet):
 
     def active(self):
-        return self.filter(is_published=True, deadline__gte=timezone.now().date())
+        # Expiry and scheduling are applied to is_published by run_advert_scheduler
+        return self.filter(is_published=True)
 
+    def due_to_publish(self, moment):
+        return self.filter(is_published=False, publish_at__lte=moment)
 
-    def search(self, keyword, location):
+    def due_to_unpublish(self, moment):
+        """Published adverts past their unpublish_at or whose deadline day has ended by moment"""
+        return self.filter(is_published=True).filter(
+            Q(unpublish_at__lte=moment) | Q(deadline__lt=timezone.localdate(moment))
+        )
+
+    def with_applicant_counts(self):
+        """Annotate what total_applicants and pending_applications_count would each query for"""
+        return self.annotate(
+            applicant_count=Count("applications"),
+            pending_count=Count("applications", filter=Q(applications__status=ApplicationStatus.APPLIED)),
+        )
+
+
+    def search(self, keyword, location, company_id=None):
 
         query = Q()
 
         if keyword:
             query &= (
                 Q(title__icontains=keyword)
-                | Q(company_name__icontains=keyword)
+                | Q(company__name__icontains=keyword)
                 | Q(description__icontains=keyword)
                 | Q(skills__icontains=keyword)
             )
@@ -31,44 +107,223 @@ class JobAdvertQuerySet(models.QuerySet):
         if location:
             query &= Q(location__icontains=location)
 
+        if company_id:
+            query &= Q(company_id=company_id)
+
         return self.active().filter(query)
 
 
 class JobAdvert(BaseModel):
+    # What "Similar jobs" is computed from; a save that changes none of these needs no refresh
+    SIMILARITY_FIELDS = ("title", "skills", "description", "is_published")
+
     title = models.CharField(max_length=150)
-    company_name =  models.CharField(max_length=150)
+    company = models.ForeignKey(Company, related_name="adverts", on_delete=models.PROTECT)
     employment_type = models.CharField(max_length=50, choices=EmploymentType)
     experience_level = models.CharField(max_length=50, choices=ExperienceLevel)
     description = models.TextField()
     job_type =  models.CharField(max_length=50, choices=LocationTypeChoice)
     location =  models.CharField(max_length=255, null=True, blank=True)
     is_published = models.BooleanField(default=True)
+    # Optional schedule, applied by run_advert_scheduler; the deadline always unpublishes
+    publish_at = models.DateTimeField(null=True, blank=True)
+    unpublish_at = models.DateTimeField(null=True, blank=True)
+    published_at = models.DateTimeField(null=True, blank=True, editable=False)
     deadline = models.DateField()
     skills = models.CharField(max_length=255)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    # Set on save, cleared by run_advert_scheduler once SimilarAdvert is refreshed
+    similarity_stale = models.BooleanField(default=False, editable=False)
 
     objects = JobAdvertQuerySet.as_manager()
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["is_published", "-created_at"], name="advert_listing_idx"),
+            models.Index(fields=["publish_at"], condition=Q(is_published=False),
+                         name="advert_publish_due_idx"),
+            models.Index(fields=["unpublish_at"], condition=Q(is_published=True),
+                         name="advert_unpublish_due_idx"),
+            models.Index(fields=["deadline"], condition=Q(is_published=True),
+                         name="advert_deadline_due_idx"),
+            models.Index(fields=["id"], condition=Q(similarity_stale=True),
+                         name="advert_similarity_stale_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._similarity_source = instance.similarity_source()
+        return instance
+
+    def similarity_source(self) -> dict:
+        # __dict__ rather than getattr so deferred fields are not loaded
+        return {field: self.__dict__[field] for field in self.SIMILARITY_FIELDS if field in self.__dict__}
+
+    def similarity_changed(self) -> bool:
+        """Whether saving now would change this advert's "Similar jobs" input"""
+        loaded = getattr(self, "_similarity_source", None)
+        if self._state.adding or loaded is None:
+            return True
+        return any(field not in loaded or loaded[field] != value
+                   for field, value in self.similarity_source().items())
+
+    def save(self, *args, **kwargs):
+        self.apply_schedule()
+        if self.similarity_changed():
+            self.similarity_stale = True
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "similarity_stale"}
+        super().save(*args, **kwargs)
+        self._similarity_source = self.similarity_source()
+
+    def apply_schedule(self, now=None) -> None:
+        """Hold back adverts scheduled for later and take down expired ones"""
+        now = now or timezone.now()
+        if self.publish_at and self.publish_at > now:
+            self.is_published = False
+        elif self.is_published and self.closes_at <= now:
+            self.is_published = False
+        if self.is_published and self.published_at is None:
+            self.published_at = now
+
+    @property
+    def closes_at(self):
+        """When the advert must come down: unpublish_at or the end of the deadline day"""
+        deadline_end = timezone.make_aware(datetime.combine(self.deadline + timedelta(days=1), time.min))
+        return min(self.unpublish_at, deadline_end) if self.unpublish_at else deadline_end
+
+    def __str__(self):
+        return self.title
 
-    
     def publish_advert(self) -> None:
         self.is_published = True
-        self.save(update_fields=["is_published"])
+        self.publish_at = None
+        self.save(update_fields=["is_published", "publish_at", "published_at"])
 
     @property
     def total_applicants(self):
+        # One COUNT per advert unless loaded through with_applicant_counts()
+        if hasattr(self, "applicant_count"):
+            return self.applicant_count
         return self.applications.count()
     
     @property
     def pending_applications_count(self):
+        if hasattr(self, "pending_count"):
+            return self.pending_count
         return self.applications.filter(status=ApplicationStatus.APPLIED).count()
     
+    def similar_adverts(self, limit=None) -> list:
+        """Published adverts most like this one, from the precomputed SimilarAdvert table"""
+        links = SimilarAdvert.objects.filter(advert=self, similar__is_published=True).select_related(
+            "similar__company"
+        ).order_by("-score")
+        return [link.similar for link in links[:limit]]
+
     def get_absolute_url(self):
         return reverse("job_advert", kwargs={"advert_id": self.id})
     
 
+class SimilarAdvert(models.Model):
+    """
+    One of an advert's top SIMILAR_ADVERTS_COUNT neighbours by text
+    similarity, kept by application_tracking.similarity.
+    """
+    advert = models.ForeignKey(JobAdvert, related_name="similar_links", on_delete=models.CASCADE)
+    similar = models.ForeignKey(JobAdvert, related_name="+", on_delete=models.CASCADE)
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["advert", "-score"], name="similar_advert_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["advert", "similar"], name="unique_similar_advert"),
+        ]
+
+
+class AdvertTerm(models.Model):
+    """
+    A term of a published advert and its unit-length TF-IDF weight: the
+    stored inverted index "Similar jobs" candidates are scored from.
+    """
+    advert = models.ForeignKey(JobAdvert, related_name="terms", on_delete=models.CASCADE)
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["term"], name="advert_term_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["advert", "term"], name="unique_advert_term"),
+        ]
+
+
+class JobApplicationQuerySet(models.QuerySet):
+
+    def duplicate_of(self, email, idempotency_key=None):
+        """
+        Return an existing application that collides with a new submission,
+        either by applicant email (case-insensitive) or by idempotency key.
+        """
+        query = Q(email__iexact=email)
+        if idempotency_key:
+            query |= Q(idempotency_key=idempotency_key)
+        return self.filter(query).first()
+
+    def change_status(self, status, changed_by=None) -> list:
+        """
+        Bulk JobApplication.change_status: one update, one history insert and
+        one rollup increment per advert for every application not already in
+        status. Narrow the queryset to a batch first. Returns the pks changed.
+        """
+        with transaction.atomic():
+            applications = list(
+                self.exclude(status=status).select_for_update(of=("self",)).select_related("job_advert").only(
+                    "name", "email", "portfolio_url", "status", "job_advert_id", "created_at",
+                    "job_advert__title", "job_advert__created_by_id",
+                )
+            )
+            if not applications:
+                return []
+            pks = [application.pk for application in applications]
+            entered = dict(
+                ApplicationStatusChange.objects.filter(application__in=pks)
+                .values("application").annotate(last=Max("created_at")).values_list("application", "last")
+            )
+            now = timezone.now()
+            fields = {"status": status}
+            if status != ApplicationStatus.APPLIED:
+                fields["decision_seen"] = False
+            JobApplication.objects.filter(pk__in=pks).update(**fields)
+            ApplicationStatusChange.objects.bulk_create([
+                ApplicationStatusChange(
+                    application_id=application.pk,
+                    job_advert_id=application.job_advert_id,
+                    from_status=application.status,
+                    to_status=status,
+                    changed_by=changed_by,
+                    time_in_stage=now - entered.get(application.pk, application.created_at),
+                )
+                for application in applications
+            ])
+            if status != ApplicationStatus.APPLIED:
+                per_advert = Counter(application.job_advert_id for application in applications)
+                for job_advert_id, amount in per_advert.items():
+                    DailyApplicationRollup.objects.increment(job_advert_id, status, amount=amount)
+            search.update_status(pks, status)
+
+            events = []
+            for application in applications:
+                previous_status, application.status = application.status, status
+                events.append((application.job_advert.created_by_id, application.webhook_payload(previous_status)))
+            WebhookDelivery.objects.enqueue_many(WebhookEvent.APPLICATION_STATUS_CHANGED, events)
+        return pks
+
+
 class JobApplication(BaseModel):
     name = models.CharField(max_length=50)
     email = models.EmailField()
@@ -77,5 +332,422 @@ class JobApplication(BaseModel):
     status = models.CharField(max_length=20, choices=ApplicationStatus.choices, 
                               default=ApplicationStatus.APPLIED)
     job_advert = models.ForeignKey(JobAdvert, related_name="applications", on_delete=models.CASCADE)
+    # Set for applications made while logged in, or linked later by email (see link_applications)
+    applicant = models.ForeignKey(User, related_name="job_applications", on_delete=models.SET_NULL,
+                                  null=True, blank=True)
     decision_seen = models.BooleanField(default=False)  # Track if applicant has seen the decision
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
+
+    objects = JobApplicationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at"], name="application_status_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                F("job_advert"), Lower("email"), name="unique_application_per_advert_email"
+            ),
+            models.UniqueConstraint(
+                fields=["job_advert", "idempotency_key"], name="unique_application_idempotency_key"
+            ),
+        ]
+
+    def attach_cv(self, upload) -> bool:
+        """
+        Write the uploaded CV to storage and point the already committed row at it.
+        Runs after the commit, so a storage failure is logged and the row is kept
+        with an empty cv (shown as missing) rather than failing the request.
+        """
+        try:
+            self.cv.save(upload.name, upload, save=False)
+        except Exception:
+            logger.exception("Could not store the CV for application %s", self.pk)
+            self.cv = ""
+            return False
+        JobApplication.objects.filter(pk=self.pk).update(cv=self.cv.name)
+        return True
+
+    def change_status(self, status, changed_by=None) -> "ApplicationStatusChange":
+        """
+        Move the application to a new status and append the transition to its
+        history in the same transaction.
+        """
+        with transaction.atomic():
+            # Lock the row so concurrent decisions record the right from_status
+            current = JobApplication.objects.select_for_update().only("status", "created_at").get(pk=self.pk)
+            entered_at = current.status_changes.values_list("created_at", flat=True).last() or current.created_at
+
+            self.status = status
+            # Mark as unseen when decision changes (except when changing to APPLIED)
+            if status != ApplicationStatus.APPLIED:
+                self.decision_seen = False
+            self.save(update_fields=["status", "decision_seen"])
+
+            change = ApplicationStatusChange.objects.create(
+                application=self,
+                job_advert_id=self.job_advert_id,
+                from_status=current.status,
+                to_status=status,
+                changed_by=changed_by,
+                time_in_stage=timezone.now() - entered_at,
+            )
+            # The APPLIED counter is applications received; moving back to it isn't one
+            if status != ApplicationStatus.APPLIED:
+                DailyApplicationRollup.objects.increment(self.job_advert_id, status)
+            WebhookDelivery.objects.enqueue(
+                self.job_advert.created_by_id, WebhookEvent.APPLICATION_STATUS_CHANGED,
+                self.webhook_payload(previous_status=current.status),
+            )
+            return change
+
+    def webhook_payload(self, previous_status=None) -> dict:
+        """Data sent to the advert owner's webhooks; reads the loaded job_advert"""
+        payload = {
+            "id": str(self.pk),
+            "job_advert": {"id": str(self.job_advert_id), "title": self.job_advert.title},
+            "name": self.name,
+            "email": self.email,
+            "portfolio_url": self.portfolio_url,
+            "status": self.status,
+            "applied_at": self.created_at.isoformat(),
+        }
+        if previous_status:
+            payload["previous_status"] = previous_status
+        return payload
 
+
+class ApplicationStatusChangeQuerySet(models.QuerySet):
+
+    def time_in_stage(self):
+        """
+        Per stage: how many applications left it and how long they spent in it
+        on average. One grouped query; narrow it first, e.g. .filter(job_advert=advert).
+        """
+        return self.values("from_status").annotate(
+            transitions=Count("id"),
+            average_time=Avg("time_in_stage"),
+        ).order_by("from_status")
+
+    def recruiter_throughput(self):
+        """Decisions per recruiter, split by outcome, in one grouped query"""
+        return self.filter(changed_by__isnull=False).values(
+            "changed_by", "changed_by__email"
+        ).annotate(
+            decisions=Count("id"),
+            interviews=Count("id", filter=Q(to_status=ApplicationStatus.INTERVIEW)),
+            rejections=Count("id", filter=Q(to_status=ApplicationStatus.REJECTED)),
+        ).order_by("-decisions")
+
+
+class ApplicationStatusChange(BaseModel):
+    """Append-only history of status transitions, written by JobApplication.change_status"""
+    application = models.ForeignKey(JobApplication, related_name="status_changes", on_delete=models.CASCADE)
+    # Denormalised from the application so per-advert timelines need no join
+    job_advert = models.ForeignKey(JobAdvert, related_name="status_changes", on_delete=models.CASCADE)
+    from_status = models.CharField(max_length=20, choices=ApplicationStatus.choices)
+    to_status = models.CharField(max_length=20, choices=ApplicationStatus.choices)
+    changed_by = models.ForeignKey(User, related_name="+", on_delete=models.SET_NULL, null=True, blank=True)
+    # How long the application sat in from_status before this transition
+    time_in_stage = models.DurationField()
+
+    objects = ApplicationStatusChangeQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("created_at",)
+        indexes = [
+            models.Index(fields=["application", "created_at"]),
+            models.Index(fields=["job_advert", "created_at"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Application status changes are append-only.")
+        super().save(*args, **kwargs)
+
+
+
+class DailyApplicationRollupQuerySet(models.QuerySet):
+
+    def increment(self, job_advert_id, status, day=None, amount=1) -> None:
+        """Add to the (advert, day, status) counter, creating the row on first use"""
+        day = day or timezone.localdate()
+        counter = self.filter(job_advert_id=job_advert_id, date=day, status=status)
+        if counter.update(count=F("count") + amount):
+            return
+        try:
+            with transaction.atomic():
+                self.create(job_advert_id=job_advert_id, date=day, status=status, count=amount)
+        except IntegrityError:
+            # Another request created the row first
+            counter.update(count=F("count") + amount)
+
+    def rebuild(self, start, end) -> int:
+        """
+        Recompute every counter dated start..end from the source tables,
+        replacing whatever was maintained incrementally. Returns rows written.
+        """
+        submitted = JobApplication.objects.annotate(
+            day=TruncDate("created_at")
+        ).filter(day__range=(start, end)).values("job_advert_id", "day").annotate(total=Count("id"))
+        decided = ApplicationStatusChange.objects.annotate(
+            day=TruncDate("created_at")
+        ).filter(day__range=(start, end)).exclude(to_status=ApplicationStatus.APPLIED).values("job_advert_id", "day", "to_status").annotate(total=Count("id"))
+
+        rows = [
+            DailyApplicationRollup(job_advert_id=row["job_advert_id"], date=row["day"],
+                                   status=ApplicationStatus.APPLIED, count=row["total"])
+            for row in submitted
+        ] + [
+            DailyApplicationRollup(job_advert_id=row["job_advert_id"], date=row["day"],
+                                   status=row["to_status"], count=row["total"])
+            for row in decided
+        ]
+        with transaction.atomic():
+            self.filter(date__range=(start, end)).delete()
+            self.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+
+class DailyApplicationRollup(models.Model):
+    """
+    Per advert and day: applications received (APPLIED) and transitions into
+    each decision status; moves back to APPLIED are not counted. Kept current by apply/decide, rebuilt nightly by
+    rebuild_application_rollups.
+    """
+    job_advert = models.ForeignKey(JobAdvert, related_name="daily_rollups", on_delete=models.CASCADE)
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=ApplicationStatus.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    objects = DailyApplicationRollupQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job_advert", "date", "status"], name="unique_daily_rollup"),
+        ]
+
+
+class ApplicationCVText(models.Model):
+    """
+    Text pulled once from an application's CV by extract_cv_text. Created
+    empty alongside every application; its id keys the applicant search index.
+    """
+    application = models.OneToOneField(JobApplication, related_name="cv_text", on_delete=models.CASCADE)
+    text = models.TextField(blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    # Null until the worker has processed the CV
+    extracted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+
+class SavedSearch(BaseModel):
+    """A job search whose new matches are emailed to the user by send_search_digests"""
+    user = models.ForeignKey(User, related_name="saved_searches", on_delete=models.CASCADE)
+    keyword = models.CharField(max_length=150, blank=True)
+    location = models.CharField(max_length=150, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        constraints = [
+            models.UniqueConstraint(fields=["user", "keyword", "location"], name="unique_saved_search"),
+        ]
+
+    def __str__(self):
+        return " in ".join(part for part in (self.keyword, self.location) if part) or "All jobs"
+
+    @staticmethod
+    def normalize(value) -> str:
+        return " ".join((value or "").split()).lower()
+
+    def get_absolute_url(self):
+        return f"{reverse('search')}?{urlencode({'keyword': self.keyword, 'location': self.location})}"
+
+
+class SearchDigestRun(models.Model):
+    """
+    One send_search_digests run. Each run covers adverts published after the
+    previous run's until, so no advert is announced twice. A run without
+    completed_at was interrupted and is resumed by the next one.
+    """
+    until = models.DateTimeField()
+    adverts = models.PositiveIntegerField(default=0)
+    emails_sent = models.PositiveIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+
+class SearchDigestDelivery(models.Model):
+    """A user's digest for a run, recorded just before it is handed to the mail backend"""
+    run = models.ForeignKey(SearchDigestRun, related_name="deliveries", on_delete=models.CASCADE)
+    user = models.ForeignKey(User, related_name="+", on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["run", "user"], name="unique_digest_per_run_user"),
+        ]
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+class InterviewSlotQuerySet(models.QuerySet):
+
+    def free(self):
+        return self.filter(application__isnull=True, starts_at__gt=timezone.now())
+
+    def lock_calendar(self, recruiter) -> None:
+        """
+        Lock the recruiter's row until the transaction ends, so slot checks
+        and inserts for one recruiter run one at a time. Call inside atomic().
+        """
+        list(User.objects.select_for_update().filter(pk=getattr(recruiter, "pk", recruiter)).values_list("pk"))
+
+    def conflict_for(self, recruiter, starts_at, ends_at):
+        """
+        The recruiter's slot overlapping [starts_at, ends_at), if any. A
+        recruiter's slots never overlap, so only the last one starting before
+        ends_at can: a single descent of the (recruiter, starts_at) index.
+        InterviewSlot.save and generate_day_slots keep that true by checking
+        under lock_calendar.
+        """
+        previous = self.filter(recruiter=recruiter, starts_at__lt=ends_at).order_by("-starts_at").first()
+        return previous if previous and previous.ends_at > starts_at else None
+
+
+class InterviewSlot(BaseModel):
+    """A time a recruiter offers for an advert's interviews, booked by at most one application"""
+    recruiter = models.ForeignKey(User, related_name="interview_slots", on_delete=models.CASCADE)
+    job_advert = models.ForeignKey(JobAdvert, related_name="interview_slots", on_delete=models.CASCADE)
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    application = models.OneToOneField(JobApplication, related_name="interview_slot", on_delete=models.SET_NULL,
+                                       null=True, blank=True)
+
+    objects = InterviewSlotQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("starts_at",)
+        indexes = [
+            models.Index(fields=["recruiter", "starts_at"]),
+            models.Index(fields=["job_advert", "starts_at"]),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=Q(ends_at__gt=F("starts_at")), name="interview_slot_ends_after_start"),
+        ]
+
+    def clean(self):
+        if self.starts_at and self.ends_at and self.recruiter_id:
+            if self.ends_at <= self.starts_at:
+                raise ValidationError("An interview slot must end after it starts.")
+            conflict = InterviewSlot.objects.exclude(pk=self.pk).conflict_for(
+                self.recruiter_id, self.starts_at, self.ends_at
+            )
+            if conflict:
+                raise ValidationError(
+                    f"Overlaps the recruiter's slot from {conflict.starts_at:%Y-%m-%d %H:%M} to {conflict.ends_at:%H:%M}."
+                )
+
+    def save(self, *args, **kwargs):
+        # bulk_create skips this; generate_day_slots takes the same lock and checks itself
+        with transaction.atomic():
+            InterviewSlot.objects.lock_calendar(self.recruiter_id)
+            self.clean()
+            super().save(*args, **kwargs)
+
+    def book(self, application: JobApplication) -> None:
+        """Give this slot to the application, releasing any slot it held before"""
+        if application.status != ApplicationStatus.INTERVIEW or application.job_advert_id != self.job_advert_id:
+            raise SlotUnavailable("Only applicants invited to interview for this job can book.")
+        with transaction.atomic():
+            InterviewSlot.objects.filter(application=application).exclude(pk=self.pk).update(application=None)
+            # Conditional update, so two applicants racing for the slot can't both get it
+            booked = InterviewSlot.objects.filter(
+                Q(application__isnull=True) | Q(application=application),
+                pk=self.pk, starts_at__gt=timezone.now(),
+            ).update(application=application)
+            if not booked:
+                raise SlotUnavailable("That slot has just been taken.")
+        self.application = application
+
+
+def generate_webhook_secret() -> str:
+    return get_random_string(40)
+
+
+class WebhookSubscription(BaseModel):
+    """An employer endpoint that receives their adverts' application events"""
+    user = models.ForeignKey(User, related_name="webhook_subscriptions", on_delete=models.CASCADE)
+    url = models.URLField(max_length=500)
+    # Signs every request; shown to the owner so their endpoint can verify it
+    secret = models.CharField(max_length=64, default=generate_webhook_secret, editable=False)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ("created_at",)
+        constraints = [
+            models.UniqueConstraint(fields=["user", "url"], name="unique_webhook_per_user_url"),
+        ]
+
+    def __str__(self):
+        return self.url
+
+
+class WebhookDeliveryQuerySet(models.QuerySet):
+
+    def enqueue(self, recruiter_id, event, payload) -> list:
+        return self.enqueue_many(event, [(recruiter_id, payload)])
+
+    def enqueue_many(self, event, events) -> list:
+        """
+        Queue (recruiter_id, payload) events for every active subscription of
+        their recruiter. Call inside the transaction that made the change, so
+        the outbox row commits or rolls back with it.
+        """
+        recruiter_ids = {recruiter_id for recruiter_id, _ in events if recruiter_id}
+        if not recruiter_ids:
+            return []
+        subscriptions = defaultdict(list)
+        for pk, user_id in WebhookSubscription.objects.filter(
+            user__in=recruiter_ids, is_active=True
+        ).values_list("pk", "user_id"):
+            subscriptions[user_id].append(pk)
+        return self.bulk_create([
+            WebhookDelivery(subscription_id=subscription_id, event=event, payload=payload)
+            for recruiter_id, payload in events
+            for subscription_id in subscriptions[recruiter_id]
+        ])
+
+    def due(self, now=None):
+        return self.filter(next_attempt_at__lte=now or timezone.now()).order_by("next_attempt_at", "pk")
+
+    def finished(self):
+        """Delivered or given up on"""
+        return self.filter(next_attempt_at__isnull=True)
+
+    def for_applications(self, pks):
+        """Events about these applications, matched on the payload's id"""
+        return self.filter(payload__id__in=[str(pk) for pk in pks])
+
+
+class WebhookDelivery(models.Model):
+    """
+    Outbox row for one event to one subscription, sent by send_webhooks.
+    next_attempt_at is cleared once the event is delivered or given up on.
+    """
+    subscription = models.ForeignKey(WebhookSubscription, related_name="deliveries", on_delete=models.CASCADE)
+    event = models.CharField(max_length=50, choices=WebhookEvent.choices)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True, default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.CharField(max_length=255, blank=True)
+
+    objects = WebhookDeliveryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "webhook deliveries"
+        indexes = [
+            models.Index(fields=["next_attempt_at"], condition=Q(next_attempt_at__isnull=False),
+                         name="webhook_delivery_due_idx"),
+        ]
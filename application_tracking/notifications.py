@@ -0,0 +1,178 @@
+import asyncio
+import functools
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMessage
+from django.template.loader import render_to_string
+from django.utils.module_loading import import_string
+
+from .alerts import send_batched
+from .context_processors import get_notification_counts
+from .enums import ApplicationStatus
+
+
+def user_channel(user_id) -> str:
+    return f"notifications:{user_id}"
+
+
+class InProcessSubscription:
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    async def get(self, timeout=None):
+        """Wait for the next message, returning None if nothing arrives within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def deliver(self, message):
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+        except RuntimeError:
+            # The subscriber's event loop has already shut down
+            self.broker.unsubscribe(self)
+
+    async def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Pub/sub that only reaches subscribers living in the same process.
+    Publishing is thread-safe so sync views can notify async listeners.
+    """
+
+    def __init__(self, **options):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    def has_subscribers(self, channel) -> bool:
+        with self._lock:
+            return bool(self._subscriptions.get(channel))
+
+    def subscribe(self, channel):
+        subscription = InProcessSubscription(self, channel)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.channel]
+
+
+class RedisSubscription:
+    def __init__(self, client, channel):
+        self.client = client
+        self.channel = channel
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._subscribed = False
+
+    async def get(self, timeout=None):
+        if not self._subscribed:
+            await self.pubsub.subscribe(self.channel)
+            self._subscribed = True
+        message = await self.pubsub.get_message(timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    async def close(self):
+        if self._subscribed:
+            await self.pubsub.unsubscribe(self.channel)
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+class RedisBroker:
+    """
+    Pub/sub over any Redis-protocol server, so events reach every worker process.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", **options):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroker requires the 'redis' package.") from exc
+        self._redis = redis
+        self._url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._client.publish(channel, json.dumps(message))
+
+    def has_subscribers(self, channel) -> bool:
+        # Counts subscribers in every process, unlike PUBSUB CHANNELS on a pattern
+        return any(count for _, count in self._client.pubsub_numsub(channel))
+
+    def subscribe(self, channel):
+        return RedisSubscription(self._redis.asyncio.Redis.from_url(self._url), channel)
+
+
+@functools.cache
+def get_broker():
+    config = settings.NOTIFICATIONS_BROKER
+    broker_class = import_string(config["BACKEND"])
+    return broker_class(**config.get("OPTIONS", {}))
+
+
+def publish_notification_counts(user) -> None:
+    """
+    Push the user's current notification counts to any open streams. The
+    counts are only queried when a stream is listening on the user's channel.
+    """
+    broker, channel = get_broker(), user_channel(user.pk)
+    if broker.has_subscribers(channel):
+        broker.publish(channel, get_notification_counts(user))
+
+
+def rejection_message(application) -> EmailMessage:
+    context = {
+        "applicant_name": application.name,
+        "job_title": application.job_advert.title,
+        "company_name": application.job_advert.company.name,
+    }
+    return EmailMessage(
+        subject=f"Application Outcome for {application.job_advert.title}",
+        body=render_to_string("emails/job_application_update.html", context),
+        from_email="noreply@example.com",
+        to=[application.email],
+    )
+
+
+def notify_decisions(applications, status) -> None:
+    """
+    What follows moving applications to status, from decide or the admin:
+    refresh the badges of their recruiters and applicants and email rejected
+    applicants. Needs job_advert__company, job_advert__created_by and
+    applicant loaded.
+    """
+    users = {}
+    for application in applications:
+        for user in (application.job_advert.created_by, application.applicant):
+            if user is not None:
+                users[user.pk] = user
+    for user in users.values():
+        publish_notification_counts(user)
+
+    if status == ApplicationStatus.REJECTED:
+        send_batched([rejection_message(application) for application in applications])
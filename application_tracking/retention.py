@@ -0,0 +1,183 @@
+"""
+Bulk deletion and data-retention policies, run by purge_data.
+
+Deletes walk the selection in primary-key batches, one short transaction
+each, so SQLite's write lock is never held for long. Within a batch the
+dependent rows are removed with single DELETE statements instead of
+Django's collector, which would load every row to send signals nobody
+needs; the one signal that matters (the applicant search index) is
+replayed by hand. CV files go after the batch commits.
+"""
+import calendar
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import AuthToken, StudentProfile, User
+from common.utils import chunked_pks
+
+from . import search
+from .listings import invalidate_listings
+from .models import (AdvertTerm, ApplicationCVText, ApplicationStatusChange, DailyApplicationRollup,
+                     InterviewSlot, JobAdvert, JobApplication, SavedSearch, SimilarAdvert, WebhookDelivery)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def fast_delete(queryset) -> int:
+    """
+    One DELETE ... WHERE, no signals or cascades: dependents must already be gone.
+
+    This is the only call to the private QuerySet._raw_delete, the statement
+    Django's deletion collector itself issues on its fast path. The public
+    .delete() would run the collector, which loads every row of a model that
+    has delete signal receivers or SET_NULL relations. test_retention's
+    test_fast_delete_is_one_statement pins the behaviour, so a Django upgrade
+    that renames or changes it fails that test.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def add_count(report: Counter, label: str, count: int) -> None:
+    """Optional categories only appear in a report when something was deleted"""
+    if count:
+        report[label] += count
+
+
+def delete_unreferenced_files(names) -> int:
+    """Remove CV files no application or student profile uses anymore; returns files removed"""
+    names = set(names)
+    names -= set(JobApplication.objects.filter(cv__in=names).values_list("cv", flat=True))
+    names -= set(StudentProfile.objects.filter(resume__in=names).values_list("resume", flat=True))
+    storage = JobApplication._meta.get_field("cv").storage
+    for name in names:
+        storage.delete(name)
+    return len(names)
+
+
+def delete_applications(queryset, batch_size=DEFAULT_BATCH_SIZE, dry_run=False) -> Counter:
+    """Delete the applications with their history, search entries and CV files"""
+    report = Counter()
+    if dry_run:
+        report["applications"] = queryset.count()
+        report["status changes"] = ApplicationStatusChange.objects.filter(application__in=queryset).count()
+        add_count(report, "webhook events", WebhookDelivery.objects.for_applications(
+            queryset.values_list("pk", flat=True)
+        ).count())
+        return report
+
+    for pks in chunked_pks(queryset, batch_size):
+        with transaction.atomic():
+            names = set(JobApplication.objects.filter(pk__in=pks).exclude(cv="").values_list("cv", flat=True))
+            InterviewSlot.objects.filter(application__in=pks).update(application=None)
+            report["status changes"] += fast_delete(ApplicationStatusChange.objects.filter(application__in=pks))
+            search.remove_applications(pks)
+            fast_delete(ApplicationCVText.objects.filter(application__in=pks))
+            # Outbox payloads carry the applicant's name and email
+            add_count(report, "webhook events", fast_delete(WebhookDelivery.objects.for_applications(pks)))
+            report["applications"] += fast_delete(JobApplication.objects.filter(pk__in=pks))
+            # Runs once the outermost transaction commits, straight after this block unless nested
+            transaction.on_commit(lambda names=names: report.update({"cv files": delete_unreferenced_files(names)}))
+    return report
+
+
+def delete_adverts(queryset, batch_size=DEFAULT_BATCH_SIZE, dry_run=False) -> Counter:
+    """Delete the adverts, their applications (as delete_applications) and schedules"""
+    report = Counter()
+    if dry_run:
+        report.update(delete_applications(JobApplication.objects.filter(job_advert__in=queryset), dry_run=True))
+        report["adverts"] = queryset.count()
+        return report
+
+    for pks in chunked_pks(queryset, batch_size):
+        report.update(delete_applications(JobApplication.objects.filter(job_advert__in=pks), batch_size))
+        with transaction.atomic():
+            fast_delete(InterviewSlot.objects.filter(job_advert__in=pks))
+            fast_delete(DailyApplicationRollup.objects.filter(job_advert__in=pks))
+            fast_delete(ApplicationStatusChange.objects.filter(job_advert__in=pks))
+            fast_delete(SimilarAdvert.objects.filter(Q(advert__in=pks) | Q(similar__in=pks)))
+            fast_delete(AdvertTerm.objects.filter(advert__in=pks))
+            report["adverts"] += fast_delete(JobAdvert.objects.filter(pk__in=pks))
+    if report["adverts"]:
+        # The raw deletes skipped the signal that normally does this
+        invalidate_listings()
+    return report
+
+
+# -------------------- Policies -------------------- #
+def months_before(day, months: int):
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    return day.replace(year=year, month=month + 1, day=min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def closed_advert_applications(months: int, today=None):
+    """Applications to adverts whose deadline or unpublish date is more than months ago"""
+    cutoff = months_before(today or timezone.localdate(), months)
+    return JobApplication.objects.filter(
+        Q(job_advert__deadline__lt=cutoff)
+        | Q(job_advert__is_published=False, job_advert__unpublish_at__date__lt=cutoff)
+    )
+
+
+def finished_webhook_deliveries(days: int, now=None):
+    """Outbox rows delivered or given up on more than days ago"""
+    return WebhookDelivery.objects.finished().filter(created_at__lt=(now or timezone.now()) - timedelta(days=days))
+
+
+def delete_in_batches(queryset, batch_size=DEFAULT_BATCH_SIZE, dry_run=False) -> int:
+    """fast_delete the rows of a model nothing references, one batch per transaction"""
+    if dry_run:
+        return queryset.count()
+    deleted = 0
+    for pks in chunked_pks(queryset, batch_size):
+        with transaction.atomic():
+            deleted += fast_delete(queryset.model.objects.filter(pk__in=pks))
+    return deleted
+
+
+def purge_email(email: str, batch_size=DEFAULT_BATCH_SIZE, dry_run=False) -> Counter:
+    """
+    Erase an applicant: their applications, profile and resume, saved
+    searches, pending tokens and account. Accounts that still own adverts
+    are kept (deleting them would take other people's applications along);
+    only their personal data goes.
+    """
+    email = email.strip().lower()
+    report = delete_applications(
+        JobApplication.objects.filter(Q(email__iexact=email) | Q(applicant__email__iexact=email)),
+        batch_size, dry_run,
+    )
+    # Events about applications already deleted, e.g. by an earlier purge
+    add_count(report, "webhook events", delete_in_batches(
+        WebhookDelivery.objects.filter(payload__email__iexact=email), batch_size, dry_run
+    ))
+    user = User.objects.filter(email__iexact=email).first()
+    tokens = AuthToken.objects.filter(subject=email)
+    if user is None:
+        report["tokens"] += tokens.count() if dry_run else tokens.delete()[0]
+        return report
+
+    profile = StudentProfile.objects.filter(user=user)
+    resumes = set(profile.exclude(resume="").values_list("resume", flat=True))
+    owns_adverts = JobAdvert.objects.filter(created_by=user).exists()
+    if dry_run:
+        report["profiles"] = profile.count()
+        report["saved searches"] = SavedSearch.objects.filter(user=user).count()
+        report["tokens"] = tokens.count()
+        report["accounts kept" if owns_adverts else "accounts"] = 1
+        return report
+
+    with transaction.atomic():
+        report["profiles"] = profile.delete()[0]
+        report["saved searches"] = SavedSearch.objects.filter(user=user).delete()[0]
+        report["tokens"] = tokens.delete()[0]
+        if owns_adverts:
+            report["accounts kept"] = 1
+        else:
+            user.delete()
+            report["accounts"] = 1
+        transaction.on_commit(lambda: report.update({"cv files": delete_unreferenced_files(resumes)}))
+    return report
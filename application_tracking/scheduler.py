@@ -0,0 +1,86 @@
+import heapq
+import time
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .listings import invalidate_listings
+from .models import JobAdvert
+from .similarity import refresh_similar_adverts
+
+PUBLISH = "publish"
+UNPUBLISH = "unpublish"
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class AdvertScheduler:
+    """
+    Applies scheduled publish/unpublish transitions. Events due within the
+    refresh window are loaded into a heap ordered by due time, and the
+    scheduler sleeps until the earliest one (or the next refresh, which
+    picks up adverts created or rescheduled meanwhile). Each pass also
+    refreshes "Similar jobs" for adverts marked similarity_stale.
+    """
+
+    def __init__(self, refresh=timedelta(minutes=1), batch_size=500, sleep=time.sleep):
+        self.refresh = refresh
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.heap = []
+
+    def load(self, until) -> None:
+        """Fill the heap with every transition due by until"""
+        self.heap = [
+            (publish_at, PUBLISH, pk)
+            for pk, publish_at in JobAdvert.objects.due_to_publish(until).values_list("pk", "publish_at")
+        ]
+        for advert in JobAdvert.objects.due_to_unpublish(until).only("deadline", "unpublish_at"):
+            self.heap.append((advert.closes_at, UNPUBLISH, advert.pk))
+        heapq.heapify(self.heap)
+
+    def run_due(self, now=None) -> int:
+        """Pop and apply every event due by now; returns the number of adverts changed"""
+        now = now or timezone.now()
+        due = {PUBLISH: [], UNPUBLISH: []}
+        while self.heap and self.heap[0][0] <= now:
+            _, action, pk = heapq.heappop(self.heap)
+            due[action].append(pk)
+
+        changed = 0
+        # The filters re-check each advert, so events made stale by an edit are no-ops
+        for batch in _batches(due[PUBLISH], self.batch_size):
+            changed += JobAdvert.objects.due_to_publish(now).filter(pk__in=batch).exclude(
+                Q(unpublish_at__lte=now) | Q(deadline__lt=timezone.localdate(now))
+            ).update(is_published=True, publish_at=None, published_at=now, updated_at=now, similarity_stale=True)
+        for batch in _batches(due[UNPUBLISH], self.batch_size):
+            changed += JobAdvert.objects.due_to_unpublish(now).filter(pk__in=batch).update(
+                is_published=False, updated_at=now, similarity_stale=True
+            )
+        if changed:
+            invalidate_listings()
+        refresh_similar_adverts()
+        return changed
+
+    def run_once(self) -> int:
+        now = timezone.now()
+        self.load(now)
+        return self.run_due(now)
+
+    def run_forever(self, on_change=None) -> None:
+        while True:
+            refresh_at = timezone.now() + self.refresh
+            self.load(refresh_at)
+            while True:
+                changed = self.run_due()
+                if changed and on_change:
+                    on_change(changed)
+                now = timezone.now()
+                if now >= refresh_at:
+                    break
+                wake_at = min(self.heap[0][0], refresh_at) if self.heap else refresh_at
+                self.sleep(max((wake_at - now).total_seconds(), 0))
@@ -0,0 +1,166 @@
+"""
+Ranked search over an advert's applicants by name, email, status and CV text.
+
+On SQLite the documents live in an FTS5 table whose rowid is the
+ApplicationCVText id; signals keep it in step with the models and
+extract_cv_text fills in the CV text. Other databases fall back to
+substring matching.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, When
+
+SEARCH_TABLE = "application_search"
+
+# bm25 weights per column: job_advert_id (unindexed), name, email, status, cv_text
+RANK = f"bm25({SEARCH_TABLE}, 0.0, 10.0, 10.0, 2.0, 1.0)"
+
+MAX_RESULTS = 200
+
+
+def search_index_enabled(using="default") -> bool:
+    return connections[using].vendor == "sqlite"
+
+
+def _cv_text_table():
+    from .models import ApplicationCVText
+    return ApplicationCVText._meta.db_table
+
+
+def create_search_index(using="default") -> None:
+    """Create the FTS5 table if it is missing and fill it from the database"""
+    if not search_index_enabled(using):
+        return
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        # Already built, or migrated only partway and the documents table is missing
+        if SEARCH_TABLE in tables or _cv_text_table() not in tables:
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            "job_advert_id UNINDEXED, name, email, status, cv_text, "
+            "tokenize = 'porter unicode61')"
+        )
+    rebuild_search_index(using)
+
+
+def rebuild_search_index(using="default") -> None:
+    """Repopulate the whole index, e.g. after bulk writes that bypassed signals"""
+    if not search_index_enabled(using):
+        return
+    from .models import JobApplication
+    applications = JobApplication._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, job_advert_id, name, email, status, cv_text) "
+            f"SELECT d.id, a.job_advert_id, a.name, a.email, a.status, d.text "
+            f"FROM {_cv_text_table()} d JOIN {applications} a ON a.id = d.application_id"
+        )
+
+
+def index_document(document, using="default") -> None:
+    """Insert the row for a new ApplicationCVText, reading its loaded application"""
+    if not search_index_enabled(using):
+        return
+    application = document.application
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, job_advert_id, name, email, status, cv_text) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            [document.pk, application.job_advert_id.hex, application.name, application.email,
+             application.status, document.text],
+        )
+
+
+def update_document_text(document, using="default") -> None:
+    if not search_index_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"UPDATE {SEARCH_TABLE} SET cv_text = %s WHERE rowid = %s",
+                       [document.text, document.pk])
+
+
+def update_application_fields(application, using="default") -> None:
+    if not search_index_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SEARCH_TABLE} SET name = %s, email = %s, status = %s "
+            f"WHERE rowid = (SELECT id FROM {_cv_text_table()} WHERE application_id = %s)",
+            [application.name, application.email, application.status, application.pk.hex],
+        )
+
+
+def update_status(application_ids, status, using="default") -> None:
+    """Bulk form of update_application_fields for queryset updates that skip signals"""
+    if not search_index_enabled(using) or not application_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(application_ids))
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SEARCH_TABLE} SET status = %s WHERE rowid IN "
+            f"(SELECT id FROM {_cv_text_table()} WHERE application_id IN ({placeholders}))",
+            [status, *(application_id.hex for application_id in application_ids)],
+        )
+
+
+def remove_document(document, using="default") -> None:
+    if not search_index_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [document.pk])
+
+
+def remove_applications(application_ids, using="default") -> None:
+    """Drop the index rows of applications about to be deleted without signals"""
+    if not search_index_enabled(using) or not application_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(application_ids))
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+            f"(SELECT id FROM {_cv_text_table()} WHERE application_id IN ({placeholders}))",
+            [application_id.hex for application_id in application_ids],
+        )
+
+
+def _terms(query: str) -> list:
+    return re.findall(r"\w+", query.lower())
+
+
+def search_applications(applications, advert, query: str):
+    """
+    Narrow an advert's applications to those matching every term in query,
+    best matches first. Terms match as prefixes, so "pyth" finds "Python".
+    """
+    terms = _terms(query)
+    if not terms:
+        return applications
+    using = applications.db
+    if not search_index_enabled(using):
+        for term in terms:
+            applications = applications.filter(
+                Q(name__icontains=term) | Q(email__icontains=term)
+                | Q(status__iexact=term) | Q(cv_text__text__icontains=term)
+            )
+        return applications
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"SELECT d.application_id FROM {SEARCH_TABLE} s "
+            f"JOIN {_cv_text_table()} d ON d.id = s.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND s.job_advert_id = %s "
+            f"ORDER BY {RANK} LIMIT %s",
+            [match, advert.pk.hex, MAX_RESULTS],
+        )
+        ranked = [row[0] for row in cursor.fetchall()]
+    if not ranked:
+        return applications.none()
+    return applications.filter(pk__in=ranked).order_by(
+        Case(*(When(pk=pk, then=position) for position, pk in enumerate(ranked)),
+             output_field=IntegerField())
+    )
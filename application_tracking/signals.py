@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .listings import invalidate_listings
+from .models import ApplicationCVText, JobAdvert, JobApplication
+
+
+@receiver(post_save, sender=JobAdvert)
+@receiver(post_delete, sender=JobAdvert)
+def invalidate_advert_listings(sender, **kwargs):
+    invalidate_listings()
+
+
+@receiver(post_save, sender=JobApplication)
+def track_cv_text(sender, instance: JobApplication, created, using, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        ApplicationCVText.objects.using(using).create(application=instance)
+    else:
+        search.update_application_fields(instance, using)
+
+
+@receiver(post_save, sender=ApplicationCVText)
+def index_cv_text(sender, instance: ApplicationCVText, created, using, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        search.index_document(instance, using)
+    else:
+        search.update_document_text(instance, using)
+
+
+@receiver(post_delete, sender=ApplicationCVText)
+def unindex_cv_text(sender, instance: ApplicationCVText, using, **kwargs):
+    search.remove_document(instance, using)
+
+
+def create_search_index(sender, using, **kwargs):
+    search.create_search_index(using)
@@ -0,0 +1,180 @@
+"""
+"Similar jobs" for the advert page.
+
+Adverts are TF-IDF vectors over their title, skills and description
+(title words count three times, skills twice) and compared by cosine
+similarity through an inverted index, so an advert is only scored against
+adverts sharing at least one term. Each published advert's top
+SIMILAR_ADVERTS_COUNT neighbours are stored in SimilarAdvert, which the
+advert page reads with one indexed query.
+
+The inverted index itself is stored in AdvertTerm. Saving an advert whose
+text or publication changed only marks it similarity_stale; the advert
+scheduler then refreshes it (refresh_similar_adverts), weighting its terms
+by document frequencies counted from AdvertTerm and scoring it against the
+postings of those terms alone. Stored weights drift as adverts come and
+go, so rebuild_similar_adverts recomputes everything and is meant to run
+nightly.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .alerts import TERM
+from .models import AdvertTerm, JobAdvert, SimilarAdvert
+
+FIELD_WEIGHTS = (("title", 3), ("skills", 2), ("description", 1))
+
+STOP_WORDS = {
+    "and", "are", "for", "from", "our", "the", "this", "that", "will", "with", "you", "your",
+}
+
+# Pairs sharing only incidental words are not shown as similar
+MIN_SCORE = 0.05
+
+# Longer "words" are pasted URLs or hashes, never shared vocabulary
+MAX_TERM_LENGTH = AdvertTerm._meta.get_field("term").max_length
+
+
+def term_counts(advert) -> Counter:
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for term in TERM.findall((getattr(advert, field) or "").lower()):
+            if 2 < len(term) <= MAX_TERM_LENGTH and term not in STOP_WORDS:
+                counts[term] += weight
+    return counts
+
+
+def idf(document_frequency, total) -> float:
+    return math.log((1 + total) / (1 + document_frequency)) + 1
+
+
+def unit_vector(counts, idfs) -> dict:
+    weights = {term: (1 + math.log(count)) * idfs[term] for term, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1
+    return {term: weight / norm for term, weight in weights.items()}
+
+
+class Corpus:
+    """Unit-length TF-IDF vectors for a set of adverts plus their inverted index"""
+
+    def __init__(self, adverts):
+        counts = {advert.pk: term_counts(advert) for advert in adverts}
+        document_frequency = Counter(term for advert_counts in counts.values() for term in advert_counts)
+        self.idf = {term: idf(frequency, len(counts)) for term, frequency in document_frequency.items()}
+        self.vectors = {pk: unit_vector(advert_counts, self.idf) for pk, advert_counts in counts.items()}
+        self.postings = defaultdict(list)
+        for pk, vector in self.vectors.items():
+            for term, weight in vector.items():
+                self.postings[term].append((pk, weight))
+
+    def scores(self, pk) -> Counter:
+        """Cosine similarity of pk to every advert it shares a term with"""
+        scores = Counter()
+        for term, weight in self.vectors[pk].items():
+            for other, other_weight in self.postings[term]:
+                if other != pk:
+                    scores[other] += weight * other_weight
+        return scores
+
+    def neighbours(self, pk, k) -> list:
+        """[(score, advert pk)] of the k most similar adverts, best first"""
+        return top(self.scores(pk).items(), k)
+
+
+def top(scored, k) -> list:
+    return heapq.nlargest(k, ((score, pk) for pk, score in scored if score >= MIN_SCORE))
+
+
+def _corpus() -> Corpus:
+    return Corpus(JobAdvert.objects.active().only(*(field for field, _ in FIELD_WEIGHTS)))
+
+
+def _links(pk, neighbours) -> list:
+    return [SimilarAdvert(advert_id=pk, similar_id=other, score=score) for score, other in neighbours]
+
+
+def _terms(pk, vector) -> list:
+    return [AdvertTerm(advert_id=pk, term=term, weight=weight) for term, weight in vector.items()]
+
+
+def rebuild_similar_adverts(k=None) -> int:
+    """Recompute the term index and every published advert's neighbours; returns links written"""
+    k = k or settings.SIMILAR_ADVERTS_COUNT
+    # Everything queued so far is covered; edits saved during the rebuild queue again
+    JobAdvert.objects.filter(similarity_stale=True).update(similarity_stale=False)
+    corpus = _corpus()
+    rows = [row for pk in corpus.vectors for row in _links(pk, corpus.neighbours(pk, k))]
+    with transaction.atomic():
+        AdvertTerm.objects.all().delete()
+        AdvertTerm.objects.bulk_create(
+            [term for pk, vector in corpus.vectors.items() for term in _terms(pk, vector)], batch_size=500
+        )
+        SimilarAdvert.objects.all().delete()
+        SimilarAdvert.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def update_similar_adverts(advert, published=True, k=None) -> None:
+    """
+    Re-index advert and recompute its neighbours from the stored postings of
+    its terms, then merge it into the lists of adverts it now outranks a
+    neighbour of. Unpublished adverts just drop out; lists left short are
+    refilled by the next rebuild.
+    """
+    k = k or settings.SIMILAR_ADVERTS_COUNT
+    with transaction.atomic():
+        SimilarAdvert.objects.filter(Q(advert=advert) | Q(similar=advert)).delete()
+        AdvertTerm.objects.filter(advert=advert).delete()
+        counts = term_counts(advert)
+        if not published or not counts:
+            return
+
+        document_frequency = dict(
+            AdvertTerm.objects.filter(term__in=counts).values("term").annotate(adverts=Count("id"))
+            .values_list("term", "adverts")
+        )
+        total = JobAdvert.objects.active().count()
+        vector = unit_vector(counts, {term: idf(document_frequency.get(term, 0) + 1, total) for term in counts})
+        AdvertTerm.objects.bulk_create(_terms(advert.pk, vector), batch_size=500)
+
+        scores = Counter()
+        for other, term, weight in AdvertTerm.objects.filter(term__in=vector).exclude(advert=advert).values_list(
+            "advert", "term", "weight"
+        ):
+            scores[other] += vector[term] * weight
+
+        current = defaultdict(list)
+        for advert_id, similar_id, score in SimilarAdvert.objects.filter(
+            advert__in=[pk for pk, score in scores.items() if score >= MIN_SCORE]
+        ).values_list("advert", "similar", "score"):
+            current[advert_id].append((score, similar_id))
+
+        rows = _links(advert.pk, top(scores.items(), k))
+        changed = []
+        for other, score in scores.items():
+            if score < MIN_SCORE:
+                continue
+            neighbours = current[other]
+            if len(neighbours) < k or score > min(neighbours)[0]:
+                changed.append(other)
+                rows += _links(other, top([(pk, old) for old, pk in neighbours] + [(advert.pk, score)], k))
+        SimilarAdvert.objects.filter(advert__in=changed).delete()
+        SimilarAdvert.objects.bulk_create(rows, batch_size=500)
+
+
+def refresh_similar_adverts(batch_size=100) -> int:
+    """Update every advert marked similarity_stale; returns how many were refreshed"""
+    pks = list(JobAdvert.objects.filter(similarity_stale=True).values_list("pk", flat=True))
+    for start in range(0, len(pks), batch_size):
+        batch = pks[start:start + batch_size]
+        # Cleared before reading, so an edit saved meanwhile marks the advert again
+        JobAdvert.objects.filter(pk__in=batch).update(similarity_stale=False)
+        published = set(JobAdvert.objects.active().filter(pk__in=batch).values_list("pk", flat=True))
+        for advert in JobAdvert.objects.filter(pk__in=batch).only(*(field for field, _ in FIELD_WEIGHTS)):
+            update_similar_adverts(advert, published=advert.pk in published)
+    return len(pks)
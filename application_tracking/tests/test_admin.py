@@ -0,0 +1,122 @@
+import pytest
+from django.core import mail
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.urls import reverse
+
+from accounts.models import StudentProfile, User
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import JobAdvert, JobApplication
+from application_tracking.notifications import get_broker, user_channel
+from common.admin import EstimatedCountPaginator
+from common.utils import chunked_pks
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_client(client, user_instance):
+    user_instance.is_staff = user_instance.is_superuser = True
+    user_instance.save()
+    client.force_login(user_instance)
+    return client
+
+
+def make_application(advert, name, cv="cv.pdf"):
+    return JobApplication.objects.create(name=name, email=f"{name}@example.com", portfolio_url="https://example.com",
+                                         cv=cv, job_advert=advert)
+
+
+@pytest.mark.parametrize("url_name", [
+    "admin:application_tracking_jobadvert_changelist",
+    "admin:application_tracking_jobapplication_changelist",
+    "admin:accounts_user_changelist",
+])
+def test_changelists_render(admin_client, job_advert, url_name):
+    make_application(job_advert, "jane")
+
+    assert admin_client.get(reverse(url_name), {"q": "jane"}).status_code == 200
+    assert admin_client.get(reverse(url_name)).status_code == 200
+
+
+def test_users_added_in_admin_can_log_in(admin_client):
+    response = admin_client.post(reverse("admin:accounts_user_add"), {
+        "email": "recruiter@example.com", "usable_password": "true",
+        "password1": "a-long-Passphrase-42", "password2": "a-long-Passphrase-42",
+    })
+
+    user = User.objects.get(email="recruiter@example.com")
+    assert response.status_code == 302
+    assert user.check_password("a-long-Passphrase-42")
+    assert admin_client.get(reverse("admin:accounts_user_change", args=[user.pk])).status_code == 200
+    assert admin_client.get(reverse("admin:auth_user_password_change", args=[user.pk])).status_code == 200
+
+
+def test_unfiltered_count_uses_table_statistics(settings, job_advert):
+    settings.ADMIN_ESTIMATED_COUNT_THRESHOLD = 0
+    for name in ("jane", "john"):
+        make_application(job_advert, name)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    make_application(job_advert, "jill")
+
+    assert EstimatedCountPaginator(JobApplication.objects.order_by("pk"), 10).count == 2
+    assert EstimatedCountPaginator(JobApplication.objects.filter(name="jill").order_by("pk"), 10).count == 1
+
+
+def test_status_action_records_history_in_batches(admin_client, settings, job_advert):
+    settings.ADMIN_ACTION_CHUNK_SIZE = 2
+    applications = [make_application(job_advert, name) for name in ("jane", "john", "jill")]
+    assert len(list(chunked_pks(JobApplication.objects.all(), settings.ADMIN_ACTION_CHUNK_SIZE))) == 2
+
+    admin_client.post(reverse("admin:application_tracking_jobapplication_changelist"), {
+        "action": "mark_interview", "_selected_action": [application.pk for application in applications],
+    })
+
+    assert set(JobApplication.objects.values_list("status", flat=True)) == {ApplicationStatus.INTERVIEW}
+    assert job_advert.status_changes.count() == 3
+    assert job_advert.daily_rollups.get(status=ApplicationStatus.INTERVIEW).count == 3
+
+
+def test_unpublish_action(admin_client, job_advert):
+    JobAdvert.objects.update(similarity_stale=False)
+    admin_client.post(reverse("admin:application_tracking_jobadvert_changelist"), {
+        "action": "unpublish_adverts", "_selected_action": [job_advert.pk],
+    })
+
+    assert not JobAdvert.objects.active().exists()
+    # Queued so the scheduler drops it from other adverts' "Similar jobs"
+    assert JobAdvert.objects.get().similarity_stale
+
+
+def test_delete_keeps_cv_files_still_in_use(admin_client, media_root, user_instance, job_advert,
+                                           django_capture_on_commit_callbacks):
+    own = default_storage.save("own.pdf", ContentFile(b"cv"))
+    shared = default_storage.save("resumes/shared.pdf", ContentFile(b"cv"))
+    StudentProfile.objects.create(user=user_instance, full_name="Jane", skills="Python", resume=shared)
+    applications = [make_application(job_advert, "jane", own), make_application(job_advert, "john", shared)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.post(reverse("admin:application_tracking_jobapplication_changelist"), {
+            "action": "delete_selected", "post": "yes",
+            "_selected_action": [application.pk for application in applications],
+        })
+
+    assert not JobApplication.objects.exists()
+    assert not default_storage.exists(own)
+    assert default_storage.exists(shared)
+
+
+def test_reject_action_emails_applicants_and_refreshes_badges(admin_client, job_advert, monkeypatch):
+    applications = [make_application(job_advert, name) for name in ("jane", "john")]
+    published = []
+    monkeypatch.setattr(get_broker(), "has_subscribers", lambda channel: True)
+    monkeypatch.setattr(get_broker(), "publish", lambda channel, message: published.append(channel))
+
+    admin_client.post(reverse("admin:application_tracking_jobapplication_changelist"), {
+        "action": "mark_rejected", "_selected_action": [application.pk for application in applications],
+    })
+
+    assert sorted(message.to[0] for message in mail.outbox) == ["jane@example.com", "john@example.com"]
+    assert published == [user_channel(job_advert.created_by_id)]
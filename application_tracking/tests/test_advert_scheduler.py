@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from application_tracking.listings import listing_version
+from application_tracking.models import Company, JobAdvert
+from application_tracking.scheduler import AdvertScheduler
+
+pytestmark = pytest.mark.django_db
+
+
+def make_advert(user, **kwargs):
+    fields = dict(
+        title="Backend Developer", company=Company.objects.for_name("Acme"), employment_type="Full Time",
+        experience_level="Entry Level", description="Django services", job_type="Remote",
+        skills="Python", created_by=user, deadline=timezone.localdate() + timedelta(days=30),
+    )
+    fields.update(kwargs)
+    return JobAdvert.objects.create(**fields)
+
+
+def test_scheduled_advert_is_published_when_due(user_instance):
+    publish_at = timezone.now() + timedelta(hours=1)
+    advert = make_advert(user_instance, publish_at=publish_at)
+    assert not JobAdvert.objects.active().exists()
+
+    scheduler = AdvertScheduler()
+    scheduler.load(publish_at + timedelta(minutes=1))
+    version = listing_version()
+
+    assert scheduler.run_due(publish_at - timedelta(seconds=1)) == 0
+    assert scheduler.run_due(publish_at) == 1
+
+    advert.refresh_from_db()
+    assert advert.is_published and advert.publish_at is None
+    assert advert.published_at == publish_at
+    assert listing_version() != version
+
+
+def test_deadline_and_unpublish_at_take_adverts_down(user_instance):
+    expired = make_advert(user_instance, deadline=timezone.localdate() + timedelta(days=1))
+    withdrawn = make_advert(user_instance, unpublish_at=timezone.now() + timedelta(hours=2))
+    running = make_advert(user_instance)
+
+    scheduler = AdvertScheduler()
+    later = timezone.now() + timedelta(days=2)
+    scheduler.load(later)
+
+    assert scheduler.run_due(later) == 2
+    assert list(JobAdvert.objects.filter(is_published=True)) == [running]
+    for advert in (expired, withdrawn):
+        advert.refresh_from_db()
+        assert not advert.is_published
+
+
+def test_rescheduled_event_is_not_applied(user_instance):
+    advert = make_advert(user_instance, publish_at=timezone.now() + timedelta(hours=1))
+    scheduler = AdvertScheduler()
+    scheduler.load(timezone.now() + timedelta(hours=2))
+
+    advert.publish_at = timezone.now() + timedelta(days=1)
+    advert.save()
+
+    assert scheduler.run_due(timezone.now() + timedelta(hours=2)) == 0
+
+
+def test_run_once_command_and_listing_cache(client, user_instance):
+    make_advert(user_instance)
+    assert client.get(reverse("browse_jobs")).context["job_adverts"].paginator.count == 1
+
+    scheduled = make_advert(user_instance, publish_at=timezone.now() + timedelta(hours=1))
+    # Bypass signals so only the scheduler can invalidate the cached count
+    JobAdvert.objects.filter(pk=scheduled.pk).update(publish_at=timezone.now() - timedelta(minutes=1))
+    assert client.get(reverse("browse_jobs")).context["job_adverts"].paginator.count == 1
+
+    call_command("run_advert_scheduler", "--once")
+
+    assert client.get(reverse("browse_jobs")).context["job_adverts"].paginator.count == 2
@@ -0,0 +1,49 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+
+from application_tracking.models import JobApplication
+
+pytestmark = pytest.mark.django_db
+
+
+def make_application(job_advert, email, **kwargs):
+    return JobApplication.objects.create(
+        name="Jane", email=email, portfolio_url="https://example.com",
+        cv="cv.pdf", job_advert=job_advert, **kwargs
+    )
+
+
+def test_link_applications_matches_email_case_insensitively(job_advert, django_user_model):
+    user = django_user_model.objects.create(email="jane@example.com")
+    matching = make_application(job_advert, "JANE@example.com")
+    unmatched = make_application(job_advert, "someone@example.com")
+
+    call_command("link_applications", batch_size=1)
+
+    matching.refresh_from_db()
+    unmatched.refresh_from_db()
+    assert matching.applicant == user
+    assert unmatched.applicant is None
+
+
+def test_my_applications_lists_applications_linked_to_user(authenticate_user_client, job_advert):
+    client, user = authenticate_user_client
+    linked = make_application(job_advert, "other-address@example.com", applicant=user)
+    make_application(job_advert, "stranger@example.com")
+
+    response = client.get(reverse("my_applications"))
+
+    assert list(response.context["my_applications"]) == [linked]
+
+
+def test_anonymous_apply_is_linked_to_registered_email(client, job_advert, django_user_model, media_root):
+    user = django_user_model.objects.create(email="jane@example.com")
+
+    client.post(reverse("apply_for_job", kwargs={"advert_id": job_advert.id}), {
+        "name": "Jane", "email": "Jane@Example.com", "portfolio_url": "https://example.com",
+        "cv": SimpleUploadedFile("cv.pdf", b"%PDF-1.4 cv", content_type="application/pdf"),
+    })
+
+    assert JobApplication.objects.get().applicant == user
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.client import Client
+from django.urls import reverse
+
+from application_tracking.models import JobApplication
+
+# The CV is written from an on_commit hook, so these tests need real commits
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def application_data(**overrides):
+    data = {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "portfolio_url": "https://example.com",
+        "cv": SimpleUploadedFile("cv.pdf", b"%PDF-1.4 cv", content_type="application/pdf"),
+        "idempotency_key": "key-1",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_apply_stores_application_and_cv(
+    client: Client, job_advert, media_root
+):
+    url = reverse("apply_for_job", kwargs={"advert_id": job_advert.id})
+    response = client.post(url, application_data())
+    assert response.status_code == 302
+
+    application = JobApplication.objects.get()
+    assert application.idempotency_key == "key-1"
+    assert application.cv.name
+    assert (media_root / application.cv.name).exists()
+
+
+def test_apply_replay_with_same_idempotency_key(
+    client: Client, job_advert, media_root
+):
+    url = reverse("apply_for_job", kwargs={"advert_id": job_advert.id})
+    client.post(url, application_data())
+    response = client.post(url, application_data())
+
+    assert JobApplication.objects.count() == 1
+    assert len(list(media_root.iterdir())) == 1
+    messages = list(get_messages(response.wsgi_request))
+    assert messages[-1].level_tag == "success"
+
+
+def test_apply_duplicate_email_is_rejected_without_writing_cv(
+    client: Client, job_advert, media_root
+):
+    url = reverse("apply_for_job", kwargs={"advert_id": job_advert.id})
+    client.post(url, application_data())
+    response = client.post(
+        url, application_data(email="JANE@example.com", idempotency_key="key-2")
+    )
+
+    assert JobApplication.objects.count() == 1
+    assert len(list(media_root.iterdir())) == 1
+    messages = list(get_messages(response.wsgi_request))
+    assert messages[-1].level_tag == "error"
+
+
+def test_concurrent_submissions_create_one_application(job_advert, media_root, file_database):
+    url = reverse("apply_for_job", kwargs={"advert_id": job_advert.id})
+    submissions = 5
+    barrier = threading.Barrier(submissions)
+    errors = []
+
+    def submit(n):
+        try:
+            barrier.wait()
+            Client().post(url, application_data(idempotency_key=f"key-{n}"))
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(submissions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert JobApplication.objects.filter(job_advert=job_advert).count() == 1
+    assert len(list(media_root.iterdir())) == 1
+
+
+def test_apply_keeps_application_when_cv_cannot_be_stored(
+    client: Client, job_advert, media_root, monkeypatch
+):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("django.db.models.fields.files.FieldFile.save", fail)
+    url = reverse("apply_for_job", kwargs={"advert_id": job_advert.id})
+    response = client.post(url, application_data())
+
+    assert response.status_code == 302
+    application = JobApplication.objects.get()
+    assert not application.cv
+    messages = list(get_messages(response.wsgi_request))
+    assert messages[-1].level_tag == "warning"
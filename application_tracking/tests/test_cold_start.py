@@ -0,0 +1,15 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+def test_reports_phases_and_enforces_budget():
+    out = StringIO()
+    with pytest.raises(CommandError, match="over the 1ms budget"):
+        call_command("cold_start", "--path", "/auth/login/", "--runs", "1", "--top", "3", "--budget", "1", stdout=out)
+
+    report = out.getvalue()
+    assert "Launch to response" in report
+    assert "django" in report
+    assert "Slowest modules (self time):" in report
@@ -0,0 +1,46 @@
+import pytest
+from django.urls import reverse
+
+from application_tracking.models import Company, CompanyQuerySet, JobApplication, normalize_company_name
+
+pytestmark = pytest.mark.django_db
+
+
+def test_spellings_of_a_name_share_one_company():
+    assert normalize_company_name("  ACME,  Inc. ") == "acme"
+    assert normalize_company_name("Limited") == "limited"
+
+    acme = Company.objects.for_name("Acme Ltd")
+
+    assert Company.objects.for_name("acme  inc") == acme
+    assert acme.name == "Acme Ltd"
+    assert Company.objects.count() == 1
+
+
+def test_for_name_returns_company_created_concurrently(monkeypatch):
+    acme = Company.objects.create(name="Acme")
+    # As if another request inserted it between our lookup and our insert
+    monkeypatch.setattr(CompanyQuerySet, "first", lambda self: None)
+
+    assert Company.objects.for_name("ACME Ltd") == acme
+    assert Company.objects.count() == 1
+
+
+def test_company_page_lists_open_roles_and_stats(client, job_advert):
+    JobApplication.objects.create(name="Jane", email="jane@example.com", portfolio_url="https://example.com",
+                                  cv="cv.pdf", job_advert=job_advert)
+
+    response = client.get(job_advert.company.get_absolute_url())
+
+    assert list(response.context["job_adverts"]) == [job_advert]
+    assert response.context["stats"] == {"open_roles": 1, "applicants": 1}
+
+
+def test_search_filters_by_company(client, job_advert):
+    other = Company.objects.for_name("Globex")
+
+    response = client.get(reverse("search"), {"company": job_advert.company_id})
+    assert list(response.context["job_adverts"]) == [job_advert]
+
+    response = client.get(reverse("search"), {"company": other.id})
+    assert list(response.context["job_adverts"]) == []
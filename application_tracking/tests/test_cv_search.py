@@ -0,0 +1,89 @@
+import io
+import zipfile
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import ApplicationCVText, JobApplication
+from application_tracking.search import SEARCH_TABLE
+
+pytestmark = pytest.mark.django_db
+
+
+def docx_bytes(*paragraphs) -> bytes:
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>",
+        )
+    return buffer.getvalue()
+
+
+def make_application(job_advert, name, email, *paragraphs):
+    application = JobApplication.objects.create(
+        name=name, email=email, portfolio_url="https://example.com", job_advert=job_advert,
+    )
+    application.cv.save(f"{name}.docx", ContentFile(docx_bytes(*paragraphs)))
+    return application
+
+
+def search(client, job_advert, query):
+    url = reverse("advert_applications", kwargs={"advert_id": job_advert.id})
+    response = client.get(url, {"q": query})
+    assert response.status_code == 200
+    return [application.name for application in response.context["applications"]]
+
+
+def test_search_matches_extracted_cv_text(authenticate_user_client, job_advert, media_root):
+    client, _ = authenticate_user_client
+    make_application(job_advert, "Jane", "jane@example.com", "Skills", "Kubernetes and Terraform")
+    make_application(job_advert, "John", "john@example.com", "Skills", "Photoshop")
+
+    assert search(client, job_advert, "kubernetes") == []
+
+    call_command("extract_cv_text")
+
+    assert search(client, job_advert, "kuber") == ["Jane"]
+    assert search(client, job_advert, "john") == ["John"]
+    assert ApplicationCVText.objects.filter(extracted_at__isnull=True).count() == 0
+
+
+def test_search_ranks_name_matches_first_and_follows_status(authenticate_user_client, job_advert, media_root):
+    client, user = authenticate_user_client
+    make_application(job_advert, "Jane", "jane@example.com", "Worked with Django")
+    django_fan = make_application(job_advert, "Django", "dj@example.com", "Ruby only")
+    call_command("extract_cv_text")
+
+    assert search(client, job_advert, "django") == ["Django", "Jane"]
+
+    django_fan.change_status(ApplicationStatus.INTERVIEW, changed_by=user)
+    assert search(client, job_advert, "interview") == ["Django"]
+
+
+def test_unreadable_cv_is_recorded_not_retried(job_advert, media_root):
+    application = JobApplication.objects.create(
+        name="Jane", email="jane@example.com", portfolio_url="https://example.com", job_advert=job_advert,
+    )
+    application.cv.save("cv.doc", ContentFile(b"legacy word file"))
+
+    call_command("extract_cv_text")
+
+    document = ApplicationCVText.objects.get(application=application)
+    assert document.extracted_at is not None
+    assert "Unsupported" in document.error
+
+
+def test_deleting_application_removes_search_row(job_advert, media_root):
+    application = make_application(job_advert, "Jane", "jane@example.com", "Python")
+    application.delete()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        assert cursor.fetchone()[0] == 0
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import DailyApplicationRollup, JobApplication
+from application_tracking.views import DASHBOARD_MAX_DAYS
+
+pytestmark = pytest.mark.django_db
+
+
+def rollup_counts(advert):
+    return dict(
+        DailyApplicationRollup.objects.filter(job_advert=advert).values_list("status", "count")
+    )
+
+
+def test_decide_and_rebuild_keep_rollups_in_sync(user_instance, job_advert):
+    application = JobApplication.objects.create(
+        name="Jane", email="jane@example.com", portfolio_url="https://example.com",
+        cv="cv.pdf", job_advert=job_advert,
+    )
+    DailyApplicationRollup.objects.increment(job_advert.id, ApplicationStatus.APPLIED)
+    application.change_status(ApplicationStatus.INTERVIEW, changed_by=user_instance)
+    incremental = rollup_counts(job_advert)
+
+    DailyApplicationRollup.objects.all().delete()
+    call_command("rebuild_application_rollups")
+
+    assert incremental == {ApplicationStatus.APPLIED: 1, ApplicationStatus.INTERVIEW: 1}
+    assert rollup_counts(job_advert) == incremental
+
+
+@pytest.mark.parametrize("days", [7, 400])
+def test_dashboard_query_count_does_not_depend_on_range(
+    authenticate_user_client, job_advert, django_assert_max_num_queries, days
+):
+    client, _ = authenticate_user_client
+    today = timezone.localdate()
+    DailyApplicationRollup.objects.bulk_create([
+        DailyApplicationRollup(job_advert=job_advert, date=today - timedelta(days=offset),
+                               status=ApplicationStatus.APPLIED, count=2)
+        for offset in range(days)
+    ])
+    url = reverse("advert_dashboard", kwargs={"advert_id": job_advert.id})
+    client.get(url)  # warm session and user caches
+
+    with django_assert_max_num_queries(5):
+        response = client.get(url, {"start": today - timedelta(days=days - 1), "end": today})
+
+    assert response.status_code == 200
+    assert response.context["total_applied"] == days * 2
+
+
+def test_dashboard_only_for_advert_owner(client, job_advert, django_user_model):
+    other = django_user_model.objects.create(email="other@example.com")
+    client.force_login(other)
+    response = client.get(reverse("advert_dashboard", kwargs={"advert_id": job_advert.id}))
+    assert response.status_code == 403
+
+
+def test_moving_back_to_applied_is_not_counted_as_received(user_instance, job_advert):
+    application = JobApplication.objects.create(
+        name="Jane", email="jane@example.com", portfolio_url="https://example.com",
+        cv="cv.pdf", job_advert=job_advert,
+    )
+    DailyApplicationRollup.objects.increment(job_advert.id, ApplicationStatus.APPLIED)
+    application.change_status(ApplicationStatus.INTERVIEW, changed_by=user_instance)
+    application.change_status(ApplicationStatus.APPLIED, changed_by=user_instance)
+    incremental = rollup_counts(job_advert)
+
+    call_command("rebuild_application_rollups")
+
+    assert incremental == {ApplicationStatus.APPLIED: 1, ApplicationStatus.INTERVIEW: 1}
+    assert rollup_counts(job_advert) == incremental
+
+
+def test_dashboard_range_is_capped(authenticate_user_client, job_advert):
+    client, _ = authenticate_user_client
+    response = client.get(
+        reverse("advert_dashboard", kwargs={"advert_id": job_advert.id}),
+        {"start": "1900-01-01", "end": "2026-01-01"},
+    )
+
+    assert response.status_code == 200
+    assert (response.context["end"] - response.context["start"]).days == DASHBOARD_MAX_DAYS - 1
@@ -0,0 +1,95 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils import timezone
+
+from application_tracking.enums import ApplicationStatus
+from application_tracking.interviews import SlotIndex, generate_day_slots
+from application_tracking.models import InterviewSlot, JobApplication, SlotUnavailable
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def interview_day():
+    return timezone.localdate() + timedelta(days=3)
+
+
+def at(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+def test_slot_index_detects_overlaps_only():
+    index = SlotIndex([(10, 11), (13, 14)])
+
+    assert index.conflicts(10.5, 12)
+    assert index.conflicts(12, 13.5)
+    assert index.conflicts(9, 15)
+    assert not index.conflicts(11, 13)
+    assert index.add(11, 12) and not index.add(11.5, 12.5)
+    assert index.starts == [10, 11, 13]
+
+
+def test_generate_day_slots_skips_clashes(user_instance, job_advert, interview_day):
+    InterviewSlot.objects.create(recruiter=user_instance, job_advert=job_advert,
+                                 starts_at=at(interview_day, 10, 15), ends_at=at(interview_day, 10, 45))
+
+    slots, skipped = generate_day_slots(user_instance, job_advert, interview_day, time(9), time(12), 30, 0)
+
+    assert [timezone.localtime(slot.starts_at).time() for slot in slots] == [
+        time(9), time(9, 30), time(11), time(11, 30)
+    ]
+    assert skipped == 2
+
+
+def test_model_validation_uses_recruiter_calendar(user_instance, job_advert, interview_day):
+    InterviewSlot.objects.create(recruiter=user_instance, job_advert=job_advert,
+                                 starts_at=at(interview_day, 10), ends_at=at(interview_day, 11))
+
+    with pytest.raises(ValidationError):
+        InterviewSlot(recruiter=user_instance, job_advert=job_advert,
+                      starts_at=at(interview_day, 10, 30), ends_at=at(interview_day, 11, 30)).full_clean()
+    InterviewSlot(recruiter=user_instance, job_advert=job_advert,
+                  starts_at=at(interview_day, 11), ends_at=at(interview_day, 12)).full_clean()
+
+
+def test_applicant_books_and_moves_interview(authenticate_user_client, job_advert, interview_day):
+    client, user = authenticate_user_client
+    application = JobApplication.objects.create(
+        name="Jane", email=user.email, portfolio_url="https://example.com", cv="cv.pdf",
+        job_advert=job_advert, applicant=user, status=ApplicationStatus.INTERVIEW,
+    )
+    first, second = generate_day_slots(user, job_advert, interview_day, time(9), time(10), 30)[0]
+    url = reverse("book_interview", kwargs={"job_application_id": application.id})
+
+    client.post(url, {"slot": first.id})
+    client.post(url, {"slot": second.id})
+
+    assert InterviewSlot.objects.get(application=application) == second
+    assert InterviewSlot.objects.free().count() == 1
+
+
+def test_booked_slot_cannot_be_taken(user_instance, job_advert, interview_day):
+    slot = InterviewSlot.objects.create(recruiter=user_instance, job_advert=job_advert,
+                                        starts_at=at(interview_day, 9), ends_at=at(interview_day, 10))
+    first, second = (
+        JobApplication.objects.create(name=name, email=f"{name}@example.com", portfolio_url="https://example.com",
+                                      cv="cv.pdf", job_advert=job_advert, status=ApplicationStatus.INTERVIEW)
+        for name in ("jane", "john")
+    )
+    slot.book(first)
+
+    with pytest.raises(SlotUnavailable):
+        InterviewSlot.objects.get(pk=slot.pk).book(second)
+
+
+def test_create_rejects_overlapping_slot(user_instance, job_advert, interview_day):
+    InterviewSlot.objects.create(recruiter=user_instance, job_advert=job_advert,
+                                 starts_at=at(interview_day, 10), ends_at=at(interview_day, 11))
+
+    with pytest.raises(ValidationError):
+        InterviewSlot.objects.create(recruiter=user_instance, job_advert=job_advert,
+                                     starts_at=at(interview_day, 9), ends_at=at(interview_day, 12))
+    assert InterviewSlot.objects.count() == 1
@@ -0,0 +1,57 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import JobApplication
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def applications(job_advert):
+    return [
+        JobApplication.objects.create(name=name, email=f"{name}@example.com", portfolio_url="https://example.com",
+                                      cv="cv.pdf", job_advert=job_advert, status=status)
+        for name, status in [("jane", ApplicationStatus.APPLIED), ("john", ApplicationStatus.REJECTED),
+                             ("jill", ApplicationStatus.APPLIED)]
+    ]
+
+
+def run(*args):
+    out, err = StringIO(), StringIO()
+    call_command("list_applications", *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+def test_table_streams_in_constant_queries(applications):
+    with CaptureQueriesContext(connection) as context:
+        out, _ = run()
+
+    assert len(context.captured_queries) == 2
+    assert out.count("Job: Backend Developer") == 3
+    assert "Found 3 application(s): 2 APPLIED, 1 REJECTED" in out
+
+
+def test_filters_and_machine_readable_formats(applications, job_advert):
+    out, err = run("--status", "APPLIED", "--advert", str(job_advert.pk), "--format", "csv", "--limit", "1")
+
+    rows = list(csv.DictReader(StringIO(out)))
+    assert len(rows) == 1 and rows[0]["status"] == "APPLIED" and rows[0]["company"] == "Acme"
+    assert "Found 2 application(s)" in err
+
+    out, _ = run("--email", "JOHN@example.com", "--format", "json")
+    assert [row["name"] for row in json.loads(out)] == ["john"]
+    out, _ = run("--format", "json")
+    assert sorted(row["name"] for row in json.loads(out)) == ["jane", "jill", "john"]
+
+
+def test_nothing_found(applications):
+    out, _ = run("--since", "2999-01-01")
+
+    assert "No applications found" in out
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test.client import AsyncClient, Client
+from django.urls import reverse
+
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import JobApplication
+from application_tracking.notifications import (InProcessBroker, get_broker, publish_notification_counts,
+                                                user_channel)
+
+pytestmark = pytest.mark.django_db
+
+
+def test_in_process_broker_delivers_to_channel_subscribers():
+    broker = InProcessBroker()
+
+    async def roundtrip():
+        subscription = broker.subscribe("notifications:1")
+        other = broker.subscribe("notifications:2")
+        broker.publish("notifications:1", {"new_decisions_count": 3})
+        received = await subscription.get(timeout=1)
+        missed = await other.get(timeout=0.01)
+        await subscription.close()
+        await other.close()
+        return received, missed
+
+    received, missed = async_to_sync(roundtrip)()
+    assert received == {"new_decisions_count": 3}
+    assert missed is None
+
+
+def test_notification_stream_sends_current_counts(authenticate_user_client, job_advert):
+    _, user = authenticate_user_client
+    JobApplication.objects.create(
+        name="Jane", email="jane@example.com", portfolio_url="https://example.com",
+        cv="cv.pdf", job_advert=job_advert,
+    )
+    client = AsyncClient()
+    client.force_login(user)
+
+    async def first_event():
+        response = await client.get(reverse("notification_stream"))
+        chunk = await anext(response.streaming_content)
+        await response.streaming_content.aclose()
+        return response, chunk
+
+    response, chunk = async_to_sync(first_event)()
+    assert response["Content-Type"] == "text/event-stream"
+    assert json.loads(chunk.decode().removeprefix("data: ")) == {
+        "new_decisions_count": 0,
+        "pending_decisions_count": 1,
+    }
+
+
+def test_notification_stream_requires_login(client: Client):
+    response = client.get(reverse("notification_stream"))
+    assert response.status_code == 403
+
+
+def test_decide_publishes_counts_to_recruiter_and_applicant(
+    authenticate_user_client, job_advert, django_user_model, monkeypatch
+):
+    client, recruiter = authenticate_user_client
+    applicant = django_user_model.objects.create(email="jane@example.com")
+    application = JobApplication.objects.create(
+        name="Jane", email="Jane@example.com", portfolio_url="https://example.com",
+        cv="cv.pdf", job_advert=job_advert, applicant=applicant,
+    )
+    published = {}
+    monkeypatch.setattr(get_broker(), "has_subscribers", lambda channel: True)
+    monkeypatch.setattr(get_broker(), "publish", lambda channel, message: published.update({channel: message}))
+
+    client.post(
+        reverse("decide", kwargs={"job_application_id": application.id}),
+        {"status": ApplicationStatus.INTERVIEW},
+    )
+
+    assert published[user_channel(recruiter.pk)]["pending_decisions_count"] == 0
+    assert published[user_channel(applicant.pk)]["new_decisions_count"] == 1
+
+
+def test_counts_are_not_queried_without_listeners(user_instance, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        publish_notification_counts(user_instance)
+
+
+def test_notification_stream_under_wsgi_sends_counts_once(authenticate_user_client, settings):
+    client, _ = authenticate_user_client
+    settings.NOTIFICATIONS_POLL_SECONDS = 30
+
+    response = client.get(reverse("notification_stream"))
+
+    # A complete response, not a stream that would hold the worker thread
+    assert not response.streaming
+    assert response.content.decode() == (
+        'retry: 30000\ndata: {"new_decisions_count": 0, "pending_decisions_count": 0}\n\n'
+    )
+
+
+def test_pages_served_over_wsgi_poll_for_counts(authenticate_user_client):
+    client, _ = authenticate_user_client
+
+    page = client.get(reverse("my_jobs")).content.decode()
+    counts = client.get(reverse("notification_counts")).json()
+
+    assert "data-notifications-poll-url" in page
+    assert "data-notifications-url" not in page
+    assert counts == {"new_decisions_count": 0, "pending_decisions_count": 0}
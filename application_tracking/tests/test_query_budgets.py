@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import URLPattern, get_resolver, reverse
+from django.utils import timezone
+
+from accounts.tests.factories import JobAdvertFactory, JobApplicationFactory
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import (InterviewSlot, JobAdvert, SavedSearch, WebhookDelivery,
+                                         WebhookSubscription)
+from common.query_budget import QueryBudgetExceeded, query_budget
+
+pytestmark = pytest.mark.django_db
+
+# Views whose budget doesn't apply: the stream is async and never ends
+UNBUDGETED = {"notification_stream"}
+
+ROWS = 4
+
+
+@pytest.fixture
+def data(authenticate_user_client):
+    """Several rows behind every list, so a per-row query shows up as going over budget"""
+    client, owner = authenticate_user_client
+    adverts = JobAdvertFactory.bulk_batch(ROWS, created_by=owner)
+    owned_applications = [application for advert in adverts
+                          for application in JobApplicationFactory.bulk_batch(ROWS, job_advert=advert)]
+    applied = [JobApplicationFactory(job_advert=advert, email=owner.email, applicant=owner,
+                                     status=ApplicationStatus.INTERVIEW)
+               for advert in JobAdvertFactory.bulk_batch(ROWS)]
+    starts_at = timezone.now() + timedelta(days=1)
+    slots = [InterviewSlot.objects.create(recruiter=owner, job_advert=adverts[0],
+                                          starts_at=starts_at + timedelta(hours=index),
+                                          ends_at=starts_at + timedelta(hours=index, minutes=30))
+             for index in range(ROWS)]
+    subscriptions = [WebhookSubscription.objects.create(user=owner, url=f"https://ats{index}.example.com/hook")
+                     for index in range(ROWS)]
+    for subscription in subscriptions:
+        WebhookDelivery.objects.create(subscription=subscription, event="application.created", payload={})
+    searches = [SavedSearch.objects.create(user=owner, keyword=f"python {index}") for index in range(ROWS)]
+    return client, {
+        "advert_id": adverts[0].pk, "company_id": adverts[0].company_id, "job_application_id": applied[0].pk,
+        "owned_application_id": owned_applications[0].pk,
+        "slot_id": slots[0].pk, "search_id": searches[0].pk, "subscription_id": subscriptions[0].pk,
+    }
+
+
+def routes():
+    for pattern in get_resolver().url_patterns:
+        for route in getattr(pattern, "url_patterns", [pattern]):
+            if isinstance(route, URLPattern) and route.callback.__module__ in (
+                "application_tracking.views", "accounts.views"
+            ):
+                yield route
+
+
+@pytest.mark.parametrize("route", list(routes()), ids=lambda route: route.name)
+def test_route_stays_within_query_budget(data, route):
+    client, ids = data
+    if route.name in UNBUDGETED:
+        pytest.skip("no budget")
+    assert hasattr(route.callback, "query_budget"), f"{route.name} has no @query_budget"
+    if route.name == "decide":
+        # Only POST does anything
+        client.post(reverse(route.name, args=[ids["owned_application_id"]]), {"status": ApplicationStatus.INTERVIEW})
+        return
+
+    # Raises QueryBudgetExceeded (enforce_query_budgets in conftest.py) when over
+    client.get(reverse(route.name, kwargs={name: ids[name] for name in route.pattern.converters}))
+
+
+def test_over_budget_reports_repeated_statements(rf, settings, caplog, job_advert):
+    @query_budget(1)
+    def view(request):
+        adverts = list(JobAdvert.objects.all())
+        return [advert.total_applicants for advert in adverts + adverts]
+
+    with pytest.raises(QueryBudgetExceeded, match=r"(?s)ran 3 queries .*2x SELECT COUNT"):
+        view(rf.get("/"))
+
+    settings.QUERY_BUDGET_RAISE = False
+    view(rf.get("/"))
+    assert "(budget 1)" in caplog.text
@@ -0,0 +1,56 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.urls import reverse
+
+from accounts.models import StudentProfile
+from application_tracking.models import JobApplication
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile(user_instance, media_root):
+    profile = StudentProfile(
+        user=user_instance, full_name="Jane Doe", skills="Python",
+        github_url="https://github.com/jane",
+    )
+    profile.resume.save("jane.pdf", ContentFile(b"%PDF-1.4 resume"))
+    return profile
+
+
+def stored_files(media_root):
+    return sorted(path.name for path in media_root.rglob("*") if path.is_file())
+
+
+def test_quick_apply_reuses_profile_resume(authenticate_user_client, job_advert, profile, media_root):
+    client, user = authenticate_user_client
+    files_before = stored_files(media_root)
+
+    response = client.post(reverse("quick_apply", kwargs={"advert_id": job_advert.id}))
+
+    assert response.status_code == 302
+    application = JobApplication.objects.get(job_advert=job_advert)
+    assert application.cv.name == profile.resume.name
+    assert (application.name, application.email, application.applicant) == ("Jane Doe", user.email, user)
+    assert application.portfolio_url == "https://github.com/jane"
+    assert stored_files(media_root) == files_before
+
+
+def test_quick_apply_twice_keeps_one_application(authenticate_user_client, job_advert, profile):
+    client, _ = authenticate_user_client
+    url = reverse("quick_apply", kwargs={"advert_id": job_advert.id})
+
+    client.post(url)
+    client.post(url)
+
+    assert JobApplication.objects.filter(job_advert=job_advert).count() == 1
+
+
+def test_quick_apply_without_resume_sends_user_to_profile(authenticate_user_client, job_advert):
+    client, user = authenticate_user_client
+    StudentProfile.objects.create(user=user, full_name="Jane Doe", skills="Python")
+
+    response = client.post(reverse("quick_apply", kwargs={"advert_id": job_advert.id}))
+
+    assert response.url == reverse("profile")
+    assert not JobApplication.objects.exists()
@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.utils import timezone
+
+from accounts.models import StudentProfile, User
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import Company, InterviewSlot, JobAdvert, JobApplication, SavedSearch
+from application_tracking.retention import (closed_advert_applications, delete_applications, fast_delete, months_before,
+                                            purge_email)
+from application_tracking.search import SEARCH_TABLE
+
+pytestmark = pytest.mark.django_db
+
+
+def make_application(advert, name, **kwargs):
+    return JobApplication.objects.create(name=name, email=f"{name}@example.com", portfolio_url="https://example.com",
+                                         job_advert=advert, **kwargs)
+
+
+def indexed_documents():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def closed_advert(user_instance):
+    return JobAdvert.objects.create(
+        title="Old role", company=Company.objects.for_name("Acme"), employment_type="Full Time",
+        experience_level="Entry Level", description="Closed", job_type="Remote", skills="Python",
+        created_by=user_instance, deadline=timezone.localdate() - timedelta(days=400),
+    )
+
+
+def test_fast_delete_is_one_statement(user_instance, django_assert_num_queries):
+    for keyword in ("python", "django"):
+        SavedSearch.objects.create(user=user_instance, keyword=keyword)
+    deleted = []
+
+    def receiver(instance, **kwargs):
+        deleted.append(instance)
+
+    post_delete.connect(receiver, sender=SavedSearch)
+    try:
+        with django_assert_num_queries(1) as captured:
+            rows = fast_delete(SavedSearch.objects.filter(user=user_instance))
+    finally:
+        post_delete.disconnect(receiver, sender=SavedSearch)
+
+    assert rows == 2
+    assert captured.captured_queries[0]["sql"].startswith("DELETE")
+    assert deleted == []
+
+
+def test_months_before_clamps_to_month_end():
+    assert months_before(date(2025, 3, 31), 1) == date(2025, 2, 28)
+    assert months_before(date(2025, 1, 15), 13) == date(2023, 12, 15)
+
+
+def test_closed_advert_policy_deletes_in_batches_with_files(media_root, user_instance, job_advert, closed_advert,
+                                                            django_capture_on_commit_callbacks):
+    old = [make_application(closed_advert, name, cv=default_storage.save(f"{name}.pdf", ContentFile(b"cv")))
+           for name in ("jane", "john", "jill")]
+    old[0].change_status(ApplicationStatus.INTERVIEW, changed_by=user_instance)
+    slot = InterviewSlot.objects.create(recruiter=user_instance, job_advert=closed_advert, application=old[0],
+                                        starts_at=timezone.now(), ends_at=timezone.now() + timedelta(hours=1))
+    current = make_application(job_advert, "jack")
+    policy = closed_advert_applications(12)
+
+    assert delete_applications(policy, dry_run=True) == {"applications": 3, "status changes": 1}
+    assert JobApplication.objects.count() == 4
+
+    with django_capture_on_commit_callbacks(execute=True):
+        report = delete_applications(policy, batch_size=2)
+
+    assert report == {"applications": 3, "status changes": 1, "cv files": 3}
+    assert list(JobApplication.objects.all()) == [current]
+    assert not any(default_storage.exists(application.cv.name) for application in old)
+    assert indexed_documents() == 1
+    slot.refresh_from_db()
+    assert slot.application is None
+
+
+def test_purge_email_erases_applicant(media_root, client, user_instance, job_advert,
+                                      django_capture_on_commit_callbacks):
+    applicant = User.objects.create(email="jane@example.com")
+    resume = default_storage.save("resumes/jane.pdf", ContentFile(b"cv"))
+    StudentProfile.objects.create(user=applicant, full_name="Jane", skills="Python", resume=resume)
+    SavedSearch.objects.create(user=applicant, keyword="python")
+    make_application(job_advert, "jane", cv=resume, applicant=applicant)
+
+    assert purge_email("Jane@example.com", dry_run=True)["accounts"] == 1
+    assert User.objects.filter(pk=applicant.pk).exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        report = purge_email("Jane@example.com")
+
+    assert report["applications"] == 1 and report["profiles"] == 1 and report["saved searches"] == 1
+    assert not User.objects.filter(pk=applicant.pk).exists()
+    assert not default_storage.exists(resume)
+    # The recruiter's adverts would go with the account, so it stays
+    assert purge_email(user_instance.email)["accounts kept"] == 1
+    assert JobAdvert.objects.filter(pk=job_advert.pk).exists()
+
+
+def test_purge_data_requires_a_policy_and_reports_dry_runs(closed_advert):
+    make_application(closed_advert, "jane")
+    out = StringIO()
+
+    call_command("purge_data", "--closed-adverts-months", "6", "--dry-run", stdout=out)
+
+    assert "Would delete 1 applications" in out.getvalue()
+    assert JobApplication.objects.exists()
+    with pytest.raises(CommandError, match="Choose a policy"):
+        call_command("purge_data")
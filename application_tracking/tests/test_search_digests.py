@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from application_tracking.alerts import SavedSearchIndex
+from application_tracking.models import Company, JobAdvert, SavedSearch, SearchDigestRun
+
+pytestmark = pytest.mark.django_db
+
+
+def make_advert(user, title, location="Dhaka", skills="Python"):
+    return JobAdvert.objects.create(
+        title=title, company=Company.objects.for_name("Acme"), employment_type="Full Time",
+        experience_level="Entry Level", description="Join the team", job_type="Onsite",
+        location=location, skills=skills, created_by=user,
+        deadline=timezone.now().date() + timedelta(days=30),
+    )
+
+
+def test_index_requires_every_term_and_the_location(user_instance):
+    searches = [
+        SavedSearch(user=user_instance, keyword="python developer"),
+        SavedSearch(user=user_instance, keyword="python", location="dhaka"),
+        SavedSearch(user=user_instance, keyword="rust"),
+        SavedSearch(user=user_instance, location="chittagong"),
+    ]
+    index = SavedSearchIndex(searches)
+
+    advert = JobAdvert(title="Python Developer", company=Company(name="Acme"), description="",
+                       skills="Django", location="Dhaka, Bangladesh")
+
+    assert index.match(advert) == searches[:2]
+
+
+def test_digest_sends_one_email_per_user_once(user_instance, django_user_model):
+    other = django_user_model.objects.create(email="other@example.com")
+    SavedSearch.objects.create(user=user_instance, keyword="python")
+    SavedSearch.objects.create(user=user_instance, location="dhaka")
+    SavedSearch.objects.create(user=other, keyword="golang")
+    make_advert(user_instance, "Backend Engineer")
+    make_advert(user_instance, "Data Analyst", location="Sylhet", skills="SQL")
+
+    call_command("send_search_digests")
+
+    assert [message.to for message in mail.outbox] == [[user_instance.email]]
+    assert "Backend Engineer" in mail.outbox[0].body
+    assert "Data Analyst" not in mail.outbox[0].body
+    assert mail.outbox[0].subject.startswith("1 new job ")
+
+    call_command("send_search_digests")
+
+    assert len(mail.outbox) == 1
+    assert SearchDigestRun.objects.count() == 2
+
+
+def test_save_search_from_results(authenticate_user_client):
+    client, user = authenticate_user_client
+
+    response = client.post(reverse("saved_searches"), {"keyword": "  Python  Developer ", "location": ""})
+    client.post(reverse("saved_searches"), {"keyword": "python developer", "location": ""})
+
+    saved_search = user.saved_searches.get()
+    assert saved_search.keyword == "python developer"
+    assert response.url == saved_search.get_absolute_url()
+
+
+def test_interrupted_digest_run_resumes_without_resending(user_instance, django_user_model, monkeypatch):
+    other = django_user_model.objects.create(email="other@example.com")
+    SavedSearch.objects.create(user=user_instance, keyword="python")
+    SavedSearch.objects.create(user=other, keyword="python")
+    make_advert(user_instance, "Backend Engineer")
+    real_send = EmailBackend.send_messages
+
+    def crash_after_first(self, messages):
+        real_send(self, messages)
+        raise ConnectionError("mail server went away")
+
+    monkeypatch.setattr(EmailBackend, "send_messages", crash_after_first)
+    with pytest.raises(ConnectionError):
+        call_command("send_search_digests", batch_size=1)
+    monkeypatch.setattr(EmailBackend, "send_messages", real_send)
+    call_command("send_search_digests", batch_size=1)
+
+    assert sorted(message.to[0] for message in mail.outbox) == [other.email, user_instance.email]
+    run = SearchDigestRun.objects.get()
+    assert run.completed_at is not None
+    assert run.emails_sent == 2
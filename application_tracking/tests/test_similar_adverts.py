@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from application_tracking.models import AdvertTerm, Company, JobAdvert, SimilarAdvert
+from application_tracking.similarity import Corpus, rebuild_similar_adverts, refresh_similar_adverts
+
+pytestmark = pytest.mark.django_db
+
+
+def make_advert(user, title, skills, description="Join our team"):
+    return JobAdvert.objects.create(
+        title=title, company=Company.objects.for_name("Acme"), employment_type="Full Time",
+        experience_level="Entry Level", description=description, job_type="Remote", skills=skills,
+        created_by=user, deadline=timezone.localdate() + timedelta(days=30),
+    )
+
+
+@pytest.fixture
+def adverts(user_instance):
+    return {
+        "backend": make_advert(user_instance, "Backend Developer", "Python Django PostgreSQL"),
+        "api": make_advert(user_instance, "Django API Developer", "Python Django REST"),
+        "designer": make_advert(user_instance, "Graphic Designer", "Figma Illustrator"),
+    }
+
+
+def test_rebuild_links_adverts_sharing_terms(adverts):
+    call_command("rebuild_similar_adverts")
+
+    assert adverts["backend"].similar_adverts() == [adverts["api"]]
+    assert adverts["api"].similar_adverts() == [adverts["backend"]]
+    assert adverts["designer"].similar_adverts() == []
+
+
+def test_advert_page_reads_neighbours_in_one_query(client, adverts, django_assert_num_queries):
+    rebuild_similar_adverts()
+
+    with django_assert_num_queries(1):
+        assert adverts["backend"].similar_adverts(limit=3) == [adverts["api"]]
+    response = client.get(adverts["backend"].get_absolute_url())
+    assert response.context["similar_adverts"] == [adverts["api"]]
+    assert "Django API Developer" in response.content.decode()
+
+
+def test_saving_adverts_updates_neighbour_lists(settings, user_instance, adverts, django_capture_on_commit_callbacks):
+    settings.SIMILAR_ADVERTS_COUNT = 1
+    rebuild_similar_adverts()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        designer = make_advert(user_instance, "UI Designer", "Figma Sketch")
+    # Nothing is recomputed on the request path
+    assert adverts["designer"].similar_adverts() == []
+
+    assert refresh_similar_adverts() == 1
+    assert adverts["designer"].similar_adverts() == [designer]
+    assert designer.similar_adverts() == [adverts["designer"]]
+
+    designer.is_published = False
+    designer.save()
+    assert refresh_similar_adverts() == 1
+    assert adverts["designer"].similar_adverts() == []
+    assert not SimilarAdvert.objects.filter(advert=designer).exists()
+    assert not AdvertTerm.objects.filter(advert=designer).exists()
+
+
+def test_saves_that_keep_the_text_do_not_queue_a_refresh(adverts):
+    JobAdvert.objects.update(similarity_stale=False)
+    advert = JobAdvert.objects.get(pk=adverts["backend"].pk)
+
+    advert.location = "Dhaka"
+    advert.save()
+    assert not JobAdvert.objects.filter(similarity_stale=True).exists()
+
+    advert.skills = "Python Django Celery"
+    advert.save(update_fields=["skills"])
+    assert list(JobAdvert.objects.filter(similarity_stale=True)) == [advert]
+
+
+def test_refresh_scores_from_the_stored_index_like_a_rebuild(user_instance, adverts, django_assert_max_num_queries):
+    rebuild_similar_adverts()
+    api = make_advert(user_instance, "Python API Engineer", "Python Django FastAPI")
+
+    # Term weights, document frequencies and candidates all come from AdvertTerm
+    with django_assert_max_num_queries(20):
+        refresh_similar_adverts()
+
+    expected = Corpus(JobAdvert.objects.active()).vectors[api.pk]
+    stored = dict(AdvertTerm.objects.filter(advert=api).values_list("term", "weight"))
+    assert stored == pytest.approx(expected)
+    assert api.similar_adverts() == [adverts["api"], adverts["backend"]]
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import ApplicationStatusChange, JobApplication
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def application(job_advert):
+    return JobApplication.objects.create(
+        name="Jane", email="jane@example.com", portfolio_url="https://example.com",
+        cv="cv.pdf", job_advert=job_advert,
+    )
+
+
+def test_decide_appends_status_change(authenticate_user_client, application):
+    client, recruiter = authenticate_user_client
+    url = reverse("decide", kwargs={"job_application_id": application.id})
+
+    client.post(url, {"status": ApplicationStatus.INTERVIEW})
+    client.post(url, {"status": ApplicationStatus.REJECTED})
+
+    changes = list(application.status_changes.values_list("from_status", "to_status", "changed_by"))
+    assert changes == [
+        (ApplicationStatus.APPLIED, ApplicationStatus.INTERVIEW, recruiter.pk),
+        (ApplicationStatus.INTERVIEW, ApplicationStatus.REJECTED, recruiter.pk),
+    ]
+
+
+def test_status_changes_are_append_only(user_instance, application):
+    change = application.change_status(ApplicationStatus.INTERVIEW, changed_by=user_instance)
+    change.to_status = ApplicationStatus.REJECTED
+    with pytest.raises(ValueError):
+        change.save()
+
+
+def test_time_in_stage_and_throughput_are_single_grouped_queries(
+    user_instance, application, django_assert_num_queries
+):
+    JobApplication.objects.filter(pk=application.pk).update(
+        created_at=application.created_at - timedelta(days=2)
+    )
+    application.refresh_from_db()
+    application.change_status(ApplicationStatus.INTERVIEW, changed_by=user_instance)
+
+    history = ApplicationStatusChange.objects.filter(job_advert=application.job_advert)
+    with django_assert_num_queries(1):
+        stages = list(history.time_in_stage())
+    with django_assert_num_queries(1):
+        throughput = list(history.recruiter_throughput())
+
+    assert stages[0]["from_status"] == ApplicationStatus.APPLIED
+    assert stages[0]["transitions"] == 1
+    assert stages[0]["average_time"] >= timedelta(days=2)
+    assert throughput[0]["changed_by__email"] == user_instance.email
+    assert (throughput[0]["decisions"], throughput[0]["interviews"]) == (1, 1)
@@ -0,0 +1,208 @@
+import hashlib
+import hmac
+import json
+import threading
+from datetime import timedelta
+from io import StringIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from application_tracking.enums import ApplicationStatus, WebhookEvent
+from application_tracking.models import (JobApplication, WebhookDelivery, WebhookDeliveryQuerySet,
+                                         WebhookSubscription)
+from application_tracking.retention import purge_email
+from application_tracking.webhooks import SIGNATURE_HEADER, WebhookDispatcher
+
+pytestmark = pytest.mark.django_db
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((self.headers[SIGNATURE_HEADER], body))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint(settings):
+    # The stand-in endpoint listens on plain http on loopback
+    settings.WEBHOOK_REQUIRE_HTTPS = False
+    settings.WEBHOOK_ALLOW_PRIVATE_ADDRESSES = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    server.connections, server.received, server.statuses = 0, [], []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def subscription(endpoint, user_instance):
+    return WebhookSubscription.objects.create(
+        user=user_instance, url=f"http://127.0.0.1:{endpoint.server_port}/hooks"
+    )
+
+
+def apply(client, advert, name):
+    client.post(reverse("apply_for_job", kwargs={"advert_id": advert.id}), {
+        "name": name, "email": f"{name}@example.com", "portfolio_url": "https://example.com",
+        "cv": SimpleUploadedFile("cv.pdf", b"%PDF-1.4 cv", content_type="application/pdf"),
+    })
+    return JobApplication.objects.get(name=name)
+
+
+def test_events_are_batched_signed_and_share_a_connection(client, endpoint, subscription, job_advert,
+                                                         user_instance):
+    application = JobApplication.objects.create(name="jane", email="jane@example.com", cv="cv.pdf",
+                                                portfolio_url="https://example.com", job_advert=job_advert)
+    WebhookDelivery.objects.enqueue(user_instance.pk, WebhookEvent.APPLICATION_CREATED,
+                                    application.webhook_payload())
+    application.change_status(ApplicationStatus.INTERVIEW, changed_by=user_instance)
+    dispatcher = WebhookDispatcher()
+
+    assert dispatcher.flush() == {"delivered": 2}
+
+    signature, body = endpoint.received[0]
+    timestamp = signature.split(",")[0][2:]
+    expected = hmac.new(subscription.secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    assert signature.endswith(f"v1={expected}")
+    deliveries = json.loads(body)["deliveries"]
+    assert [delivery["event"] for delivery in deliveries] == [
+        "application.created", "application.status_changed"
+    ]
+    assert deliveries[1]["data"]["previous_status"] == ApplicationStatus.APPLIED
+
+    JobApplication.objects.filter(pk=application.pk).change_status(ApplicationStatus.REJECTED)
+    assert dispatcher.flush() == {"delivered": 1}
+    assert endpoint.connections == 1
+    assert not WebhookDelivery.objects.due().exists()
+    dispatcher.pool.close()
+
+
+def test_failed_batches_back_off_and_give_up(settings, endpoint, subscription, job_advert, user_instance):
+    settings.WEBHOOK_MAX_ATTEMPTS = 2
+    endpoint.statuses = [500, 503]
+    WebhookDelivery.objects.enqueue(user_instance.pk, WebhookEvent.APPLICATION_CREATED, {"id": "1"})
+    dispatcher = WebhookDispatcher()
+    now = timezone.now()
+
+    assert dispatcher.flush(now) == {"failed": 1}
+    delivery = WebhookDelivery.objects.get()
+    assert delivery.attempts == 1 and delivery.last_error == "HTTP 500"
+    assert delivery.next_attempt_at == now + timedelta(seconds=settings.WEBHOOK_RETRY_BASE)
+    assert dispatcher.flush(now + timedelta(seconds=1)) == {}
+
+    assert dispatcher.flush(delivery.next_attempt_at) == {"failed": 1}
+    delivery.refresh_from_db()
+    assert delivery.next_attempt_at is None and delivery.delivered_at is None
+    dispatcher.pool.close()
+
+
+def test_send_once_drains_every_due_batch(endpoint, subscription, user_instance):
+    for n in range(5):
+        WebhookDelivery.objects.enqueue(user_instance.pk, WebhookEvent.APPLICATION_CREATED, {"id": str(n)})
+    out = StringIO()
+
+    call_command("send_webhooks", once=True, batch_size=2, stdout=out)
+
+    assert "Delivered 5 event(s), 0 failed" in out.getvalue()
+    assert not WebhookDelivery.objects.due().exists()
+
+
+def test_apply_enqueues_only_for_the_advert_owner(client, media_root, subscription, job_advert, django_user_model):
+    other = django_user_model.objects.create(email="other@example.com")
+    WebhookSubscription.objects.create(user=other, url="https://other.example.com/hooks")
+
+    apply(client, job_advert, "jane")
+
+    delivery = WebhookDelivery.objects.get()
+    assert delivery.subscription == subscription
+    assert delivery.payload["name"] == "jane"
+
+
+def test_manage_subscriptions(authenticate_user_client):
+    client, user = authenticate_user_client
+
+    client.post(reverse("webhooks"), {"url": "https://ats.example.com/hooks"})
+    client.post(reverse("webhooks"), {"url": "https://ats.example.com/hooks"})
+    subscription = user.webhook_subscriptions.get()
+    assert client.get(reverse("webhooks")).context["subscriptions"][0].pending == 0
+
+    client.post(reverse("delete_webhook", kwargs={"subscription_id": subscription.id}))
+    assert not user.webhook_subscriptions.exists()
+
+
+@pytest.mark.parametrize("url", [
+    "http://hooks.example.com/events",
+    "https://127.0.0.1/hooks",
+    "https://169.254.169.254/latest/meta-data",
+    "https://[::1]:8443/hooks",
+    "https://localhost/hooks",
+    "https://10.0.0.5/hooks",
+])
+def test_subscriptions_refuse_non_public_endpoints(authenticate_user_client, settings, url):
+    settings.WEBHOOK_REQUIRE_HTTPS = True
+    client, user = authenticate_user_client
+
+    response = client.post(reverse("webhooks"), {"url": url})
+
+    assert response.status_code == 200
+    assert response.context["form"].errors["url"]
+    assert not user.webhook_subscriptions.exists()
+
+
+def test_dispatcher_refuses_hosts_resolving_to_private_addresses(settings, endpoint, subscription, user_instance):
+    settings.WEBHOOK_ALLOW_PRIVATE_ADDRESSES = False
+    WebhookDelivery.objects.enqueue(user_instance.pk, WebhookEvent.APPLICATION_CREATED, {"id": "1"})
+    dispatcher = WebhookDispatcher()
+
+    assert dispatcher.flush() == {"failed": 1}
+    assert endpoint.received == []
+    assert "non-public address" in WebhookDelivery.objects.get().last_error
+    dispatcher.pool.close()
+
+
+def test_flush_abandons_rows_claimed_by_another_flush(endpoint, subscription, user_instance, monkeypatch):
+    WebhookDelivery.objects.enqueue(user_instance.pk, WebhookEvent.APPLICATION_CREATED, {"id": "1"})
+    # Another flush claimed the row after ours selected it as due
+    WebhookDelivery.objects.update(next_attempt_at=timezone.now() + timedelta(minutes=5))
+    monkeypatch.setattr(WebhookDeliveryQuerySet, "due", lambda self, now=None: self.order_by("pk"))
+
+    assert WebhookDispatcher().flush() == {}
+    assert endpoint.received == []
+
+
+def test_purges_remove_webhook_payloads(endpoint, subscription, job_advert, user_instance):
+    application = JobApplication.objects.create(name="jane", email="jane@example.com", cv="cv.pdf",
+                                                portfolio_url="https://example.com", job_advert=job_advert)
+    WebhookDelivery.objects.enqueue(user_instance.pk, WebhookEvent.APPLICATION_CREATED,
+                                    application.webhook_payload())
+    WebhookDelivery.objects.enqueue(user_instance.pk, WebhookEvent.APPLICATION_CREATED,
+                                    {"id": "gone", "email": "JANE@example.com"})
+    old = WebhookDelivery.objects.create(subscription=subscription, event=WebhookEvent.APPLICATION_CREATED,
+                                         payload={"id": "old"}, next_attempt_at=None)
+    WebhookDelivery.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=40))
+
+    call_command("purge_data", webhook_days=30, stdout=StringIO())
+    assert not WebhookDelivery.objects.filter(pk=old.pk).exists()
+
+    report = purge_email("jane@example.com")
+    assert report["webhook events"] == 2
+    assert not WebhookDelivery.objects.exists()
@@ -1,16 +1,31 @@
 from django.urls import path
-from . import views
+
+from common.lazy_views import LazyViews
+
+views = LazyViews("application_tracking.views", async_views={"notification_stream"})
 
 urlpatterns = [
     
     path("search/", views.search, name="search"),
+    path("companies/<uuid:company_id>/", views.company_page, name="company"),
     path("create/", views.create_advert, name="create_advert"),
     path("my-applications/", views.my_applications, name="my_applications"),
     path("my-jobs/", views.my_jobs, name="my_jobs"),
+    path("saved-searches/", views.saved_searches, name="saved_searches"),
+    path("saved-searches/<uuid:search_id>/delete/", views.delete_saved_search, name="delete_saved_search"),
+    path("webhooks/", views.webhooks, name="webhooks"),
+    path("webhooks/<uuid:subscription_id>/delete/", views.delete_webhook, name="delete_webhook"),
+    path("notifications/stream/", views.notification_stream, name="notification_stream"),
+    path("notifications/counts/", views.notification_counts, name="notification_counts"),
     path("<uuid:advert_id>/", views.get_advert, name="job_advert"),
     path("<uuid:advert_id>/apply/", views.apply, name="apply_for_job"),
+    path("<uuid:advert_id>/quick-apply/", views.quick_apply, name="quick_apply"),
     path("<uuid:advert_id>/applications/", views.advert_applications, name="advert_applications"),
+    path("<uuid:advert_id>/dashboard/", views.advert_dashboard, name="advert_dashboard"),
+    path("<uuid:advert_id>/interviews/", views.advert_interviews, name="advert_interviews"),
+    path("interviews/<uuid:slot_id>/delete/", views.delete_interview_slot, name="delete_interview_slot"),
     path("<uuid:job_application_id>/decide/", views.decide, name="decide"),
+    path("<uuid:job_application_id>/interview/", views.book_interview, name="book_interview"),
     path("<uuid:advert_id>/update/", views.update_advert, name="update_advert"),
     path("<uuid:advert_id>/delete/", views.delete_advert, name="delete_advert"),
 
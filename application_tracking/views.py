@@ -1,19 +1,33 @@
+import json
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
-from django.http import HttpRequest, HttpResponseForbidden
+from django.db import IntegrityError, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
-from django.db.models import Q
-
-from accounts.models import User
-from application_tracking.enums import ApplicationStatus
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-
-from .forms import JobAdvertForm, JobApplicationForm
-from .models import JobAdvert, JobApplication
-
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+
+from accounts.models import StudentProfile, User
+from application_tracking.enums import ApplicationStatus, WebhookEvent
+from common.query_budget import query_budget
+
+from .context_processors import get_notification_counts
+from .forms import InterviewDayForm, JobAdvertForm, JobApplicationForm, WebhookSubscriptionForm
+from .interviews import generate_day_slots
+from .listings import ListingPaginator, company_stats, listing_key
+from .models import (Company, DailyApplicationRollup, InterviewSlot, JobAdvert, JobApplication,
+                     SavedSearch, SlotUnavailable, WebhookDelivery, WebhookSubscription)
+from .notifications import get_broker, notify_decisions, publish_notification_counts, user_channel
+from .search import search_applications
+
+@query_budget(11)
 def home(request):
     # Calculate real statistics for achievements section
     total_users = User.objects.count()
@@ -35,6 +49,7 @@ def home(request):
     
     return render(request, "home.html", context)
 
+@query_budget(12)
 @login_required
 def create_advert(request: HttpRequest):
     form = JobAdvertForm(request.POST or None)
@@ -57,9 +72,10 @@ def create_advert(request: HttpRequest):
     return render(request, "create_advert.html", context)
   
 
+@query_budget(8)
 def list_adverts(request):
-    job_list = JobAdvert.objects.all().order_by('-created_at')
-    paginator = Paginator(job_list, 10)
+    job_list = JobAdvert.objects.active().select_related('company').order_by('-created_at')
+    paginator = ListingPaginator(job_list, 10, listing_key("browse"))
     page_number = request.GET.get('page')
     job_adverts = paginator.get_page(page_number)
 
@@ -67,16 +83,20 @@ def list_adverts(request):
 
 
 
+@query_budget(8)
 def get_advert(request: HttpRequest, advert_id):
     form = JobApplicationForm()
 
-    job_advert = get_object_or_404(JobAdvert, pk=advert_id)
+    job_advert = get_object_or_404(JobAdvert.objects.select_related("company"), pk=advert_id)
     context = {
         "job_advert": job_advert,
         "application_form": form,
+        "profile": _student_profile(request),
+        "similar_adverts": job_advert.similar_adverts(limit=settings.SIMILAR_ADVERTS_COUNT),
     }
     return render(request, "advert.html", context)
     
+@query_budget(14)
 @login_required
 def update_advert(request: HttpRequest, advert_id):
     advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
@@ -97,6 +117,7 @@ def update_advert(request: HttpRequest, advert_id):
     return render(request, "create_advert.html", context)
     
 
+@query_budget(22)
 @login_required
 def delete_advert(request: HttpRequest, advert_id):
     advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
@@ -109,46 +130,127 @@ def delete_advert(request: HttpRequest, advert_id):
  
 
 
+@query_budget(24)
 def apply(request: HttpRequest, advert_id):
     advert = get_object_or_404(JobAdvert, pk=advert_id)
     if request.method == "POST":
         form = JobApplicationForm(request.POST, request.FILES)
         if form.is_valid():
-            # Prevent duplicate applications for the same email
-            email = form.cleaned_data["email"]
-            if advert.applications.filter(email__iexact=email).exists():
-                messages.error(request, "You have already applied for this position")
-                return redirect("job_advert", advert_id=advert_id)
-            
-            # Save the new application
+            idempotency_key = form.cleaned_data["idempotency_key"] or None
             application: JobApplication = form.save(commit=False)
-            application.job_advert = advert
-            application.save()
-            messages.success(request, "Application submitted successfully.")
-            return redirect("job_advert", advert_id=advert_id)
+            # The CV is only written once the row is committed
+            application.cv = ""
+            return _submit_application(request, advert, application, idempotency_key,
+                                       cv=form.cleaned_data["cv"])
 
     else:
         form = JobApplicationForm()
     
     context = {
         "job_advert": advert,
-        "application_form": form
+        "application_form": form,
+        "profile": _student_profile(request),
     }
     return render(request, "advert.html", context)
 
 
+def _student_profile(request: HttpRequest):
+    if not request.user.is_authenticated:
+        return None
+    return StudentProfile.objects.filter(user=request.user).first()
+
+
+@query_budget(24)
+@login_required
+def quick_apply(request: HttpRequest, advert_id):
+    """Apply with the stored profile: the application points at the profile's resume file"""
+    advert = get_object_or_404(JobAdvert, pk=advert_id)
+    if request.method != "POST":
+        return redirect("job_advert", advert_id=advert_id)
+
+    profile = _student_profile(request)
+    if profile is None or not profile.can_quick_apply:
+        messages.error(request, "Add your name, a resume and a portfolio link to your profile to apply in one click.")
+        return redirect("profile")
+
+    application = JobApplication(
+        name=profile.full_name,
+        email=request.user.email,
+        portfolio_url=profile.application_portfolio_url,
+        # Same storage name, so nothing is uploaded or copied
+        cv=profile.resume.name,
+    )
+    return _submit_application(request, advert, application, request.POST.get("idempotency_key") or None)
+
+
+def _submit_application(request: HttpRequest, advert: JobAdvert, application: JobApplication,
+                        idempotency_key, cv=None):
+    """
+    Save a new application unless it duplicates an existing one, then attach
+    any uploaded CV and notify the advert owner once the row is committed.
+    """
+    # Prevent duplicate applications for the same email
+    existing = advert.applications.duplicate_of(application.email, idempotency_key)
+    if existing:
+        return _duplicate_application_redirect(request, advert.id, existing, idempotency_key)
+
+    application.job_advert = advert
+    application.idempotency_key = idempotency_key
+    if request.user.is_authenticated:
+        application.applicant = request.user
+    else:
+        # Same match as link_applications, so the user sees it under My Applications
+        application.applicant = User.objects.filter(email__iexact=application.email).first()
+    try:
+        with transaction.atomic():
+            application.save()
+            DailyApplicationRollup.objects.increment(advert.id, ApplicationStatus.APPLIED)
+            WebhookDelivery.objects.enqueue(advert.created_by_id, WebhookEvent.APPLICATION_CREATED,
+                                            application.webhook_payload())
+            if cv is not None:
+                transaction.on_commit(lambda: application.attach_cv(cv))
+            if advert.created_by:
+                transaction.on_commit(lambda: publish_notification_counts(advert.created_by))
+    except IntegrityError:
+        # A concurrent submission won the race for this advert/email
+        existing = advert.applications.duplicate_of(application.email, idempotency_key)
+        return _duplicate_application_redirect(request, advert.id, existing, idempotency_key)
+
+    messages.success(request, "Application submitted successfully.")
+    if cv is not None and not application.cv:
+        messages.warning(request, "Your CV could not be saved. Please send it to the employer directly.")
+    return redirect("job_advert", advert_id=advert.id)
+
+
+def _duplicate_application_redirect(request: HttpRequest, advert_id, existing, idempotency_key):
+    """A replay of the same form reports success again; anything else is a duplicate."""
+    if existing and idempotency_key and existing.idempotency_key == idempotency_key:
+        messages.success(request, "Application submitted successfully.")
+    else:
+        messages.error(request, "You have already applied for this position")
+    return redirect("job_advert", advert_id=advert_id)
+
+
+@query_budget(10)
 @login_required
 def my_applications(request: HttpRequest):
     user: User = request.user
-    applications = JobApplication.objects.filter(email=user.email)
+    advert_applicants = JobApplication.objects.filter(job_advert=OuterRef("job_advert")).order_by().values(
+        "job_advert"
+    ).annotate(total=Count("pk")).values("total")
+    applications = JobApplication.objects.filter(applicant=user).select_related(
+        "job_advert__company", "interview_slot"
+    ).annotate(advert_applicants=Subquery(advert_applicants)).order_by("-created_at")
     
     # Mark all unseen decisions as seen
-    JobApplication.objects.filter(
-        email=user.email,
+    marked_seen = JobApplication.objects.filter(
+        applicant=user,
         decision_seen=False
     ).exclude(
         status=ApplicationStatus.APPLIED
     ).update(decision_seen=True)
+    if marked_seen:
+        publish_notification_counts(user)
     
     paginator = Paginator(applications, 10)
 
@@ -162,10 +264,11 @@ def my_applications(request: HttpRequest):
     return render(request, "my_applications.html", context)
 
 
+@query_budget(7)
 @login_required
 def my_jobs(request: HttpRequest):
     user: User = request.user
-    jobs = JobAdvert.objects.filter(created_by=user)
+    jobs = JobAdvert.objects.filter(created_by=user).with_applicant_counts()
     paginator = Paginator(jobs, 10)
     requested_page = request.GET.get("page")
     paginated_jobs = paginator.get_page(requested_page)
@@ -178,6 +281,7 @@ def my_jobs(request: HttpRequest):
     return render(request, "my_jobs.html",  context)
 
 
+@query_budget(10)
 @login_required
 def advert_applications(request: HttpRequest, advert_id):
     advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
@@ -185,61 +289,347 @@ def advert_applications(request: HttpRequest, advert_id):
         return HttpResponseForbidden("You can only see applications for an advert created by you.")
     
     applications = advert.applications.all()
-    #applications = JobApplication.objects.filter(job_advert=advert.id)
+    query = request.GET.get("q", "").strip()
+    if query:
+        # Ranked from the search index; CV files are never opened here
+        applications = search_applications(applications, advert, query)
     paginator = Paginator(applications, 10)
     requested_page = request.GET.get("page")
     paginated_applications = paginator.get_page(requested_page)
 
     context = {
         "applications": paginated_applications,
-        "advert":advert
+        "advert":advert,
+        "query": query,
     }
     return render(request, "advert_applications.html", context)
     
+# Longest range the dashboard charts; buckets are built for every day of it
+DASHBOARD_MAX_DAYS = 3 * 366
+
+
+def _dashboard_range(request: HttpRequest):
+    """Date range from ?start=&end= (ISO dates), defaulting to the last 30 days"""
+    end = timezone.localdate()
+    start = end - timedelta(days=29)
+    try:
+        if request.GET.get("end"):
+            end = date.fromisoformat(request.GET["end"])
+        if request.GET.get("start"):
+            start = date.fromisoformat(request.GET["start"])
+    except ValueError:
+        messages.error(request, "Dates must be in YYYY-MM-DD format.")
+    start, end = (start, end) if start <= end else (end, start)
+    if (end - start).days >= DASHBOARD_MAX_DAYS:
+        start = end - timedelta(days=DASHBOARD_MAX_DAYS - 1)
+        messages.info(request, f"Showing the last {DASHBOARD_MAX_DAYS} days of that range.")
+    return start, end
+
+
+def _bucket_rollups(rollups, start, end):
+    """
+    Group (date, status, count) rows into chart buckets: daily for up to two
+    months, weekly up to a year and roughly monthly beyond that.
+    """
+    span = (end - start).days + 1
+    size = 1 if span <= 62 else 7 if span <= 366 else 30
+    buckets = [
+        {"start": start + timedelta(days=offset), **{status: 0 for status in ApplicationStatus.values}}
+        for offset in range(0, span, size)
+    ]
+    for day, status, count in rollups:
+        buckets[(day - start).days // size][status] += count
+
+    peak = max((bucket[status] for bucket in buckets for status in ApplicationStatus.values), default=0) or 1
+    for bucket in buckets:
+        bucket["bars"] = [
+            (status.lower(), bucket[status], bucket[status] * 100 // peak)
+            for status in ApplicationStatus.values
+        ]
+    return buckets, size
+
+
+@query_budget(8)
+@login_required
+def advert_dashboard(request: HttpRequest, advert_id):
+    advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
+    if request.user != advert.created_by:
+        return HttpResponseForbidden("You can only see analytics for an advert created by you.")
+
+    start, end = _dashboard_range(request)
+    # A single query over the pre-aggregated rollups, whatever the range
+    rollups = DailyApplicationRollup.objects.filter(
+        job_advert=advert, date__range=(start, end)
+    ).values_list("date", "status", "count")
+    buckets, bucket_days = _bucket_rollups(rollups, start, end)
+
+    totals = {status: sum(bucket[status] for bucket in buckets) for status in ApplicationStatus.values}
+    applied = totals[ApplicationStatus.APPLIED]
+    context = {
+        "advert": advert,
+        "start": start,
+        "end": end,
+        "buckets": buckets,
+        "bucket_days": bucket_days,
+        "total_applied": applied,
+        "total_interviews": totals[ApplicationStatus.INTERVIEW],
+        "total_rejections": totals[ApplicationStatus.REJECTED],
+        "interview_rate": round(totals[ApplicationStatus.INTERVIEW] * 100 / applied) if applied else 0,
+        "rejection_rate": round(totals[ApplicationStatus.REJECTED] * 100 / applied) if applied else 0,
+    }
+    return render(request, "advert_dashboard.html", context)
+
+
+@query_budget(22)
 @login_required
 def decide(request: HttpRequest, job_application_id):
-    job_application: JobApplication = get_object_or_404(JobApplication, pk=job_application_id)
+    job_application: JobApplication = get_object_or_404(
+        JobApplication.objects.select_related("job_advert__company", "job_advert__created_by", "applicant"),
+        pk=job_application_id,
+    )
 
     if request.user != job_application.job_advert.created_by:
         return HttpResponseForbidden("You can only decide on an advert created by you.")
     
     if request.method == "POST":
         status = request.POST.get("status")
-        job_application.status = status
-        # Mark as unseen when decision changes (except when changing to APPLIED)
-        if status != ApplicationStatus.APPLIED:
-            job_application.decision_seen = False
-        job_application.save(update_fields=["status", "decision_seen"])
+        if status not in ApplicationStatus.values:
+            messages.error(request, "Choose a valid application status.")
+            return redirect("advert_applications", advert_id=job_application.job_advert.id)
+
+        if status == job_application.status:
+            messages.info(request, f"Application is already {status}")
+            return redirect("advert_applications", advert_id=job_application.job_advert.id)
+
+        job_application.change_status(status, changed_by=request.user)
         messages.success(request, f"Application status updated to {status}")
 
-        if status == ApplicationStatus.REJECTED:
-            context = {
-                "applicant_name":job_application.name,
-                "job_title":job_application.job_advert.title,
-                "company_name":job_application.job_advert.company_name,
-            }
-            message = render_to_string("emails/job_application_update.html", context)
-            send_mail(
-                subject=f"Application Outcome for {job_application.job_advert.title}",
-                message=message,
-                from_email="noreply@example.com",
-                recipient_list=[job_application.email],
-            )
-        
+        notify_decisions([job_application], status)
+
         return redirect("advert_applications", advert_id=job_application.job_advert.id)
 
 
+@query_budget(8)
 def search(request: HttpRequest):
     keyword = request.GET.get("keyword")
     location = request.GET.get("location")
-    result = JobAdvert.objects.search(keyword, location)
-    paginator = Paginator(result, 10)
+    company = _company_filter(request)
+    result = JobAdvert.objects.search(keyword, location, company.id if company else None).select_related("company")
+    paginator = ListingPaginator(result, 10, listing_key("search", keyword, location, company and company.id))
     requested_page = request.GET.get("page")
     paginated_adverts = paginator.get_page(requested_page)
 
     context = {
-        "job_adverts": paginated_adverts
+        "job_adverts": paginated_adverts,
+        "company": company,
     }
     return render(request, "jobs_list.html", context)
 
 
+def _company_filter(request: HttpRequest):
+    """The company picked with ?company=<id>, or None for a missing or malformed id"""
+    try:
+        return Company.objects.filter(pk=request.GET.get("company")).first() if request.GET.get("company") else None
+    except ValidationError:
+        return None
+
+
+@query_budget(10)
+def company_page(request: HttpRequest, company_id):
+    company = get_object_or_404(Company, pk=company_id)
+    adverts = company.adverts.active().select_related("company").order_by("-created_at")
+    paginator = ListingPaginator(adverts, 10, listing_key("company", company.id))
+    requested_page = request.GET.get("page")
+
+    context = {
+        "company": company,
+        "job_adverts": paginator.get_page(requested_page),
+        "stats": company_stats(company),
+    }
+    return render(request, "company.html", context)
+
+
+@query_budget(8)
+@login_required
+def advert_interviews(request: HttpRequest, advert_id):
+    advert = get_object_or_404(JobAdvert, pk=advert_id)
+    if request.user != advert.created_by:
+        return HttpResponseForbidden("You can only schedule interviews for an advert created by you.")
+
+    form = InterviewDayForm(request.POST or None)
+    if form.is_valid():
+        slots, skipped = generate_day_slots(
+            request.user, advert, form.cleaned_data["day"], form.cleaned_data["start_time"],
+            form.cleaned_data["end_time"], form.cleaned_data["slot_minutes"],
+            form.cleaned_data["gap_minutes"] or 0,
+        )
+        messages.success(request, f"Added {len(slots)} interview slot(s).")
+        if skipped:
+            messages.info(request, f"Skipped {skipped} slot(s) that clash with your calendar.")
+        return redirect("advert_interviews", advert_id=advert.id)
+
+    context = {
+        "advert": advert,
+        "form": form,
+        "slots": advert.interview_slots.filter(ends_at__gt=timezone.now()).select_related("application"),
+    }
+    return render(request, "advert_interviews.html", context)
+
+
+@query_budget(4)
+@login_required
+def delete_interview_slot(request: HttpRequest, slot_id):
+    slot = get_object_or_404(InterviewSlot, pk=slot_id, recruiter=request.user)
+    if request.method == "POST":
+        if slot.application_id:
+            messages.error(request, "That slot is booked; it can't be removed.")
+        else:
+            slot.delete()
+            messages.success(request, "Interview slot removed.")
+    return redirect("advert_interviews", advert_id=slot.job_advert_id)
+
+
+@query_budget(10)
+@login_required
+def book_interview(request: HttpRequest, job_application_id):
+    application = get_object_or_404(
+        JobApplication.objects.select_related("job_advert__company"), pk=job_application_id, applicant=request.user
+    )
+    if application.status != ApplicationStatus.INTERVIEW:
+        messages.error(request, "You can book an interview once you have been invited to one.")
+        return redirect("my_applications")
+
+    if request.method == "POST":
+        try:
+            slot = InterviewSlot.objects.get(pk=request.POST.get("slot"), job_advert=application.job_advert)
+            slot.book(application)
+        except (InterviewSlot.DoesNotExist, ValidationError):
+            messages.error(request, "Choose one of the listed interview times.")
+            return redirect("book_interview", job_application_id=application.id)
+        except SlotUnavailable as exc:
+            messages.error(request, str(exc))
+            return redirect("book_interview", job_application_id=application.id)
+        messages.success(request, f"Interview booked for {timezone.localtime(slot.starts_at):%b %d, %Y %H:%M}.")
+        return redirect("my_applications")
+
+    context = {
+        "application": application,
+        "booked": InterviewSlot.objects.filter(application=application).first(),
+        "slots": application.job_advert.interview_slots.free(),
+    }
+    return render(request, "book_interview.html", context)
+
+
+@query_budget(7)
+@login_required
+def saved_searches(request: HttpRequest):
+    if request.method == "POST":
+        keyword = SavedSearch.normalize(request.POST.get("keyword"))
+        location = SavedSearch.normalize(request.POST.get("location"))
+        saved_search, created = SavedSearch.objects.get_or_create(
+            user=request.user, keyword=keyword, location=location
+        )
+        if created:
+            messages.success(request, f"Saved \"{saved_search}\". New matching jobs will be emailed to you.")
+        else:
+            messages.info(request, f"\"{saved_search}\" is already saved.")
+        return redirect(saved_search.get_absolute_url())
+
+    context = {
+        "saved_searches": request.user.saved_searches.all()
+    }
+    return render(request, "saved_searches.html", context)
+
+
+@query_budget(4)
+@login_required
+def delete_saved_search(request: HttpRequest, search_id):
+    saved_search = get_object_or_404(SavedSearch, pk=search_id, user=request.user)
+    if request.method == "POST":
+        saved_search.delete()
+        messages.success(request, f"Stopped alerts for \"{saved_search}\".")
+    return redirect("saved_searches")
+
+
+@query_budget(7)
+@login_required
+def webhooks(request: HttpRequest):
+    form = WebhookSubscriptionForm(request.POST or None)
+    if form.is_valid():
+        subscription, created = WebhookSubscription.objects.get_or_create(
+            user=request.user, url=form.cleaned_data["url"]
+        )
+        if created:
+            messages.success(request, f"New applications and decisions will be sent to {subscription.url}.")
+        else:
+            messages.info(request, f"{subscription.url} is already subscribed.")
+        return redirect("webhooks")
+
+    context = {
+        "form": form,
+        "subscriptions": request.user.webhook_subscriptions.annotate(
+            pending=Count("deliveries", filter=Q(deliveries__next_attempt_at__isnull=False)),
+            failed=Count("deliveries", filter=Q(deliveries__next_attempt_at__isnull=True,
+                                                deliveries__delivered_at__isnull=True)),
+            last_delivered_at=Max("deliveries__delivered_at"),
+        ),
+    }
+    return render(request, "webhooks.html", context)
+
+
+@query_budget(5)
+@login_required
+def delete_webhook(request: HttpRequest, subscription_id):
+    subscription = get_object_or_404(WebhookSubscription, pk=subscription_id, user=request.user)
+    if request.method == "POST":
+        subscription.delete()
+        messages.success(request, f"Stopped sending events to {subscription.url}.")
+    return redirect("webhooks")
+
+
+@query_budget(3)
+def notification_counts(request: HttpRequest):
+    """The badge counts as JSON, polled by pages served over WSGI"""
+    if not request.user.is_authenticated:
+        return HttpResponseForbidden("Log in to receive notifications.")
+    return JsonResponse(get_notification_counts(request.user), headers={"Cache-Control": "no-cache"})
+
+
+async def notification_stream(request: HttpRequest):
+    """
+    Server-sent events stream of the user's notification counts. Sends the
+    current counts straight away, then every change published for the user.
+    Under WSGI the open connection would pin a worker thread, so the counts
+    are sent once and the browser told to reconnect after the poll interval.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponseForbidden("Log in to receive notifications.")
+
+    if not isinstance(request, ASGIRequest):
+        counts = await sync_to_async(get_notification_counts)(user)
+        retry = settings.NOTIFICATIONS_POLL_SECONDS * 1000
+        return HttpResponse(f"retry: {retry}\ndata: {json.dumps(counts)}\n\n", content_type="text/event-stream",
+                            headers={"Cache-Control": "no-cache"})
+
+    async def events():
+        counts = await sync_to_async(get_notification_counts)(user)
+        yield f"data: {json.dumps(counts)}\n\n"
+
+        subscription = get_broker().subscribe(user_channel(user.pk))
+        try:
+            while True:
+                message = await subscription.get(timeout=settings.NOTIFICATIONS_HEARTBEAT_SECONDS)
+                if message is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"data: {json.dumps(message)}\n\n"
+        finally:
+            # Also reached when the client disconnects and the response is cancelled
+            await subscription.close()
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,264 @@
+"""
+Delivery of queued WebhookDelivery rows (the outbox) to employer endpoints.
+
+Each flush claims the due rows, groups them per subscription and POSTs
+them as one JSON batch per endpoint, signed with the subscription's
+secret. Connections are kept alive per host across flushes. Failed
+batches are retried with exponential backoff until WEBHOOK_MAX_ATTEMPTS.
+Delivery is at least once: receivers should ignore delivery ids they
+have already seen. Endpoints are only reached on public addresses, checked
+when the URL is saved and again on every connection.
+
+Delivered and given-up rows keep applicant data in their payload; purge_data
+--webhook-days removes them.
+"""
+import hashlib
+import hmac
+import http.client
+import ipaddress
+import json
+import socket
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import WebhookDelivery
+
+SIGNATURE_HEADER = "X-UAPConnect-Signature"
+
+# How long claimed rows stay hidden from other flushes, e.g. after a crash mid-send
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    """Header value: t=<unix time>,v1=<hex HMAC-SHA256 of "<t>.<body>">"""
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before the next try: WEBHOOK_RETRY_BASE seconds, doubling per failure, at most a day"""
+    return timedelta(seconds=min(settings.WEBHOOK_RETRY_BASE * 2 ** (attempts - 1), 24 * 60 * 60))
+
+
+class ForbiddenAddress(OSError):
+    """A webhook host resolved to an address the app must not call"""
+
+
+def is_public_address(address: str) -> bool:
+    return settings.WEBHOOK_ALLOW_PRIVATE_ADDRESSES or ipaddress.ip_address(address.split("%")[0]).is_global
+
+
+def resolve_public(host: str, port: int) -> list:
+    """getaddrinfo results for host, raising ForbiddenAddress if any address isn't public"""
+    addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    for *_, sockaddr in addresses:
+        if not is_public_address(sockaddr[0]):
+            raise ForbiddenAddress(f"{host} resolves to non-public address {sockaddr[0]}")
+    return addresses
+
+
+def validate_webhook_url(url: str) -> None:
+    """
+    Refuse endpoints the server must not POST to: plain http outside DEBUG,
+    and hosts that are or resolve to loopback, private or link-local
+    addresses. Hosts that don't resolve yet are checked again on every send.
+    """
+    parts = urlsplit(url)
+    if settings.WEBHOOK_REQUIRE_HTTPS and parts.scheme != "https":
+        raise ValidationError("Webhook URLs must use https.")
+    if not parts.hostname:
+        raise ValidationError("Enter a URL with a host name.")
+    try:
+        resolve_public(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+    except ForbiddenAddress:
+        raise ValidationError("Webhook URLs must point to a public internet address.")
+    except (socket.gaierror, UnicodeError, ValueError):
+        pass
+
+
+class GuardedConnectionMixin:
+    """
+    Connects only to addresses that passed resolve_public, and to the very
+    address that was checked, so a DNS answer can't change in between.
+    TLS still verifies the certificate against the host name.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # http.client sets this per instance to socket.create_connection
+        self._create_connection = self.connect_public
+
+    def connect_public(self, address, timeout, source_address=None):
+        host, port = address
+        error = None
+        for family, socktype, proto, _, sockaddr in resolve_public(host, port):
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+                return sock
+            except OSError as exc:
+                sock.close()
+                error = exc
+        raise error or OSError(f"Could not connect to {host}")
+
+
+class GuardedHTTPConnection(GuardedConnectionMixin, http.client.HTTPConnection):
+    pass
+
+
+class GuardedHTTPSConnection(GuardedConnectionMixin, http.client.HTTPSConnection):
+    pass
+
+
+class ConnectionPool:
+    """One keep-alive HTTP connection per (scheme, host, port)"""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.connections = {}
+
+    def post(self, url: str, body: bytes, headers: dict) -> int:
+        parts = urlsplit(url)
+        if settings.WEBHOOK_REQUIRE_HTTPS and parts.scheme != "https":
+            raise ForbiddenAddress(f"{url} is not https")
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        for reconnect in (True, False):
+            connection = self.connections.get(key)
+            if connection is None:
+                connection_class = GuardedHTTPSConnection if parts.scheme == "https" else GuardedHTTPConnection
+                connection = connection_class(parts.hostname, parts.port, timeout=self.timeout)
+                self.connections[key] = connection
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed an idle keep-alive connection; retry once on a fresh one
+                self.close(key)
+                if not reconnect:
+                    raise
+                continue
+            except Exception:
+                self.close(key)
+                raise
+            if response.will_close:
+                self.close(key)
+            return response.status
+
+    def close(self, key=None) -> None:
+        """Close one host's connection, or all of them"""
+        for host in [key] if key else list(self.connections):
+            connection = self.connections.pop(host, None)
+            if connection is not None:
+                connection.close()
+
+
+class WebhookDispatcher:
+
+    def __init__(self, batch_size=500, max_events=100, timeout=None):
+        self.batch_size = batch_size
+        self.max_events = max_events
+        self.pool = ConnectionPool(timeout or settings.WEBHOOK_TIMEOUT)
+
+    def claim(self, now) -> list:
+        """
+        Take up to batch_size due rows for this flush. Row locks skip rows
+        another flush is claiming; where the database has none (SQLite), the
+        conditional UPDATE finds rows claimed meanwhile and the claim is
+        abandoned rather than sending them twice.
+        """
+        with transaction.atomic():
+            deliveries = list(
+                WebhookDelivery.objects.due(now).select_for_update(skip_locked=True, of=("self",))
+                .select_related("subscription")[:self.batch_size]
+            )
+            pks = [delivery.pk for delivery in deliveries]
+            claimed = WebhookDelivery.objects.filter(pk__in=pks, next_attempt_at__lte=now).update(
+                next_attempt_at=now + CLAIM_TIMEOUT
+            )
+            if claimed != len(deliveries):
+                transaction.set_rollback(True)
+                return []
+        return deliveries
+
+    def flush(self, now=None) -> Counter:
+        """Send everything due now; returns counts of delivered and failed events"""
+        now = now or timezone.now()
+        deliveries = self.claim(now)
+
+        per_subscription = defaultdict(list)
+        for delivery in deliveries:
+            per_subscription[delivery.subscription_id].append(delivery)
+
+        report = Counter()
+        for batch in per_subscription.values():
+            for start in range(0, len(batch), self.max_events):
+                report.update(self.send(batch[start:start + self.max_events], now))
+        return report
+
+    def send(self, deliveries, now) -> Counter:
+        subscription = deliveries[0].subscription
+        body = json.dumps({
+            "deliveries": [
+                {"id": delivery.pk, "event": delivery.event, "created_at": delivery.created_at,
+                 "data": delivery.payload}
+                for delivery in deliveries
+            ]
+        }, cls=DjangoJSONEncoder).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "UAPConnect-Webhooks",
+            SIGNATURE_HEADER: sign(subscription.secret, int(now.timestamp()), body),
+        }
+        try:
+            status = self.pool.post(subscription.url, body, headers)
+            error = "" if 200 <= status < 300 else f"HTTP {status}"
+        except (OSError, http.client.HTTPException) as exc:
+            error = f"{exc.__class__.__name__}: {exc}"
+
+        for delivery in deliveries:
+            delivery.attempts += 1
+            delivery.last_error = error[:255]
+            if not error:
+                delivery.delivered_at, delivery.next_attempt_at = now, None
+            elif delivery.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                delivery.next_attempt_at = None
+            else:
+                delivery.next_attempt_at = now + backoff(delivery.attempts)
+        WebhookDelivery.objects.bulk_update(
+            deliveries, ["attempts", "last_error", "delivered_at", "next_attempt_at"]
+        )
+        return Counter({"failed" if error else "delivered": len(deliveries)})
+
+    def drain(self) -> Counter:
+        """Flush until a flush claims less than a full batch; returns the combined counts"""
+        report = Counter()
+        while True:
+            flushed = self.flush()
+            report.update(flushed)
+            if sum(flushed.values()) < self.batch_size:
+                return report
+
+    def run_forever(self, interval=5, on_flush=None):
+        """Flush in a loop, sleeping interval seconds once the due events are drained"""
+        try:
+            while True:
+                report = self.flush()
+                if report and on_flush:
+                    on_flush(report)
+                if sum(report.values()) < self.batch_size:
+                    time.sleep(interval)
+        finally:
+            self.pool.close()
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimated_count(model, using="default") -> int | None:
+    """
+    Row count from the database's planner statistics instead of a full
+    COUNT(*). None when the backend keeps no statistics for the table.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    queries = {
+        "postgresql": ("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table]),
+        "mysql": ("SELECT table_rows FROM information_schema.tables "
+                  "WHERE table_schema = DATABASE() AND table_name = %s", [table]),
+        # Filled in by ANALYZE; the first number of stat is the table's row count
+        "sqlite": ("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table]),
+    }
+    if connection.vendor not in queries:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(*queries[connection.vendor])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not row or row[0] is None:
+        return None
+    count = int(str(row[0]).split()[0])
+    return count if count >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Pages an unfiltered changelist using estimated_count once the table is
+    past ADMIN_ESTIMATED_COUNT_THRESHOLD rows. Filtered lists and small
+    tables are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist defaults for tables too big to count or scan on every page view"""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
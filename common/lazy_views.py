@@ -0,0 +1,70 @@
+"""
+Function views imported on first use instead of when the URLconf loads.
+
+URL modules write `views = LazyViews("application_tracking.views")` in
+place of `from . import views`; each `views.name` is then a LazyView that
+imports the module the first time the view is called or one of its
+attributes (csrf_exempt, query_budget, ...) is read. Reversing URLs only
+needs the view's dotted name, so rendering {% url %} imports nothing, and
+a worker's first request loads just the views module it hits.
+talent_base.warmup.warm_up loads them all before a worker takes traffic.
+
+Only function views are supported: class-based views expose view_class,
+which would have to be imported to answer whether it exists.
+"""
+from importlib import import_module
+
+from asgiref.sync import markcoroutinefunction
+
+
+class LazyView:
+
+    def __init__(self, module: str, name: str, is_async: bool = False):
+        self.__module__ = module
+        self.__name__ = self.__qualname__ = name
+        self._view = None
+        if is_async:
+            # Django checks this before calling the view, so it can't wait for the import
+            markcoroutinefunction(self)
+
+    def load(self):
+        if self._view is None:
+            self._view = getattr(import_module(self.__module__), self.__name__)
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.load()(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # The URL resolver probes every pattern for view_class while it populates
+        if name == "view_class" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return f"<LazyView {self.__module__}.{self.__name__}>"
+
+
+class LazyViews:
+    """Attribute access returns a LazyView of the same name in module"""
+
+    def __init__(self, module: str, async_views=()):
+        self._module = module
+        self._async_views = set(async_views)
+
+    def __getattr__(self, name) -> LazyView:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return LazyView(self._module, name, is_async=name in self._async_views)
+
+
+def load_lazy_views(patterns) -> int:
+    """Import the views behind every LazyView in patterns (a URLconf's urlpatterns); returns how many"""
+    loaded = 0
+    for pattern in patterns:
+        if hasattr(pattern, "url_patterns"):
+            loaded += load_lazy_views(pattern.url_patterns)
+        elif isinstance(pattern.callback, LazyView):
+            pattern.callback.load()
+            loaded += 1
+    return loaded
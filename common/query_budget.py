@@ -0,0 +1,79 @@
+"""
+Per-view query budgets.
+
+@query_budget(n) declares the most queries a view may run per request,
+template rendering and context processors included. A request over budget
+is logged with its repeated statements grouped, which is how N+1 loops
+show up. With QUERY_BUDGET_RAISE on (DEBUG and the test suite) it raises
+QueryBudgetExceeded instead. Every budget is recorded in BUDGETS, keyed by
+"<module>.<view>", so tests can check that each route declares one.
+"""
+import functools
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+BUDGETS = {}
+
+# Statements quoted in a report, and how much of each
+MAX_REPORTED = 5
+MAX_SQL_LENGTH = 300
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    """connection.execute_wrapper that keeps the SQL of every statement"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+
+def repeated_statements(statements) -> list:
+    """[(count, sql)] of statements run more than once, most repeated first"""
+    return [(count, sql) for sql, count in Counter(statements).most_common() if count > 1]
+
+
+def budget_report(view_name: str, request, budget: int, statements) -> str:
+    lines = [f"{view_name} ran {len(statements)} queries for {request.method} {request.path} (budget {budget})"]
+    repeated = repeated_statements(statements)
+    if repeated:
+        lines.append("Repeated statements (likely N+1):")
+    for count, sql in repeated[:MAX_REPORTED]:
+        lines.append(f"  {count}x {sql[:MAX_SQL_LENGTH]}")
+    return "\n".join(lines)
+
+
+def query_budget(max_queries: int):
+    """Declare the most queries the decorated view may run per request"""
+
+    def decorator(view):
+        view_name = f"{view.__module__}.{view.__name__}"
+        BUDGETS[view_name] = max_queries
+
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            recorder = QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                response = view(request, *args, **kwargs)
+            if len(recorder.statements) > max_queries:
+                report = budget_report(view_name, request, max_queries, recorder.statements)
+                if settings.QUERY_BUDGET_RAISE:
+                    raise QueryBudgetExceeded(report)
+                logger.warning(report)
+            return response
+
+        wrapped.query_budget = max_queries
+        return wrapped
+
+    return decorator
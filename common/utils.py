@@ -0,0 +1,14 @@
+def chunked_pks(queryset, size: int):
+    """
+    Yield the queryset's primary keys in ascending batches. Each batch is a
+    keyset query (pk > last seen), so rows changed or deleted by the previous
+    batch never shift the next one.
+    """
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    last = None
+    while True:
+        batch = list((pks if last is None else pks.filter(pk__gt=last))[:size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
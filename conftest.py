@@ -1,8 +1,20 @@
+import sqlite3
+from datetime import timedelta
+
 import pytest
 from django.contrib.auth.hashers import make_password
+from django.db import connection
 from django.test.client import Client
+from django.utils import timezone
 
 from accounts.models import User
+from application_tracking.models import Company, JobAdvert
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """Views that go over their @query_budget fail the test that requested them"""
+    settings.QUERY_BUDGET_RAISE = True
 
 
 @pytest.fixture
@@ -30,3 +42,53 @@ def authenticate_user_client(
     """Authenticate a client"""
     client.login(email=user_instance.email, password=auth_user_password)
     return client, user_instance
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    """Store uploaded files in a per-test directory"""
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def file_database(transactional_db, tmp_path_factory):
+    """
+    Run the test against a file copy of the in-memory test database, for
+    tests that race real concurrent transactions (in-memory SQLite fails
+    concurrent writers). Request it after the fixtures whose rows it needs;
+    what the test writes is discarded with the copy.
+    """
+    if not connection.is_in_memory_db():
+        yield
+        return
+    connection.ensure_connection()
+    in_memory, name = connection.connection, connection.settings_dict["NAME"]
+    path = tmp_path_factory.mktemp("db") / "test_db.sqlite3"
+    copy = sqlite3.connect(path)
+    in_memory.backup(copy)
+    copy.close()
+    # Other threads' connections are built from this same settings dict
+    connection.settings_dict["NAME"] = str(path)
+    connection.connection = None
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict["NAME"] = name
+        connection.connection = in_memory
+
+
+@pytest.fixture
+def job_advert(user_instance: User) -> JobAdvert:
+    return JobAdvert.objects.create(
+        title="Backend Developer",
+        company=Company.objects.for_name("Acme"),
+        employment_type="Full Time",
+        experience_level="Entry Level",
+        description="Build and run our Django services",
+        job_type="Remote",
+        skills="Python Django",
+        deadline=timezone.now().date() + timedelta(days=30),
+        created_by=user_instance,
+    )
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_base.settings')
 
 application = get_asgi_application()
+
+if settings.TEMPLATE_WARMUP or settings.WORKER_WARMUP:
+    from talent_base.warmup import warm_up
+
+    # Warm-up requests go through a WSGI handler; the ASGI one would need an event loop
+    warm_up()
@@ -0,0 +1,36 @@
+"""
+Child process of the cold_start command:
+
+    python -X importtime -m talent_base.coldstart <path>
+
+Loads the WSGI application the way a new worker does, GETs path once and
+prints one JSON line of timings, in seconds since COLD_START_LAUNCHED (the
+parent's clock when it spawned this process).
+"""
+import json
+import os
+import sys
+import time
+
+started = time.time()
+
+
+def main(path: str) -> None:
+    launched = float(os.environ.get("COLD_START_LAUNCHED", started))
+    from talent_base.wsgi import application
+    ready = time.time()
+
+    from talent_base.warmup import get
+    status = get(application, path)
+    responded = time.time()
+
+    print(json.dumps({
+        "interpreter": started - launched,
+        "ready": ready - launched,
+        "responded": responded - launched,
+        "status": status,
+    }))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "/")
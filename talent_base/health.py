@@ -0,0 +1,123 @@
+"""
+Readiness checks behind /readyz.
+
+Each check runs on a small thread pool so a hung dependency costs at most
+HEALTH_CHECK_TIMEOUT seconds, and closes the database connections it
+opened, so a restarted database server is noticed on the next probe. The
+combined result is kept for HEALTH_CACHE_SECONDS per process; probes that
+arrive while the checks run wait for that result instead of starting
+their own. The migrations check, which loads every migration file, stops
+running for a database once it passes: a process's migrations are fixed
+when it starts.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+
+
+class HealthCheckError(Exception):
+    pass
+
+
+def check_database() -> None:
+    for connection in connections.all():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+
+def check_cache() -> None:
+    key, value = f"health:{uuid.uuid4().hex}", uuid.uuid4().hex
+    for alias in settings.CACHES:
+        cache = caches[alias]
+        cache.set(key, value, timeout=10)
+        if cache.get(key) != value:
+            raise HealthCheckError(f"{alias} cache did not return the value just stored")
+        cache.delete(key)
+
+
+def check_storage() -> None:
+    """Media storage accepts writes (CVs and resumes are uploaded there)"""
+    name = default_storage.save(f"health/{uuid.uuid4().hex}.txt", ContentFile(b"ok"))
+    default_storage.delete(name)
+
+
+# Aliases whose migrations were all applied when last checked
+_migrated = set()
+
+
+def check_migrations() -> None:
+    for connection in connections.all():
+        if connection.alias in _migrated:
+            continue
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if plan:
+            raise HealthCheckError(f"{len(plan)} unapplied migration(s) on {connection.alias}")
+        _migrated.add(connection.alias)
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "storage": check_storage,
+    "migrations": check_migrations,
+}
+
+_executor = ThreadPoolExecutor(max_workers=len(CHECKS), thread_name_prefix="readyz")
+_lock = threading.Lock()
+_cached = (0.0, None)
+
+
+def _run(check) -> dict:
+    start = time.perf_counter()
+    try:
+        check()
+        error = None
+    except Exception as exc:
+        error = f"{exc.__class__.__name__}: {exc}"
+    finally:
+        connections.close_all()
+    result = {"ok": error is None, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+    if error:
+        result["error"] = error
+    return result
+
+
+def run_checks() -> dict:
+    """{"status": "ok" or "fail", "checks": {name: {"ok", "latency_ms"[, "error"]}}}"""
+    timeout = settings.HEALTH_CHECK_TIMEOUT
+    futures = {name: _executor.submit(_run, check) for name, check in CHECKS.items()}
+    deadline = time.monotonic() + timeout
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            results[name] = {"ok": False, "latency_ms": timeout * 1000, "error": f"timed out after {timeout}s"}
+    return {"status": "ok" if all(result["ok"] for result in results.values()) else "fail", "checks": results}
+
+
+def readiness() -> dict:
+    """run_checks(), reused for HEALTH_CACHE_SECONDS"""
+    global _cached
+    with _lock:
+        expires_at, report = _cached
+        if report is None or time.monotonic() >= expires_at:
+            report = run_checks()
+            _cached = (time.monotonic() + settings.HEALTH_CACHE_SECONDS, report)
+    return report
+
+
+def clear_cached_readiness() -> None:
+    global _cached
+    with _lock:
+        _cached = (0.0, None)
+        _migrated.clear()
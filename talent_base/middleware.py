@@ -0,0 +1,273 @@
+import contextvars
+import logging
+import mimetypes
+import os
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.template.base import Template
+
+from . import profiling
+
+template_logger = logging.getLogger("talent_base.templates")
+profile_logger = logging.getLogger("talent_base.profiling")
+
+# Hashed file names change whenever their content does, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=60"
+
+
+class StaticFile:
+    def __init__(self, path: Path, immutable: bool):
+        self.path = path
+        stat = path.stat()
+        self.etag = f'W/"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL
+        self.content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        # Preferred encodings first
+        self.variants = [
+            (encoding, Path(f"{path}{suffix}"))
+            for encoding, suffix in (("br", ".br"), ("gzip", ".gz"))
+            if Path(f"{path}{suffix}").is_file()
+        ]
+
+    def pick(self, accept_encoding: str):
+        """The variant with the highest q-value, preferring brotli on a tie"""
+        accepted = parse_accept_encoding(accept_encoding)
+        best, best_q = (None, self.path), 0
+        for encoding, variant in self.variants:
+            q = accepted.get(encoding, accepted.get("*", 0))
+            if q > best_q:
+                best, best_q = (encoding, variant), q
+        return best
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """{coding: q} from an Accept-Encoding header; malformed q-values count as 0"""
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """
+    Serves collected files from STATIC_ROOT before the rest of the stack runs,
+    choosing a pre-built brotli/gzip variant when the client accepts it and
+    sending far-future Cache-Control for content-hashed names.
+
+    The file index is built once at startup; run collectstatic before starting
+    the server. Disabled when STATIC_SERVE is off (e.g. in development, where
+    runserver serves static files itself).
+    """
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.strip("/") + "/"
+        self.files = self.build_index(Path(settings.STATIC_ROOT))
+
+    def build_index(self, root: Path) -> dict[str, StaticFile]:
+        hashed_names = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        files = {}
+        if not root.is_dir():
+            return files
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith((".gz", ".br")):
+                    continue
+                path = Path(directory, filename)
+                name = path.relative_to(root).as_posix()
+                files[self.prefix + name] = StaticFile(path, immutable=name in hashed_names)
+        return files
+
+    def __call__(self, request):
+        static_file = self.files.get(request.path_info)
+        if static_file is None or request.method not in ("GET", "HEAD"):
+            return self.get_response(request)
+        return self.serve(request, static_file)
+
+    def serve(self, request, static_file: StaticFile):
+        if request.headers.get("If-None-Match") == static_file.etag:
+            response = HttpResponseNotModified()
+        else:
+            encoding, path = static_file.pick(request.headers.get("Accept-Encoding", ""))
+            response = FileResponse(path.open("rb"), content_type=static_file.content_type)
+            del response["Content-Disposition"]
+            if encoding:
+                response["Content-Encoding"] = encoding
+        response["ETag"] = static_file.etag
+        response["Cache-Control"] = static_file.cache_control
+        response["Vary"] = "Accept-Encoding"
+        return response
+
+
+# (template name, seconds) for every render in the current request, or None when not profiling
+_template_renders = contextvars.ContextVar("template_renders", default=None)
+
+
+def _install_template_render_hook():
+    original_render = Template._render
+    if getattr(original_render, "profiled", False):
+        return
+
+    def _render(self, context):
+        renders = _template_renders.get()
+        if renders is None:
+            return original_render(self, context)
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            renders.append((self.name or "<string>", time.perf_counter() - start))
+
+    _render.profiled = True
+    Template._render = _render
+
+
+class TemplateProfilingMiddleware:
+    """
+    Records how long each template took to render and how many times it was
+    rendered (includes show up once per {% include %}). Times are inclusive:
+    a template that extends or includes others also counts their time.
+
+    Logged to the "talent_base.templates" logger and returned in a
+    Server-Timing header. Only active when TEMPLATE_PROFILING is on.
+    """
+
+    max_reported = 10
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _install_template_render_hook()
+
+    def __call__(self, request):
+        renders = []
+        token = _template_renders.set(renders)
+        try:
+            response = self.get_response(request)
+        finally:
+            _template_renders.reset(token)
+
+        if renders:
+            self.report(request, response, renders)
+        return response
+
+    def report(self, request, response, renders):
+        totals = defaultdict(lambda: [0, 0.0])
+        for name, seconds in renders:
+            totals[name][0] += 1
+            totals[name][1] += seconds
+        slowest = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:self.max_reported]
+
+        template_logger.info(
+            "%s %s rendered %d template(s): %s",
+            request.method,
+            request.path,
+            len(renders),
+            ", ".join(f"{name} x{count} {seconds * 1000:.1f}ms" for name, (count, seconds) in slowest),
+        )
+        response["Server-Timing"] = ", ".join(
+            f'tpl{index};desc="{name} x{count}";dur={seconds * 1000:.1f}'
+            for index, (name, (count, seconds)) in enumerate(slowest)
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Runs selected requests under talent_base.profiling's sampler and stores
+    the collapsed stacks, keyed by a request id returned in X-Profile-Id.
+    A request is profiled when it carries a valid X-Profile token (see
+    profiling.profile_token), when a staff user adds ?_profile=1, or at
+    random for PROFILING_SAMPLE_RATE of requests.
+
+    With PROFILING off the middleware is removed from the stack. When on,
+    other requests pay one header lookup and a random draw, and at most
+    PROFILING_MAX_CONCURRENT requests per process are sampled at once, each
+    for no more than PROFILING_MAX_SECONDS.
+    """
+
+    header = "X-Profile"
+    query_parameter = "_profile"
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slots = threading.BoundedSemaphore(settings.PROFILING_MAX_CONCURRENT)
+
+    def __call__(self, request):
+        trigger = self.trigger(request)
+        if trigger is None or not self.slots.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self.profile(request, trigger)
+        finally:
+            self.slots.release()
+
+    def trigger(self, request):
+        """Why this request should be profiled, or None"""
+        token = request.headers.get(self.header)
+        if token and profiling.valid_token(token):
+            return "header"
+        if self.query_parameter in request.GET and getattr(request, "user", None) and request.user.is_staff:
+            return "staff"
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return "sample"
+        return None
+
+    def profile(self, request, trigger):
+        sampler = profiling.Sampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL, settings.PROFILING_MAX_SECONDS
+        )
+        started_at = profiling.started_at()
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            seconds = sampler.stop()
+
+        profile_id = uuid.uuid4().hex
+        match = request.resolver_match
+        profile = {
+            "id": profile_id,
+            "url_name": match.view_name if match and match.url_name else "unresolved",
+            "method": request.method,
+            # No query string: links such as password reset carry the email and token there
+            "path": request.path,
+            "status": response.status_code,
+            "trigger": trigger,
+            "started_at": started_at,
+            "duration_ms": round(seconds * 1000, 1),
+            "samples": sum(sampler.stacks.values()),
+            "stacks": sampler.folded(),
+        }
+        try:
+            profiling.save_profile(profile)
+        except OSError:
+            profile_logger.exception("Could not store profile %s", profile_id)
+        else:
+            response["X-Profile-Id"] = profile_id
+        return response
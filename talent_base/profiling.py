@@ -0,0 +1,156 @@
+"""
+Sampling profiler for individual production requests (see ProfilingMiddleware).
+
+While a request runs, a background thread reads the request thread's stack
+every PROFILING_INTERVAL seconds. Samples are kept as collapsed stacks
+("outer;inner;leaf <count>" per line), the input format of flamegraph.pl,
+speedscope and inferno. The profile covers the view and middleware below
+ProfilingMiddleware, not the body of a streaming response.
+
+Profiles are written as JSON files under PROFILING_ROOT, one directory per
+URL name, and only the newest PROFILING_KEEP per URL name are kept.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+TOKEN_SALT = "talent_base.profiling"
+
+
+def profile_token() -> str:
+    """Value for the X-Profile header; valid for PROFILING_TOKEN_MAX_AGE seconds"""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign("profile")
+
+
+def valid_token(value: str) -> bool:
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(value, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def _source_roots() -> list:
+    # Longest first, so site-packages wins over the prefix that contains it
+    return sorted({os.path.join(path, "") for path in sys.path if path}, key=len, reverse=True)
+
+
+class Sampler:
+    """
+    Samples one thread's stack until stopped or max_seconds have passed.
+    The sampling thread holds the GIL only while walking a stack, so the
+    cost to the profiled request is roughly proportional to the interval.
+    """
+
+    def __init__(self, thread_id: int, interval: float, max_seconds: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.frame_names = {}
+        self.roots = _source_roots()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def stop(self) -> float:
+        """Stop sampling; returns the seconds the sampler ran"""
+        self.stopped.set()
+        self.thread.join()
+        return time.perf_counter() - self.started
+
+    def run(self) -> None:
+        deadline = self.started + self.max_seconds
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or time.perf_counter() > deadline:
+                return
+            self.stacks[self.collapse(frame)] += 1
+
+    def collapse(self, frame) -> str:
+        names = []
+        while frame is not None:
+            names.append(self.frame_name(frame.f_code))
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def frame_name(self, code) -> str:
+        name = self.frame_names.get(code)
+        if name is None:
+            filename = code.co_filename
+            for root in self.roots:
+                if filename.startswith(root):
+                    filename = filename[len(root):]
+                    break
+            # ";" separates frames in the collapsed format
+            name = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+            self.frame_names[code] = name
+        return name
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# -------------------- Storage -------------------- #
+def _root() -> Path:
+    return Path(settings.PROFILING_ROOT)
+
+
+def _safe_name(url_name: str) -> str:
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in url_name) or "_"
+
+
+def save_profile(profile: dict) -> Path:
+    """Write profile (keyed by profile["id"]) and drop the oldest beyond PROFILING_KEEP"""
+    directory = _root() / _safe_name(profile["url_name"])
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{profile['id']}.json"
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(profile))
+    os.replace(temporary, path)
+
+    stale = sorted(directory.glob("*.json"), key=lambda item: item.stat().st_mtime, reverse=True)
+    for old in stale[settings.PROFILING_KEEP:]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def recent_profiles(url_name: str = None) -> list:
+    """Profile summaries, newest first, optionally for one URL name"""
+    root = _root()
+    if not root.is_dir():
+        return []
+    directories = [root / _safe_name(url_name)] if url_name else [path for path in root.iterdir() if path.is_dir()]
+    profiles = []
+    for directory in directories:
+        for path in directory.glob("*.json"):
+            try:
+                profile = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            profile.pop("stacks", None)
+            profiles.append(profile)
+    return sorted(profiles, key=lambda profile: profile["started_at"], reverse=True)
+
+
+def load_profile(profile_id: str):
+    """The stored profile with this id, or None"""
+    name = _safe_name(profile_id)
+    for path in _root().glob(f"*/{name}.json"):
+        return json.loads(path.read_text())
+    return None
+
+
+def started_at() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
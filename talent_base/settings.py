@@ -16,7 +16,7 @@ from pathlib import Path
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-from decouple import config # type: ignore
+from decouple import Csv, config # type: ignore
 
 
 # Quick-start development settings - unsuitable for production
@@ -26,9 +26,9 @@ from decouple import config # type: ignore
 SECRET_KEY = config("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config("DEBUG", default=True, cast=bool)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="", cast=Csv())
 
 
 # Application definition
@@ -54,24 +54,46 @@ AUTH_USER_MODEL = "accounts.User"
 
 LOGIN_URL = "/auth/login/"
 
+# Admin changelists show planner estimates instead of COUNT(*) for unfiltered
+# tables at least this big; bulk admin actions work in batches of this size
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config("ADMIN_ESTIMATED_COUNT_THRESHOLD", default=100_000, cast=int)
+ADMIN_ACTION_CHUNK_SIZE = config("ADMIN_ACTION_CHUNK_SIZE", default=500, cast=int)
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'talent_base.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'talent_base.middleware.TemplateProfilingMiddleware',
+    'talent_base.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'talent_base.urls'
 
+# The cached loader compiles each template once per process; without it
+# templates are re-read and re-parsed on every render, which is only useful
+# while editing them.
+TEMPLATE_CACHE = config("TEMPLATE_CACHE", default=not DEBUG, cast=bool)
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, "templates")],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if TEMPLATE_CACHE
+                else TEMPLATE_LOADERS
+            ),
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -83,6 +105,40 @@ TEMPLATES = [
     },
 ]
 
+# Compile every template when a worker starts instead of on its first requests
+TEMPLATE_WARMUP = config("TEMPLATE_WARMUP", default=TEMPLATE_CACHE, cast=bool)
+
+# Before a new worker takes traffic, also import every view, open database and
+# cache connections and GET WARMUP_PATHS (talent_base.warmup.warm_up). Measure
+# the effect with `python manage.py cold_start --warmup`.
+WORKER_WARMUP = config("WORKER_WARMUP", default=False, cast=bool)
+WARMUP_PATHS = config("WARMUP_PATHS", default="/,/jobs/", cast=Csv())
+
+# Log per-template render time and render counts for each request and expose
+# them as a Server-Timing header (visible in the browser's network panel)
+TEMPLATE_PROFILING = config("TEMPLATE_PROFILING", default=DEBUG, cast=bool)
+
+# On-demand sampling profiles of single requests (ProfilingMiddleware), browsed
+# by staff at /profiles/. Requests are profiled when they carry a signed
+# X-Profile header, when staff add ?_profile=1, or at random for
+# PROFILING_SAMPLE_RATE of requests (0.001 = one in a thousand).
+PROFILING = config("PROFILING", default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+PROFILING_INTERVAL = config("PROFILING_INTERVAL", default=0.005, cast=float)
+PROFILING_MAX_SECONDS = config("PROFILING_MAX_SECONDS", default=30.0, cast=float)
+PROFILING_MAX_CONCURRENT = config("PROFILING_MAX_CONCURRENT", default=1, cast=int)
+PROFILING_TOKEN_MAX_AGE = config("PROFILING_TOKEN_MAX_AGE", default=24 * 60 * 60, cast=int)
+PROFILING_ROOT = config("PROFILING_ROOT", default=os.path.join(BASE_DIR, "profiles"))
+PROFILING_KEEP = config("PROFILING_KEEP", default=20, cast=int)
+
+# /readyz: seconds each dependency check may take, and how long one result is
+# reused so bursts of load-balancer probes don't each hit the dependencies
+HEALTH_CHECK_TIMEOUT = config("HEALTH_CHECK_TIMEOUT", default=2.0, cast=float)
+HEALTH_CACHE_SECONDS = config("HEALTH_CACHE_SECONDS", default=1.0, cast=float)
+
+# Views over their @query_budget raise instead of logging a warning
+QUERY_BUDGET_RAISE = config("QUERY_BUDGET_RAISE", default=DEBUG, cast=bool)
+
 WSGI_APPLICATION = 'talent_base.wsgi.application'
 
 
@@ -97,6 +153,54 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        'LOCATION': config("CACHE_LOCATION", default=""),
+    }
+}
+
+# Verification codes and password reset tokens. The cache store relies on the
+# backend's TTL but must be shared by all workers, so a per-process LocMemCache
+# falls back to the indexed AuthToken table.
+AUTH_TOKEN_TTL = config("AUTH_TOKEN_TTL", default=20 * 60, cast=int)
+AUTH_TOKEN_STORE = config(
+    "AUTH_TOKEN_STORE",
+    default=(
+        "accounts.tokens.DatabaseTokenStore"
+        if CACHES['default']['BACKEND'].endswith("LocMemCache")
+        else "accounts.tokens.CacheTokenStore"
+    ),
+)
+
+# Serving request.user from the cache is only safe when every worker sees the
+# invalidation on save, so a per-process LocMemCache keeps the plain ModelBackend.
+AUTHENTICATION_BACKENDS = [
+    config(
+        "AUTH_BACKEND",
+        default=(
+            "django.contrib.auth.backends.ModelBackend"
+            if CACHES['default']['BACKEND'].endswith("LocMemCache")
+            else "accounts.backends.CachedModelBackend"
+        ),
+    )
+]
+
+# Seconds a loaded request.user is reused before it is read from the database again
+AUTH_USER_CACHE_TIMEOUT = config("AUTH_USER_CACHE_TIMEOUT", default=60, cast=int)
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.1/topics/http/sessions/
+# cached_db serves sessions from the cache and only reads the database on a miss;
+# set SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies to skip server storage.
+
+SESSION_ENGINE = config("SESSION_ENGINE", default="django.contrib.sessions.backends.cached_db")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -136,6 +240,24 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "talent_base/static")]
 STATIC_ROOT = os.path.join(BASE_DIR, "static")
 
+# Outside DEBUG, collectstatic writes content-hashed names plus .gz/.br variants,
+# which StaticFilesMiddleware serves with far-future Cache-Control headers.
+# Run `python manage.py build_static` as part of each deploy.
+STATIC_SERVE = config("STATIC_SERVE", default=not DEBUG, cast=bool)
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "talent_base.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+}
+
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -164,4 +286,36 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# Absolute links in emails sent outside a request (e.g. saved-search digests)
+SITE_URL = config("SITE_URL", default="http://127.0.0.1:8000")
+
+# Neighbours kept per advert for the "Similar jobs" panel
+SIMILAR_ADVERTS_COUNT = config("SIMILAR_ADVERTS_COUNT", default=5, cast=int)
+
+# Employer webhooks (send_webhooks): request timeout in seconds, attempts before
+# an event is given up on, and the first retry delay, doubled after each failure
+WEBHOOK_TIMEOUT = config("WEBHOOK_TIMEOUT", default=10, cast=int)
+WEBHOOK_MAX_ATTEMPTS = config("WEBHOOK_MAX_ATTEMPTS", default=10, cast=int)
+WEBHOOK_RETRY_BASE = config("WEBHOOK_RETRY_BASE", default=30, cast=int)
+# Endpoints must be https outside DEBUG, and may only resolve to public addresses:
+# loopback, private, link-local (cloud metadata) and reserved ones are refused
+WEBHOOK_REQUIRE_HTTPS = config("WEBHOOK_REQUIRE_HTTPS", default=not DEBUG, cast=bool)
+WEBHOOK_ALLOW_PRIVATE_ADDRESSES = config("WEBHOOK_ALLOW_PRIVATE_ADDRESSES", default=False, cast=bool)
+
+# LIVE NOTIFICATIONS
+# The in-process broker only reaches streams served by the same worker;
+# use application_tracking.notifications.RedisBroker when running several.
+NOTIFICATIONS_BROKER = {
+    "BACKEND": config(
+        "NOTIFICATIONS_BROKER", default="application_tracking.notifications.InProcessBroker"
+    ),
+    "OPTIONS": {
+        "url": config("NOTIFICATIONS_REDIS_URL", default="redis://localhost:6379/0"),
+    },
+}
+NOTIFICATIONS_HEARTBEAT_SECONDS = 15
+# Streams are only opened under ASGI (e.g. uvicorn talent_base.asgi:application);
+# pages served over WSGI poll the counts this often instead
+NOTIFICATIONS_POLL_SECONDS = config("NOTIFICATIONS_POLL_SECONDS", default=60, cast=int)
                 
\ No newline at end of file
@@ -9,3 +9,37 @@ window.onload = function() {
     }, 5000);
   });
 };
+
+// Live notification badges: pushed by the server under ASGI, polled under WSGI
+(function() {
+  const data = document.body.dataset;
+
+  function update(counts) {
+    Object.keys(counts).forEach(function(name) {
+      document.querySelectorAll('[data-notification="' + name + '"]').forEach(function(badge) {
+        badge.textContent = counts[name];
+        badge.hidden = !counts[name];
+      });
+    });
+  }
+
+  if (data.notificationsUrl && window.EventSource) {
+    const source = new EventSource(data.notificationsUrl);
+    source.onmessage = function(event) {
+      update(JSON.parse(event.data));
+    };
+  } else if (data.notificationsPollUrl && window.fetch) {
+    setInterval(function() {
+      if (document.hidden) {
+        return;
+      }
+      fetch(data.notificationsPollUrl, {credentials: 'same-origin'}).then(function(response) {
+        return response.ok ? response.json() : null;
+      }).then(function(counts) {
+        if (counts) {
+          update(counts);
+        }
+      });
+    }, Number(data.notificationsPollSeconds) * 1000);
+  }
+})();
@@ -0,0 +1,50 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always built
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".json", ".map", ".svg", ".txt", ".html", ".xml")
+
+
+def compress_file(path: str) -> dict[str, int]:
+    """
+    Write .gz (and .br when brotli is installed) variants next to path,
+    skipping any that don't make the file meaningfully smaller.
+    Returns the size of each variant that was written, keyed by encoding.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    variants = {"gzip": (".gz", lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants["br"] = (".br", lambda raw: brotli.compress(raw, quality=11))
+
+    written = {}
+    for encoding, (suffix, compress) in variants.items():
+        compressed = compress(data)
+        if len(compressed) < len(data) * 0.95:
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+            written[encoding] = len(compressed)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage (content-hashed file names) that also pre-builds
+    compressed variants of text assets during collectstatic, so they can be
+    served without compressing on every request.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                compress_file(self.path(hashed_name))
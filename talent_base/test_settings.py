@@ -0,0 +1,38 @@
+"""
+Settings for the test suite (pytest.ini points here).
+
+Faster than the development settings: a cheap password hasher, an
+in-memory database built straight from the models (pytest.ini passes
+--nomigrations) and throwaway media and profile directories. Each process
+gets its own database and directories, so the suite can run under
+pytest-xdist (`pytest -n auto`).
+
+Set TEST_DATABASE_FILE=True to use a file-backed database instead. Tests
+that race real concurrent transactions don't need it: the file_database
+fixture (conftest.py) gives them a file copy of the in-memory database.
+"""
+import atexit
+import shutil
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES, config
+
+# Hashing cost is the point in production and only overhead in tests
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Each test process has one LocMemCache, which is all CachedModelBackend needs
+AUTHENTICATION_BACKENDS = ["accounts.backends.CachedModelBackend"]
+
+DATABASES["default"]["TEST"] = (
+    # pytest-django adds the xdist worker id to the file name
+    {"NAME": BASE_DIR / "test_db.sqlite3"}
+    if config("TEST_DATABASE_FILE", default=False, cast=bool)
+    else {}
+)
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="uapconnect-media-")
+PROFILING_ROOT = tempfile.mkdtemp(prefix="uapconnect-profiles-")
+# Every process (each xdist worker too) removes its own directories on exit
+for _directory in (MEDIA_ROOT, PROFILING_ROOT):
+    atexit.register(shutil.rmtree, _directory, ignore_errors=True)
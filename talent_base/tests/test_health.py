@@ -0,0 +1,76 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+
+from talent_base import health
+
+
+@pytest.fixture(autouse=True)
+def fresh_readiness():
+    health.clear_cached_readiness()
+    yield
+    health.clear_cached_readiness()
+
+
+def test_healthz_touches_no_dependencies(client):
+    # No django_db mark: any query would fail the test
+    response = client.get(reverse("healthz"))
+
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.django_db
+def test_readyz_reports_each_dependency(client):
+    response = client.get(reverse("readyz"))
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["status"] == "ok"
+    assert set(report["checks"]) == {"database", "cache", "storage", "migrations"}
+    assert all(check["ok"] and check["latency_ms"] >= 0 for check in report["checks"].values())
+
+
+@pytest.mark.django_db
+def test_readyz_fails_slow_and_broken_checks_and_caches_result(client, settings, monkeypatch):
+    settings.HEALTH_CHECK_TIMEOUT = 0.1
+    calls = []
+
+    def broken_storage():
+        calls.append(1)
+        raise OSError("read-only file system")
+
+    monkeypatch.setitem(health.CHECKS, "storage", broken_storage)
+    monkeypatch.setitem(health.CHECKS, "cache", lambda: time.sleep(0.5))
+
+    response = client.get(reverse("readyz"))
+    assert response.status_code == 503
+    checks = response.json()["checks"]
+    assert checks["storage"]["error"] == "OSError: read-only file system"
+    assert checks["cache"] == {"ok": False, "latency_ms": 100.0, "error": "timed out after 0.1s"}
+    assert checks["database"]["ok"]
+
+    client.get(reverse("readyz"))
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_migrations_are_checked_until_they_pass(monkeypatch):
+    plans = [["0017_advert_terms"], []]
+
+    class Executor:
+        def __init__(self, connection):
+            self.loader = SimpleNamespace(graph=SimpleNamespace(leaf_nodes=list))
+
+        def migration_plan(self, targets):
+            return plans.pop(0)
+
+    monkeypatch.setattr(health, "MigrationExecutor", Executor)
+
+    with pytest.raises(health.HealthCheckError, match="1 unapplied migration"):
+        health.check_migrations()
+    health.check_migrations()
+    # Passed once: no further executors are built (plans would be exhausted)
+    health.check_migrations()
+    assert plans == []
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+from django.test.client import Client
+from django.urls import reverse
+
+from talent_base import profiling
+
+
+@pytest.fixture
+def profiling_on(settings, tmp_path):
+    settings.PROFILING = True
+    settings.PROFILING_INTERVAL = 0.001
+    settings.PROFILING_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_collapses_the_sampled_threads_stack():
+    sampler = profiling.Sampler(threading.get_ident(), interval=0.001, max_seconds=5)
+    sampler.start()
+    spin(0.1)
+    sampler.stop()
+
+    assert sum(sampler.stacks.values()) > 0
+    stack, count = sampler.folded().splitlines()[0].rsplit(" ", 1)
+    assert "test_sampler_collapses_the_sampled_threads_stack" in stack
+    assert stack.split(";")[-1].startswith("spin (")
+    assert int(count) > 0
+
+
+@pytest.mark.django_db
+def test_signed_header_profiles_request(profiling_on):
+    response = Client().get(reverse("login"), headers={"X-Profile": profiling.profile_token()})
+
+    profile = profiling.load_profile(response["X-Profile-Id"])
+    assert profile["url_name"] == "login"
+    assert profile["trigger"] == "header"
+    assert profile["status"] == 200
+    assert [summary["id"] for summary in profiling.recent_profiles("login")] == [profile["id"]]
+
+
+@pytest.mark.django_db
+def test_profiles_do_not_store_query_strings(profiling_on):
+    response = Client().get(
+        reverse("login") + "?email=applicant@example.com&token=secret",
+        headers={"X-Profile": profiling.profile_token()},
+    )
+
+    profile = profiling.load_profile(response["X-Profile-Id"])
+    assert profile["path"] == reverse("login")
+    assert "secret" not in next(profiling_on.rglob("*.json")).read_text()
+
+
+@pytest.mark.django_db
+def test_unsigned_or_non_staff_requests_are_not_profiled(profiling_on, authenticate_user_client):
+    client, _ = authenticate_user_client
+
+    assert "X-Profile-Id" not in client.get(reverse("login"), headers={"X-Profile": "forged:token"})
+    assert "X-Profile-Id" not in client.get(reverse("login") + "?_profile=1")
+    assert profiling.recent_profiles() == []
+
+
+@pytest.mark.django_db
+def test_staff_browse_and_download_profiles(profiling_on, authenticate_user_client):
+    client, user = authenticate_user_client
+    user.is_staff = True
+    user.save()
+
+    profile_id = client.get(reverse("login") + "?_profile=1")["X-Profile-Id"]
+    client.get(reverse("browse_jobs"), headers={"X-Profile": profiling.profile_token()})
+
+    response = client.get(reverse("profiles"), {"url_name": "login"})
+    assert [profile["id"] for profile in response.context["profiles"]] == [profile_id]
+    assert response.context["url_names"] == ["browse_jobs", "login"]
+
+    download = client.get(reverse("download_profile", args=[profile_id]))
+    assert download["Content-Disposition"] == f'attachment; filename="{profile_id}.folded"'
+
+
+@pytest.mark.django_db
+def test_profiles_are_staff_only(authenticate_user_client):
+    client, _ = authenticate_user_client
+
+    assert client.get(reverse("profiles")).status_code == 302
@@ -0,0 +1,53 @@
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test.client import Client
+
+from talent_base.middleware import IMMUTABLE_CACHE_CONTROL
+
+
+@pytest.fixture
+def collected_static(settings, tmp_path):
+    settings.STATIC_ROOT = str(tmp_path)
+    settings.STATIC_SERVE = True
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "talent_base.storage.CompressedManifestStaticFilesStorage"},
+    }
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return tmp_path
+
+
+def test_collectstatic_writes_gzip_variants(collected_static):
+    hashed_css = staticfiles_storage.stored_name("style.css")
+    assert hashed_css != "style.css"
+    assert (collected_static / f"{hashed_css}.gz").exists()
+
+
+@pytest.mark.django_db
+def test_hashed_asset_served_compressed_with_long_cache(collected_static):
+    url = staticfiles_storage.url("style.css")
+    response = Client().get(url, headers={"accept-encoding": "gzip, deflate"})
+
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"] == "text/css"
+    assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response["Vary"] == "Accept-Encoding"
+
+    cached = Client().get(url, headers={"if-none-match": response["ETag"]})
+    assert cached.status_code == 304
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip;q=0, deflate", None),
+    ("x-gzip", None),
+    ("GZIP;q=0.5", "gzip"),
+    ("*", "gzip"),
+    ("*, gzip;q=0", None),
+])
+def test_accept_encoding_tokens_and_q_values(collected_static, accept_encoding, expected):
+    response = Client().get(staticfiles_storage.url("style.css"), headers={"accept-encoding": accept_encoding})
+
+    assert response.get("Content-Encoding") == expected
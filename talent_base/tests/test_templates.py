@@ -0,0 +1,35 @@
+import pytest
+from django.template import engines
+from django.test.client import Client
+from django.urls import reverse
+
+from talent_base.warmup import warm_templates
+
+
+@pytest.fixture
+def cached_templates(settings):
+    settings.TEMPLATES = [{
+        **settings.TEMPLATES[0],
+        "OPTIONS": {
+            **settings.TEMPLATES[0]["OPTIONS"],
+            "loaders": [("django.template.loaders.cached.Loader", settings.TEMPLATE_LOADERS)],
+        },
+    }]
+
+
+def test_warm_templates_fills_cached_loader(cached_templates):
+    compiled = warm_templates()
+
+    cached_loader = engines["django"].engine.template_loaders[0]
+    assert compiled >= 1
+    assert "base.html" in {key.split("-")[0] for key in cached_loader.get_template_cache}
+
+
+@pytest.mark.django_db
+def test_template_profiling_reports_server_timing(settings, caplog):
+    settings.TEMPLATE_PROFILING = True
+    with caplog.at_level("INFO", logger="talent_base.templates"):
+        response = Client().get(reverse("login"))
+
+    assert 'desc="login.html x1"' in response["Server-Timing"]
+    assert "alerts.html" in caplog.text
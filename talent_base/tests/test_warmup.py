@@ -0,0 +1,34 @@
+import pytest
+from django.urls import get_resolver
+
+from common.lazy_views import LazyView, LazyViews
+from talent_base.warmup import warm_up
+
+
+def lazy_callbacks(patterns):
+    for pattern in patterns:
+        if hasattr(pattern, "url_patterns"):
+            yield from lazy_callbacks(pattern.url_patterns)
+        elif isinstance(pattern.callback, LazyView):
+            yield pattern.callback
+
+
+def test_lazy_view_imports_on_first_use():
+    view = LazyViews("application_tracking.views").my_jobs
+
+    assert (view.__module__, view.__name__) == ("application_tracking.views", "my_jobs")
+    assert view._view is None
+    assert view.query_budget == 7
+    assert view._view is not None
+
+
+@pytest.mark.django_db
+def test_warm_up_loads_views_and_requests_paths(settings, caplog):
+    settings.WORKER_WARMUP = True
+    settings.WARMUP_PATHS = ["/auth/login/"]
+    with caplog.at_level("INFO", logger="talent_base.warmup"):
+        warm_up()
+
+    assert all(callback._view is not None for callback in lazy_callbacks(get_resolver().url_patterns))
+    assert "Worker warmed up" in caplog.text
+    assert "returned" not in caplog.text
@@ -2,10 +2,22 @@ from django.contrib import admin
 from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path, include
-from application_tracking import views  # ✅ Import the module, not a single view
+from common.lazy_views import LazyViews
+
+# Imported on first use (see common.lazy_views), not when this module loads
+views = LazyViews("application_tracking.views")
+talent_base_views = LazyViews("talent_base.views")
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+
+    # Load balancer probes: liveness without dependencies, readiness with them
+    path('healthz', talent_base_views.healthz, name='healthz'),
+    path('readyz', talent_base_views.readyz, name='readyz'),
+
+    # Staff-only request profiles (ProfilingMiddleware)
+    path('profiles/', talent_base_views.profiles, name='profiles'),
+    path('profiles/<str:profile_id>/', talent_base_views.download_profile, name='download_profile'),
     
     # 👇 Root URL — loads your home page (landing page or job listings based on auth)
     path('', views.home, name='home'),
@@ -0,0 +1,45 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import render
+from django.views.decorators.cache import never_cache
+
+from . import health, profiling
+
+
+# -------------------- Health checks -------------------- #
+@never_cache
+def healthz(request):
+    """Liveness: the process answers requests. Touches no dependencies."""
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+def readyz(request):
+    """Readiness: database, cache, media storage and migrations, with per-check latency"""
+    report = health.readiness()
+    return JsonResponse(report, status=200 if report["status"] == "ok" else 503)
+
+
+# -------------------- Request profiles -------------------- #
+@staff_member_required
+def profiles(request):
+    url_name = request.GET.get("url_name", "")
+    all_profiles = profiling.recent_profiles()
+    context = {
+        "profiles": [profile for profile in all_profiles if profile["url_name"] == url_name]
+        if url_name else all_profiles,
+        "url_names": sorted({profile["url_name"] for profile in all_profiles}),
+        "url_name": url_name,
+    }
+    return render(request, "profiles.html", context)
+
+
+@staff_member_required
+def download_profile(request, profile_id):
+    """The collapsed stacks, ready for flamegraph.pl or speedscope"""
+    profile = profiling.load_profile(profile_id)
+    if profile is None:
+        raise Http404("Profile not found")
+    response = HttpResponse(profile["stacks"], content_type="text/plain; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{profile["id"]}.folded"'
+    return response
@@ -0,0 +1,93 @@
+import io
+import logging
+import time
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.autoreload import get_template_directories
+from django.urls import get_resolver
+
+from common.lazy_views import load_lazy_views
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = (".html", ".txt")
+
+
+def warm_templates() -> int:
+    """
+    Load every project template once so the cached loader holds the compiled
+    versions before the first request. Returns how many templates compiled.
+    """
+    compiled = 0
+    names = set()
+    for directory in get_template_directories():
+        for path in Path(directory).rglob("*"):
+            if path.suffix in TEMPLATE_EXTENSIONS and path.is_file():
+                names.add(path.relative_to(directory).as_posix())
+
+    for engine in engines.all():
+        for name in sorted(names):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError:
+                logger.exception("Template %s failed to compile", name)
+            else:
+                compiled += 1
+    return compiled
+
+
+def get(application, path: str) -> int:
+    """GET path through a WSGI application, reading the whole body; returns the status code"""
+    host = next((host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")),
+                "localhost")
+    path, _, query = path.partition("?")
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "HTTP_HOST": host,
+        "SERVER_NAME": host, "wsgi.input": io.BytesIO(),
+        "wsgi.url_scheme": "https" if settings.SECURE_SSL_REDIRECT else "http",
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, "close"):
+            response.close()
+    return int(statuses[0].split()[0])
+
+
+def warm_up(application=None) -> None:
+    """
+    Get a new worker ready before it accepts traffic, per settings: compile
+    the templates (TEMPLATE_WARMUP) and, with WORKER_WARMUP, load the URLconf
+    and every lazily loaded view, open the database and cache connections
+    and GET each of WARMUP_PATHS through application (a WSGI application,
+    by default a fresh handler) to fill the listing caches.
+    """
+    if settings.TEMPLATE_WARMUP:
+        warm_templates()
+    if not settings.WORKER_WARMUP:
+        return
+
+    start = time.perf_counter()
+    views = load_lazy_views(get_resolver().url_patterns)
+    for connection in connections.all():
+        connection.ensure_connection()
+    for alias in settings.CACHES:
+        caches[alias].get("warmup")
+    if settings.WARMUP_PATHS:
+        if application is None:
+            from django.core.handlers.wsgi import WSGIHandler
+            application = WSGIHandler()
+        for path in settings.WARMUP_PATHS:
+            status = get(application, path)
+            if status >= 400:
+                logger.warning("Warm-up request for %s returned %s", path, status)
+    logger.info("Worker warmed up in %.1fms (%d views loaded)", (time.perf_counter() - start) * 1000, views)
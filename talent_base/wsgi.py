@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_base.settings')
 
 application = get_wsgi_application()
+
+if settings.TEMPLATE_WARMUP or settings.WORKER_WARMUP:
+    from talent_base.warmup import warm_up
+
+    warm_up(application)